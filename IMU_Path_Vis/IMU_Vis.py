@@ -9,92 +9,282 @@ Introduction: Class Vis is to read the input pos and euler files to generate pat
 """
 
 import os
+import time
 import numpy as np
 import pandas as pd
-import math
-import vtk
-
-Re = 6378137                        # m
-ECCENTRICITY = 0.0818191908426215   # Earth eccentricy, e2 = 2*f-f^2
-E_SQR = ECCENTRICITY**2             # squared eccentricity
-D2R = math.pi/180.0
+from IMU_Path_Vis.geo_transform import D2R, lla2ecef_batch, ecef2enu_batch
+from IMU_Path_Vis.attitude import euler2quat_batch, quat2rotation_batch
+from IMU_Path_Vis.csv_reader import ChunkedCsvReader, check_pos_header, check_euler_header, has_time_column
+from IMU_Path_Vis.align import target_times, interp_path, interp_slerp
+from IMU_Path_Vis.profiling import MB, profile_stage
+from IMU_Path_Vis.parallel import get_executor
+from IMU_Path_Vis.table_writer import PATH_COLUMNS, GESTURE_ON_PATH_COLUMNS, write_table
+from IMU_Path_Vis.vtp_partition import PIECE_ROWS, write_pieces
 
 
 class Vis(object):
     '''
-    IMU path and gesture visualisation
+    IMU path and gesture visualisation. The data is computed lazily in stages: each stored product (parsed
+    files, ECEF path, attitude quaternions, zero-altitude mask) is computed on first access, memoized and shared by
+    all consumers. The attitude is stored as one unit quaternion per record, the unit vectors and the scaled
+    gesture axis ends are generated from it on demand, so changing num recomputes nothing. stage_log records every
+    stage run.
+    When both files start with a 'time (s)' column the two streams are aligned in time instead of row by row, see
+    align.py. For plotting the path is also projected to local east/north/up coordinates, see enu_data.
+    With a profiler (see profiling.StageProfiler) every stage, parse, header check, rotation, gesture offset and VTP
+    write is also recorded with its rows, bytes and array memory. The row-wise conversions run on workers threads
+    over row chunks, see parallel.py.
     '''
-    def __init__(self, pos_file, eul_file):
+    def __init__(self, pos_file, eul_file, cache=None, rate=None, attitude_dtype=np.float64, enu_origin=None,
+                 enu_dtype=np.float32, profiler=None, workers=1):
         '''
         Args:
             pos_file: pos_file should be a directory contains the position data files. Data files should be named as data_name.csv
                 to define the GPS position. The .csv file should be organized as follows:
-                  row 1: header line for columns [latitude, longitude,altitude], units[deg, deg, m]
+                  row 1: header line for columns [latitude, longitude,altitude], units[deg, deg, m], optionally
+                  preceded by the timestamp column 'time (s)'
                   the rest rows contain the specific position data
             eul_file: eul_file should be a directory contains the euler data files. Data files should be named as data_name.csv
                 to define the euler angles . The .csv file should be organized as follows:
-                 row 1: header line for columns [yaw, pitch,row], units[deg, deg, deg]
+                 row 1: header line for columns [yaw, pitch,row], units[deg, deg, deg], optionally preceded by the
+                 timestamp column 'time (s)'
                   the rest rows contain the specific euler angles data
+            cache: optional ArrayCache, the stages are memory-mapped from it when the input files did not change
+                and stored into it otherwise
+            rate: target rate in Hz of the aligned streams when both files have timestamps, None for the timestamps
+                of the euler file
+            attitude_dtype: dtype of the stored attitude quaternions, np.float32 halves their memory
+            enu_origin: origin [lat, lon, alt], [deg, deg, m] of the local east/north/up coordinates, None for the
+                first valid position fix
+            enu_dtype: dtype of the east/north/up coordinates, float32 is precise to the millimetre near the origin
+            profiler: optional profiling.StageProfiler recording the stages
+            workers: number of threads of the ECEF, attitude, rotation and gesture offset conversions, None for all
+                cores, the results do not depend on it
         '''
         self.pos_file = pos_file
         self.eul_file = eul_file
-        # euler data
-        self.euler_data_header = np.genfromtxt(open(self.eul_file, "r"), delimiter=',', dtype=str)
-        if len(self.euler_data_header) == 0:
+        self.cache = cache
+        self.rate = rate
+        self.attitude_dtype = np.dtype(attitude_dtype)
+        self.__enu_origin = None if enu_origin is None else [float(v) for v in enu_origin]
+        self.enu_dtype = np.dtype(enu_dtype)
+        self.profiler = profiler
+        self.__executor = get_executor(workers)
+        # only the header lines are read here, the data rows are parsed on first access
+        with profile_stage(profiler, "read_header"):
+            self.__euler_reader = ChunkedCsvReader(self.eul_file)
+            self.__pos_reader = ChunkedCsvReader(self.pos_file)
+        self.euler_header = self.__euler_reader.header
+        if len(self.euler_header) == 0:
             raise Exception("euler file is empty")
-        self.euler_data = self.euler_data_header[1:, :].astype(np.float64)
-        # position data
-        self.pos_data_header = np.genfromtxt(open(self.pos_file, "r"), delimiter=',', dtype=str)
-        if len(self.pos_data_header) == 0:
+        self.pos_header = self.__pos_reader.header
+        if len(self.pos_header) == 0:
             raise Exception("position file is empty")
-        self.pos_data = self.pos_data_header[1:, :].astype(np.float64)
-        # store the path data
-        self.path_data = np.zeros(self.pos_data.shape)
-        # store the gesture data, [ecef_postion_x, ecef_postion_y, ecef_postion_z,pos_xaxis_x, pos_xaxis_y, pos_xaxis_z,
-        # pos_yaxis_x, pos_yaxis_y, pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
-        self.gesture_data = np.zeros((self.euler_data.shape[0], 12))
-        # store the unit vector coordinate of XYZ axis
-        self.unit_vector_coord = np.zeros((self.euler_data.shape[0], 9))
+        # parse rate of each parsed file in MB/s
+        self.parse_rate = {}
+        # 单位向量轴上的坐标点扩大的倍数, set by gen_gesture_on_path
+        self.__num = None
+        # memoized stages, stage name -> numpy array
+        self.__stages = {}
+        # one record {"stage", "seconds", "rows", "cached"} per stage run
+        self.stage_log = []
+
+    @property
+    def num(self):
+        return self.__num
+
+    @num.setter
+    def num(self, num):
+        # the scaled gesture axis ends are generated on demand, no stage depends on num
+        self.__num = num
+
+    @property
+    def timed(self):
+        '''
+        True if both files have timestamps, the records are then aligned in time and not row by row
+        '''
+        return has_time_column(self.pos_header) and has_time_column(self.euler_header)
 
-    def gen_gesture_on_path(self, num):
+    @property
+    def pos_data(self):
         '''
-        generate the position data and gesture data
-        Args:
-            num: 单位向量轴上的坐标点扩大的倍数
+        position data, nx3 numpy array [lat, lon, alt], [deg, deg, m]
+        '''
+        return self.__stage("pos_records", self.__parse_pos, [self.pos_file])[:, -3:]
+
+    @property
+    def pos_time(self):
+        '''
+        timestamps of the position data in s, None if the pos file has no timestamps
         '''
-        #### read pos file from CSV and check its position data by checking the header
-        self.__read_pos_from_csv()
-        self.__gps_to_ecef()
+        if not has_time_column(self.pos_header):
+            return None
+        return self.__stage("pos_records", self.__parse_pos, [self.pos_file])[:, 0]
 
-        ### read euler file from CSV and check its euler data by checking the header
-        self.__read_euler_from_csv()
-        self.__euler_to_gesture()
-        self.__gesture_for_path(num)
+    @property
+    def euler_data(self):
+        '''
+        euler data, nx3 numpy array [yaw, pitch, roll], [deg, deg, deg]
+        '''
+        return self.__stage("euler_records", self.__parse_euler, [self.eul_file])[:, -3:]
 
+    @property
+    def euler_time(self):
+        '''
+        timestamps of the euler data in s, None if the euler file has no timestamps
+        '''
+        if not has_time_column(self.euler_header):
+            return None
+        return self.__stage("euler_records", self.__parse_euler, [self.eul_file])[:, 0]
 
-    def gen_vtk_for_path_gesture(self, what_vtk, vtk_path):
+    @property
+    def times(self):
+        '''
+        the times in s the aligned records are resampled at, None if the files are not aligned in time
+        '''
+        if not self.timed:
+            return None
+        return self.__stage("times", lambda: target_times(self.pos_time, self.euler_time, self.rate),
+                            [self.pos_file, self.eul_file], rate=self.rate)
+
+    @property
+    def path_data(self):
+        '''
+        the path data, nx3 numpy array of the ecef position [x, y, z]
+        '''
+        if self.timed:
+            return self.__stage("path_data", self.__gps_to_ecef, [self.pos_file, self.eul_file], rate=self.rate)
+        return self.__stage("path_data", self.__gps_to_ecef, [self.pos_file])
+
+    @property
+    def attitude(self):
+        '''
+        the attitude of each record, nx4 numpy array of unit quaternions [w, x, y, z] of attitude_dtype
+        '''
+        if self.timed:
+            return self.__stage("attitude", self.__euler_to_gesture, [self.pos_file, self.eul_file],
+                                rate=self.rate, dtype=self.attitude_dtype.str)
+        return self.__stage("attitude", self.__euler_to_gesture, [self.eul_file], dtype=self.attitude_dtype.str)
+
+    @property
+    def unit_vector_coord(self):
+        '''
+        the unit vector coordinate of XYZ axis, generated from the attitude on every access, nx9 numpy array
+        [unit_xaxis_x, unit_xaxis_y, unit_xaxis_z, unit_yaxis_x, unit_yaxis_y, unit_yaxis_z, unit_zaxis_x,
+        unit_zaxis_y, unit_zaxis_z]
+        '''
+        return self.__unit_vectors(self.attitude)
+
+    @property
+    def rotation_matrix(self):
+        '''
+        the rotation matrix of each record, nx3x3 view on a new unit_vector_coord
+        '''
+        # unit_vector_coord[i] holds the columns of R[i], so R[i] is the transpose of its 3x3 reshape
+        return self.unit_vector_coord.reshape(-1, 3, 3).transpose(0, 2, 1)
+
+    @property
+    def gesture_data(self):
+        '''
+        the gesture data, generated from the path and the attitude on every access, nx12 numpy array
+        [ecef_postion_x, ecef_postion_y, ecef_postion_z, pos_xaxis_x, pos_xaxis_y, pos_xaxis_z, pos_yaxis_x,
+        pos_yaxis_y, pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
+        '''
+        if self.__num is None:
+            raise Exception("gesture data is not generated, please call gen_gesture_on_path first")
+        return self.__gesture_for_path()
+
+    @property
+    def enu_origin(self):
+        '''
+        the origin [lat, lon, alt], [deg, deg, m] of the east/north/up coordinates, the first valid position fix
+        unless set in the constructor
+        '''
+        if self.__enu_origin is None:
+            pos_data = self.pos_data
+            valid = np.nonzero(np.any(pos_data != 0, axis=1))[0]
+            if len(valid) == 0:
+                raise Exception("LLA is all zeros, could not anchor the east/north/up coordinates")
+            self.__enu_origin = [float(v) for v in pos_data[valid[0]]]
+        return self.__enu_origin
+
+    @property
+    def enu_data(self):
+        '''
+        the path in local coordinates, nx3 numpy array [east, north, up] in meter of enu_dtype
+        '''
+        source_files = [self.pos_file, self.eul_file] if self.timed else [self.pos_file]
+        return self.__stage("enu_data", lambda: ecef2enu_batch(self.path_data, self.__enu_origin_rad(),
+                                                               dtype=self.enu_dtype),
+                            source_files, rate=self.rate if self.timed else None, origin=self.enu_origin,
+                            dtype=self.enu_dtype.str)
+
+    @property
+    def valid_mask(self):
+        '''
+        n bool numpy array, False for the records with the LLA is 0 (z == 0 in path data)
+        '''
+        return self.__stage("valid_mask", lambda: self.path_data[:, 2] != 0)
+
+    def gen_gesture_on_path(self, num):
+        '''
+        generate the position data and gesture data, they are computed on first access
+        Args:
+            num: 单位向量轴上的坐标点扩大的倍数
+        '''
+        with profile_stage(self.profiler, "header_check"):
+            #### check the position data by checking the header of the pos file
+            self.__read_pos_from_csv()
+            ### check the euler data by checking the header of the euler file
+            self.__read_euler_from_csv()
+        self.num = num
+
+    def gen_vtk_for_path_gesture(self, what_vtk, vtk_path, frame="ecef", **writer_options):
         '''
         generate VTP file for path or gesture in paraview
          Args:
-            what_vtk: a string list to specify which vtk to generate. the string can be "path", "gesture" or so on.
+            what_vtk: a string list to specify which vtk to generate. the string can be "path", "gesture" (one time
+                step per record) or "gesture_triads" (all records in one PolyData with an "index" point data array).
             vtk_path: the path for VTK file
+            frame: "ecef" for the ECEF coordinates or "enu" for the east/north/up coordinates of enu_data
+            writer_options: optional VTP writer settings, compressor ("none", "zlib", "lz4", "lzma"), data_mode
+                ("ascii", "binary", "appended"), encode_appended (False for raw appended binary) and points_dtype
         '''
+        data = self.__vtk_data(what_vtk, frame)
         if what_vtk == "gesture":
-            # get the gesture data and delete records with the LLA is 0
-            index_ges = np.where(self.gesture_data[:, 2] == 0)
-            self.gesture_data = np.delete(self.gesture_data, index_ges, axis=0)
-            if len(self.gesture_data) == 0:
-                raise Exception("no gesture data generated, no gesture VTP file generated")
-            self.__gen_gesture_vtp(self.gesture_data, vtk_path)
-        elif what_vtk == "path":
-            index_path = np.where(self.path_data[:, 2] == 0)
-            self.path_data = np.delete(self.path_data, index_path, axis=0)
-            if len(self.path_data) == 0:
-                raise Exception("no path data generated, no path VTP file generated")
-            self.__gen_path_vtp(self.path_data, vtk_path)
+            self.__gen_gesture_vtp(data, vtk_path, **writer_options)
+        elif what_vtk == "gesture_triads":
+            if self.timed:
+                writer_options.setdefault("times", self.times[self.valid_mask])
+            self.__gen_gesture_triads_vtp(data, vtk_path, **writer_options)
         else:
-            raise TypeError(
-                'please type the correct type vtk file, path or gesture')
+            self.__gen_path_vtp(data, vtk_path, **writer_options)
+
+    def gen_vtk_pieces(self, what_vtk, index_path, piece_rows=PIECE_ROWS, window=None, workers=None, frame="ecef",
+                       steps="record", **writer_options):
+        '''
+        generate the path or gesture as VTP pieces written in parallel and a collection index, for logs too long for
+        one file, see vtp_partition.py
+         Args:
+            what_vtk: "path" or "gesture_triads" for a .pvtp index, "gesture" for a .pvd of the triads
+            index_path: the .pvtp or .pvd file, the pieces are written to the directory <index_path>_pieces
+            piece_rows: records per piece
+            window: optional piece length in s instead of piece_rows, the files need timestamps
+            workers: worker processes, None for the number of CPUs
+            frame: "ecef" or "enu", see gen_vtk_for_path_gesture
+            steps: "record" for one .pvd time step per record, "piece" for one per piece, see vtp_partition.py
+            writer_options: see gen_vtk_for_path_gesture
+        returns:
+            dict of the number of "pieces", "bytes" written and "seconds"
+        '''
+        data = self.__vtk_data(what_vtk, frame)
+        times = self.times[self.valid_mask] if self.timed else None
+        with profile_stage(self.profiler, "vtp_pieces", rows=len(data)) as record:
+            timing = write_pieces(what_vtk, data, index_path, piece_rows=piece_rows, times=times, window=window,
+                                  workers=workers, steps=steps, **writer_options)
+            record["bytes_written"] = timing["bytes"]
+        print("%s VTP pieces are generated!" % what_vtk)
+        return timing
 
     def get_path_gesture_data(self):
         '''
@@ -103,173 +293,272 @@ class Vis(object):
                                 pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
         unit_vector_coord: numpy array nx9 [unit_xaxis_x, unit_xaxis_y, unit_xaxis_z, unit_yaxis_x, unit_yaxis_y,
                                 unit_yaxis_z, unit_zaxis_x, unit_zaxis_y, unit_zaxis_z]
+        The array is generated from the path and the attitude on every call.
+        returns:
+              gesture_on_path_data: numpy array nx21, [x, y, z, unit_xaxis_x,
+                        unit_xaxis_y, unit_xaxis_z, unit_yaxis_x, unit_yaxis_y, unit_yaxis_z, unit_zaxis_x,
+                        unit_zaxis_y, unit_zaxis_z, pos_xaxis_x, pos_xaxis_y, pos_xaxis_z, pos_yaxis_x, pos_yaxis_y,
+                        pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
+        '''
+        return self.__merge_path_gesture()
+
+    def get_path_gesture_enu(self):
+        '''
+        return the path and gesture axis ends in east/north/up coordinates for plotting, generated on every call
+        returns:
+            numpy array nx12 of enu_dtype, [east, north, up, pos_xaxis_e, pos_xaxis_n, pos_xaxis_u, pos_yaxis_e,
+                pos_yaxis_n, pos_yaxis_u, pos_zaxis_e, pos_zaxis_n, pos_zaxis_u] without the records with the LLA is 0
+        '''
+        if self.__num is None:
+            raise Exception("gesture data is not generated, please call gen_gesture_on_path first")
+        gesture = self.__gesture_for_path(self.valid_mask)
+        if len(gesture) == 0:
+            raise Exception("LLA is all zeros, could not return gesture data")
+        return self.__to_enu(gesture)
+
+    def write_table(self, table_file, table="gesture_on_path", **options):
+        '''
+        write the path or the gesture on path data as a table with named columns, e.g. for pandas or another tool
+        Args:
+            table_file: the table file, .csv, .npy, .parquet, .arrow, .feather, .h5 or .hdf5, see table_writer.py
+            table: "gesture_on_path" for the nx21 array of get_path_gesture_data or "path" for the ECEF position of
+                every record (the former output_file\\ecef_pos.csv)
+            options: compression and compression_level, see table_writer.write_table
+        returns:
+            the number of bytes written
+        '''
+        if table == "gesture_on_path":
+            data, columns = self.get_path_gesture_data(), GESTURE_ON_PATH_COLUMNS
+        elif table == "path":
+            data, columns = self.path_data, PATH_COLUMNS
+        else:
+            raise ValueError('table must be "gesture_on_path" or "path"')
+        with profile_stage(self.profiler, "write_table", rows=len(data)) as record:
+            record["bytes_written"] = write_table(data, table_file, columns, **options)
+        print("%s table file is generated!" % table)
+        return record["bytes_written"]
+
+    def stage_report(self):
+        '''
         returns:
-              gesture_on_path_data: numpy array nx21, [x, y, z, unit_xaxis_x, unit_xaxis_y, unit_xaxis_z, unit_yaxis_x,
-                        unit_yaxis_y, unit_yaxis_z, unit_zaxis_x, unit_zaxis_y, unit_zaxis_z, pos_xaxis_x, pos_xaxis_y,
-                        pos_xaxis_z, pos_yaxis_x, pos_yaxis_y, pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
+            string, one line per stage run with its time and number of rows
         '''
-        if len(self.gesture_data) == 0:
+        lines = ["%-20s %10s %12s %8s" % ("stage", "rows", "seconds", "cached")]
+        for record in self.stage_log:
+            lines.append("%-20s %10d %12.6f %8s" % (record["stage"], record["rows"], record["seconds"],
+                                                    record["cached"]))
+        return "\n".join(lines)
+
+    def __stage(self, name, compute, source_files=None, **params):
+        '''
+        get a memoized stage, compute it (or map it from the cache) on first access
+        Args:
+            name: stage name
+            compute: function returning the stage array
+            source_files: input files of the stage, the stage is cached in self.cache if given
+            params: extra values the stage depends on, part of the cache key
+        '''
+        if name in self.__stages:
+            return self.__stages[name]
+        start = time.perf_counter()
+        value = None
+        key = None
+        with profile_stage(self.profiler, name) as record:
+            if self.cache is not None and source_files is not None:
+                key = self.cache.key(source_files, stage=name, **params)
+                cached = self.cache.load(key)
+                if cached is not None:
+                    value = cached[name]
+            cached = value is not None
+            if value is None:
+                value = compute()
+                if key is not None:
+                    self.cache.store(key, {name: value}, source_files=source_files)
+            record.update(rows=len(value), array_mb=value.nbytes / MB, cached=cached)
+        self.__stages[name] = value
+        self.stage_log.append({"stage": name, "seconds": time.perf_counter() - start, "rows": len(value),
+                               "cached": cached})
+        return value
+
+    def __parse_pos(self):
+        with profile_stage(self.profiler, "parse_pos") as record:
+            pos_data = self.__pos_reader.read_all()
+            record.update(rows=len(pos_data), bytes_read=self.__pos_reader.bytes_read, array_mb=pos_data.nbytes / MB)
+        self.parse_rate["pos"] = self.__pos_reader.parse_rate
+        return pos_data
+
+    def __parse_euler(self):
+        with profile_stage(self.profiler, "parse_euler") as record:
+            euler_data = self.__euler_reader.read_all()
+            record.update(rows=len(euler_data), bytes_read=self.__euler_reader.bytes_read,
+                          array_mb=euler_data.nbytes / MB)
+        self.parse_rate["euler"] = self.__euler_reader.parse_rate
+        return euler_data
+
+    def __merge_path_gesture(self):
+        path_data = self.path_data
+        attitude = self.attitude
+        if self.__num is None or len(attitude) == 0:
             raise Exception("gesture data is empty, could not return gesture data")
-        if len(self.path_data) == 0:
+        if len(path_data) == 0:
             raise Exception("path data is empty, could not return gesture data")
-        if len(self.unit_vector_coord) == 0:
-            raise Exception("gesture data is empty, could not return gesture data")
-        if len(self.gesture_data) != len(self.path_data) or len(self.gesture_data) != len(self.unit_vector_coord) \
-                or len(self.path_data) != len(self.unit_vector_coord):
+        if len(path_data) != len(attitude):
             raise Exception("gesture data is not equal to path data and unit vector coord data,\
              could not return gesture data")
-        # merge all data together and delete records with the LLA is 0(z==0 in path data)
-        gesture_on_path_data = np.zeros((len(self.path_data), 21))
-        gesture_on_path_data[:, 0:3] = self.path_data
-        gesture_on_path_data[:, 3:12] = self.unit_vector_coord
-        gesture_on_path_data[:, 12:21] = self.gesture_data[:, 3:12]
-        # delete LLA is 0 records
-        index_path = np.where(gesture_on_path_data[:, 2] == 0)
-        gesture_on_path_data = np.delete(gesture_on_path_data, index_path, axis=0)
+        # merge all data together without the records with the LLA is 0(z==0 in path data)
+        mask = self.valid_mask
+        gesture_on_path_data = np.empty((np.count_nonzero(mask), 21))
         if len(gesture_on_path_data) == 0:
             raise Exception("LLA is all zeros, could not return gesture data")
+        with profile_stage(self.profiler, "filter", rows=len(mask)):
+            path = gesture_on_path_data[:, 0:3]
+            path[...] = path_data[mask]
+            attitude = attitude[mask]
+        self.__unit_vectors(attitude, out=gesture_on_path_data[:, 3:12])
+        with profile_stage(self.profiler, "gesture_offset", rows=len(gesture_on_path_data),
+                           array_mb=gesture_on_path_data.nbytes / MB):
+            self.__executor.map_rows(self.__offset_axes, [path, gesture_on_path_data[:, 3:12]],
+                                     gesture_on_path_data[:, 12:21], num=self.__num)
         return gesture_on_path_data
 
 
     def __read_euler_from_csv(self):
         # check the euler file header
-        euler_column = ['Yaw (deg)', 'Pitch (deg)', 'Roll (deg)']
-        if list(self.euler_data_header[0, :]) != euler_column:
-            raise ValueError("euler file must have the header ('Yaw_deg', 'Pitch_deg', 'Roll_deg'),\
-             please check the euler file")
+        check_euler_header(self.euler_header)
 
 
     def __euler_to_gesture(self):
         '''
-         get the euler angles of each record and generate each coordinate for each unit Vector rotation axis(x,y,z).
+         get the euler angles of all records and convert them to the attitude quaternions
+        returns:
+            attitude: nx4 numpy array [w, x, y, z] of attitude_dtype
         '''
-        Vector = np.array([
-            [1, 0, 0],
-            [0, 1, 0],
-            [0, 0, 1]
-        ])
-        for i in range(self.euler_data.shape[0]):
-            self.unit_vector_coord[i, 0:3] = self.__eulerAnglesToRotationMatrix(self.euler_data[i, :]).dot(Vector)[:, 0]
-            self.unit_vector_coord[i, 3:6] = self.__eulerAnglesToRotationMatrix(self.euler_data[i, :]).dot(Vector)[:, 1]
-            self.unit_vector_coord[i, 6:9] = self.__eulerAnglesToRotationMatrix(self.euler_data[i, :]).dot(Vector)[:, 2]
+        euler_data = self.euler_data
+        if self.timed:
+            # slerp the attitude quaternions at the aligned times
+            return interp_slerp(self.euler_time, euler2quat_batch(euler_data), self.times).astype(
+                self.attitude_dtype, copy=False)
+        return self.__executor.map_rows(euler2quat_batch, [euler_data],
+                                        np.empty((len(euler_data), 4), dtype=self.attitude_dtype))
+
 
+    def __enu_origin_rad(self):
+        lat, lon, alt = self.enu_origin
+        return [lat * D2R, lon * D2R, alt]
 
-    def __eulerAnglesToRotationMatrix(self, angles):
+
+    def __to_enu(self, gesture):
+        # nx12 ECEF points, 4 per record, to east/north/up
+        return ecef2enu_batch(gesture.reshape(-1, 3), self.__enu_origin_rad(), dtype=self.enu_dtype).reshape(-1, 12)
+
+
+    def __unit_vectors(self, attitude, out=None):
         '''
-        get the rotation Matrix for each euler angles
-        Args:
-            angles: euler angle[yaw, pitch, roll] numpy array
+         generate the coordinate of each unit Vector rotation axis(x,y,z) from the attitude quaternions. The nx3x3
+         rotation matrix stack is written through a view on unit_vector_coord, see rotation_matrix.
         returns:
-            R: rotation matrix [3x3] for euler angles
-        '''
-        # convert angles from deg to rad
-        theta = np.zeros((3, 1), dtype=np.float64)
-        theta[0] = angles[0] * 3.141592653589793 / 180.0
-        theta[1] = angles[1] * 3.141592653589793 / 180.0
-        theta[2] = angles[2] * 3.141592653589793 / 180.0
-        R_x = np.array([[1, 0, 0],
-                        [0, math.cos(theta[0]), -math.sin(theta[0])],
-                        [0, math.sin(theta[0]), math.cos(theta[0])]
-                        ])
-        R_y = np.array([[math.cos(theta[1]), 0, math.sin(theta[1])],
-                        [0, 1, 0],
-                        [-math.sin(theta[1]), 0, math.cos(theta[1])]
-                        ])
-        R_z = np.array([[math.cos(theta[2]), -math.sin(theta[2]), 0],
-                        [math.sin(theta[2]), math.cos(theta[2]), 0],
-                        [0, 0, 1]
-                        ])
-        R = np.dot(R_z, np.dot(R_y, R_x))
-        return R
-
-
-    def __gesture_for_path(self, num):
+            unit_vector_coord: nx9 numpy array, out if given
+        '''
+        if out is None:
+            out = np.empty((len(attitude), 9))
+        with profile_stage(self.profiler, "rotations", rows=len(attitude), array_mb=out.nbytes / MB):
+            self.__executor.map_rows(quat2rotation_batch, [attitude], out.reshape(-1, 3, 3).transpose(0, 2, 1))
+        return out
+
+
+    @staticmethod
+    def __offset_axes(path, unit_vectors, num, out):
+        # the gesture axis ends, the unit vectors scaled by num around the path position, out may be unit_vectors
+        np.multiply(unit_vectors, num, out=out)
+        for j in range(3):
+            out[:, 3 * j:3 * j + 3] += path
+        return out
+
+
+    def __gesture_for_path(self, mask=None):
         '''
         get the actual gesture data by adding ecef position data
+        Args:
+            mask: optional bool numpy array, only the selected records
+        returns:
+            gesture_data: nx12 numpy array
         '''
-        if len(self.pos_data) == 0:
+        num = self.__num
+        path_data = self.path_data
+        attitude = self.attitude
+        if len(path_data) == 0:
             print(" could not generate the gesture data as the position file is empty")
-        elif len(self.path_data) != len(self.unit_vector_coord) or len(self.pos_data) != len(self.euler_data):
-            print("could not generate the gesture data as the length of position file is not equal to euler file's ")
-        else:
-            self.gesture_data[:, 0:3] = self.path_data[:, 0:3]
-            self.gesture_data[:, 3:6] = self.path_data[:, 0:3] + self.unit_vector_coord[:, 0:3] * num
-            self.gesture_data[:, 6:9] = self.path_data[:, 0:3] + self.unit_vector_coord[:, 3:6] * num
-            self.gesture_data[:, 9:12] = self.path_data[:, 0:3] + self.unit_vector_coord[:, 6:9] * num
+            return np.zeros((len(attitude), 12))
+        elif len(path_data) != len(attitude):
+            print("could not generate the gesture data as the length of position file is not equal to euler file's, "
+                  "add the timestamp column 'time (s)' to both files to align them in time")
+            return np.zeros((len(attitude), 12))
+        if mask is not None:
+            with profile_stage(self.profiler, "filter", rows=len(mask)):
+                path_data = path_data[mask]
+                attitude = attitude[mask]
+        gesture_data = np.empty((len(attitude), 12))
+        path = gesture_data[:, 0:3]
+        path[...] = path_data[:, 0:3]
+        self.__unit_vectors(attitude, out=gesture_data[:, 3:12])
+        with profile_stage(self.profiler, "gesture_offset", rows=len(gesture_data),
+                           array_mb=gesture_data.nbytes / MB):
+            self.__executor.map_rows(self.__offset_axes, [path, gesture_data[:, 3:12]], gesture_data[:, 3:12],
+                                     num=num)
+        return gesture_data
 
 
     def __read_pos_from_csv(self):
         # check the pos file header
-        pos_column = ['pos_lat (deg)', 'pos_lon (deg)', 'pos_alt (m)']
-        if list(self.pos_data_header[0, :]) != pos_column:
-            raise ValueError("pos file must have the header['pos_lat (deg)', 'pos_lon (deg)', 'pos_alt (m)'], \
-             please check the position file")
+        check_pos_header(self.pos_header)
 
 
     def __gps_to_ecef(self):
-        # convert deg to rad for lat, lon
-        convert_pos_data = self.pos_data
-        convert_pos_data[:, 0] = self.pos_data[:, 0] * D2R
-        convert_pos_data[:, 1] = self.pos_data[:, 1] * D2R
-        # store the ecef xyz position into coordinate array
-        ecef_pos = self.__lla2ecef_batch(convert_pos_data)
-        self.path_data[:, 0] = ecef_pos[:, 0]
-        self.path_data[:, 1] = ecef_pos[:, 1]
-        self.path_data[:, 2] = ecef_pos[:, 2]
-
-        np.savetxt('output_file\\ecef_pos.csv', self.path_data, delimiter=',', header="x, y, z",
-                   comments='')
-
-
-    def __lla2ecef_batch(self, lla):
         '''
-         convert the LLA coordinate [Lat Lon Alt] position to xyz ecef position
-        args:
-            lla: GPS LLA position  [Lat, Lon, Alt], [rad, rad, meter], nx3 numpy array
-        :return:
-            ecef_xyz: ecef position, nx3 numpy array
+        convert the position data to ecef
+        returns:
+            path_data: nx3 numpy array
         '''
+        pos_data = self.pos_data
+        # convert deg to rad for lat, lon, pos_data itself stays in deg (it may be a read-only cached array)
+        convert_pos_data = np.array(pos_data[:, 0:3])
+        convert_pos_data[:, 0] = pos_data[:, 0] * D2R
+        convert_pos_data[:, 1] = pos_data[:, 1] * D2R
+        # store the ecef xyz position into coordinate array
+        path_data = self.__executor.map_rows(lla2ecef_batch, [convert_pos_data],
+                                             np.empty((len(convert_pos_data), 3)))
+        if self.timed:
+            # interpolate the positions linearly at the aligned times, the times outside the valid fixes get the zero
+            # position and are dropped by valid_mask
+            path_data = interp_path(self.pos_time, path_data, self.times)
 
-        # only one LLA
-        if lla.ndim == 1:
-            return self.__lla2ecef(lla)
-        # multiple LLA
-        n = lla.shape[0]
-        ecef_xyz = np.zeros((n, 3))
-        for i in range(0, n):
-            sl = math.sin(lla[i, 0])
-            cl = math.cos(lla[i, 0])
-            sl_sqr = sl * sl
-            r = Re / math.sqrt(1.0 - E_SQR * sl_sqr)
-            rho = (r + lla[i, 2]) * cl
-
-            ecef_xyz[i, 0] = rho * math.cos(lla[i, 1])
-            ecef_xyz[i, 1] = rho * math.sin(lla[i, 1])
-            ecef_xyz[i, 2] = (r * (1.0 - E_SQR) + lla[i, 2]) * sl
-        return ecef_xyz
+        return path_data
 
 
-    def __lla2ecef(self, lla):
+    def __vtk_data(self, what_vtk, frame):
         '''
-         convert the LLA coordinate [Lat Lon Alt] position to xyz ecef position
-        Args:
-            lla: [Lat, Lon, Alt], [rad, rad, meter], numpy array of size (3,)
-        return:
-            ecef_xyz: ecef position, nx3 numpy array
+        the path or gesture data of the VTP files without the records with the LLA is 0
         '''
-        sl = math.sin(lla[0])
-        cl = math.cos(lla[0])
-        sl_sqr = sl * sl
-
-        r = Re / math.sqrt(1.0 - E_SQR * sl_sqr)
-        rho = (r + lla[2]) * cl
-        x = rho * math.cos(lla[1])
-        y = rho * math.sin(lla[1])
-        z = (r * (1.0 - E_SQR) + lla[2]) * sl
-        return np.array([x, y, z])
+        if frame not in ("ecef", "enu"):
+            raise ValueError('frame must be "ecef" or "enu"')
+        if what_vtk in ("gesture", "gesture_triads"):
+            gesture = self.__gesture_for_path(self.valid_mask) \
+                if self.__num is not None and len(self.attitude) == len(self.path_data) else []
+            if frame == "enu" and len(gesture):
+                gesture = self.__to_enu(gesture)
+            if len(gesture) == 0:
+                raise Exception("no gesture data generated, no gesture VTP file generated")
+            return gesture
+        elif what_vtk == "path":
+            path = (self.enu_data if frame == "enu" else self.path_data)[self.valid_mask]
+            if len(path) == 0:
+                raise Exception("no path data generated, no path VTP file generated")
+            return path
+        raise TypeError(
+            'please type the correct type vtk file, path, gesture or gesture_triads')
 
 
-    def __gen_gesture_vtp(self, path_gesture_data, vtk_path):
+    def __gen_gesture_vtp(self, path_gesture_data, vtk_path, **writer_options):
         '''
           generate gesture vtp file format dependent on time for paraview
         agrs:
@@ -277,60 +566,32 @@ class Vis(object):
                         [x, y, z, pos_xaxis_x, pos_xaxis_y, pos_xaxis_z, pos_yaxis_x, pos_yaxis_y,
                         pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
             vtk_path: string, the stored gesture vtp files path and file name
-
+            writer_options: see vtp_writer.write_gesture_vtp
         '''
-        number_of_steps = path_gesture_data.shape[0]
-        writer = vtk.vtkXMLPolyDataWriter()
-        data_to_write = vtk.vtkPolyData()
-        writer.SetNumberOfTimeSteps(number_of_steps)
-        writer.SetInputData(data_to_write)
-        writer.SetFileName(vtk_path)
-        writer.Start()
-        for i in range(number_of_steps):
-            # 每个姿态图就是一个ployData
-            linepoly = vtk.vtkPolyData()
-            # 每个姿态图上有四个点
-            each_ges_points = vtk.vtkPoints()
-            each_ges_points.SetNumberOfPoints(4)
-            each_ges_points.SetPoint(0, path_gesture_data[i, 0], path_gesture_data[i, 1], path_gesture_data[i, 2])
-            for j in range(1, 4):
-                each_ges_points.SetPoint(j, path_gesture_data[i, 3 * j], path_gesture_data[i, 3 * j + 1],
-                                         path_gesture_data[i, 3 * j + 2])
-            linepoly.SetPoints(each_ges_points)
-            # 三个方向上的姿态线为一个cell
-            lines = vtk.vtkCellArray()
-            # x 方向上的姿态线
-            line0 = vtk.vtkLine()
-            line0.GetPointIds().SetId(0, 0)
-            line0.GetPointIds().SetId(1, 1)
-            # y 方向上的姿态线
-            line1 = vtk.vtkLine()
-            line1.GetPointIds().SetId(0, 0)
-            line1.GetPointIds().SetId(1, 2)
-            # z 方向上的姿态线
-            line2 = vtk.vtkLine()
-            line2.GetPointIds().SetId(0, 0)
-            line2.GetPointIds().SetId(1, 3)
-            lines.InsertNextCell(line0)
-            lines.InsertNextCell(line1)
-            lines.InsertNextCell(line2)
-            # setup colors
-            colors = vtk.vtkNamedColors()
-            Colors = vtk.vtkUnsignedCharArray()
-            Colors.SetNumberOfComponents(3)
-            Colors.SetName("Colors")
-            Colors.InsertNextTypedTuple(colors.GetColor3ub("red"))
-            Colors.InsertNextTypedTuple(colors.GetColor3ub("yellow"))
-            Colors.InsertNextTypedTuple(colors.GetColor3ub("green"))
-            linepoly.SetLines(lines)
-            linepoly.GetCellData().SetScalars(Colors)
-            data_to_write.ShallowCopy(linepoly)
-            writer.WriteNextTime(i)
-        writer.Stop()
+        # vtk takes about a second to import, only the VTP export needs it
+        from IMU_Path_Vis.vtp_writer import write_gesture_vtp
+        with profile_stage(self.profiler, "vtp_gesture", rows=len(path_gesture_data)) as record:
+            write_gesture_vtp(path_gesture_data, vtk_path, **writer_options)
+            record["bytes_written"] = os.path.getsize(vtk_path)
         print("gesture vtp file is generated!")
 
 
-    def __gen_path_vtp(self, path_gesture_data, vtk_path):
+    def __gen_gesture_triads_vtp(self, path_gesture_data, vtk_path, **writer_options):
+        '''
+          generate one gesture vtp file holding the gestures of all records with an "index" point data array
+        agrs:
+            path_gesture_data: nx12 numpy array, see __gen_gesture_vtp
+            vtk_path: string, the stored gesture vtp files path and file name
+            writer_options: see vtp_writer.write_gesture_triads_vtp
+        '''
+        from IMU_Path_Vis.vtp_writer import write_gesture_triads_vtp
+        with profile_stage(self.profiler, "vtp_gesture_triads", rows=len(path_gesture_data)) as record:
+            write_gesture_triads_vtp(path_gesture_data, vtk_path, **writer_options)
+            record["bytes_written"] = os.path.getsize(vtk_path)
+        print("gesture triads vtp file is generated!")
+
+
+    def __gen_path_vtp(self, path_gesture_data, vtk_path, **writer_options):
         '''
          generate points into VTP file for paraview
          args:
@@ -338,28 +599,10 @@ class Vis(object):
                         [x, y, z, pos_xaxis_x, pos_xaxis_y, pos_xaxis_z, pos_yaxis_x, pos_yaxis_y, pos_yaxis_z,
                         pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
             vtk_path: string, the stored path vtp files path and file name
+            writer_options: compressor, data_mode, encode_appended and points_dtype, see vtp_writer.write_path_vtp
         '''
-        number_of_steps = path_gesture_data.shape[0]
-        points = vtk.vtkPoints()
-        points.SetNumberOfPoints(number_of_steps)
-        # Create the topology of the point (a vertex)
-        vertices = vtk.vtkCellArray()
-        vertices.InsertNextCell(number_of_steps)
-        for i in range(number_of_steps):
-            points.SetPoint(i, path_gesture_data[i, 0], path_gesture_data[i, 1], path_gesture_data[i, 2])
-            # We need an an array of point id's for InsertNextCell.
-            vertices.InsertCellPoint(i)
-        polydata = vtk.vtkPolyData()
-        polydata.SetPoints(points)
-        polydata.SetLines(vertices)
-        namedColors = vtk.vtkNamedColors()
-        colors = vtk.vtkUnsignedCharArray()
-        colors.SetNumberOfComponents(3)
-        colors.InsertNextTypedTuple(namedColors.GetColor3ub("white"))
-        polydata.GetCellData().SetScalars(colors)
-        writer = vtk.vtkXMLPolyDataWriter()
-        writer.SetFileName(vtk_path)
-        writer.SetInputData(polydata)
-        writer.Write()
+        from IMU_Path_Vis.vtp_writer import write_path_vtp
+        with profile_stage(self.profiler, "vtp_path", rows=len(path_gesture_data)) as record:
+            write_path_vtp(path_gesture_data, vtk_path, **writer_options)
+            record["bytes_written"] = os.path.getsize(vtk_path)
         print("path VTP file is generated!")
-
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 20:00
+IDE: PyCharm
+Introduction: time alignment of the position and euler streams, which come at different rates (e.g. 10 Hz GPS and
+              100 Hz IMU). Both streams are resampled at common target times: np.searchsorted finds the samples
+              around every target time, positions are interpolated linearly between the valid fixes and attitudes by
+              the slerp of their quaternions.
+"""
+
+import numpy as np
+from IMU_Path_Vis.attitude import quat_slerp
+
+
+def target_times(pos_time, euler_time, rate=None):
+    '''
+    the times both streams are resampled at, inside the time span covered by both streams
+    Args:
+        pos_time: increasing timestamps of the position stream, s
+        euler_time: increasing timestamps of the euler stream, s
+        rate: target rate in Hz, None for the timestamps of the euler stream
+    returns:
+        times: increasing numpy array, s
+    '''
+    if len(pos_time) == 0 or len(euler_time) == 0:
+        return np.zeros(0)
+    start = max(pos_time[0], euler_time[0])
+    end = min(pos_time[-1], euler_time[-1])
+    if end < start:
+        raise ValueError("the position and euler streams do not overlap in time")
+    if rate is None:
+        return euler_time[np.searchsorted(euler_time, start):np.searchsorted(euler_time, end, side="right")]
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    return start + np.arange(int(np.floor((end - start) * rate + 1e-9)) + 1) / rate
+
+
+def bracket(time, t):
+    '''
+    locate each target time between two samples of a stream
+    Args:
+        time: n increasing timestamps of the stream
+        t: m target times
+    returns:
+        i, w: the value at t[k] is (1 - w[k]) * value[i[k]] + w[k] * value[i[k] + 1]
+    '''
+    time = np.asarray(time, dtype=np.float64)
+    if len(time) == 0:
+        raise ValueError("could not align an empty stream")
+    if np.any(np.diff(time) < 0):
+        raise ValueError("the timestamps of a stream must be increasing")
+    i = np.clip(np.searchsorted(time, t, side="right") - 1, 0, max(len(time) - 2, 0))
+    j = np.minimum(i + 1, len(time) - 1)
+    dt = time[j] - time[i]
+    w = np.where(dt > 0, (t - time[i]) / np.where(dt > 0, dt, 1.0), 0.0)
+    return i, np.clip(w, 0.0, 1.0)
+
+
+def interp_linear(time, values, t):
+    '''
+    linear interpolation of the rows of values at the target times
+    Args:
+        time: n increasing timestamps
+        values: nxk numpy array
+        t: m target times
+    returns:
+        mxk numpy array
+    '''
+    i, w = bracket(time, t)
+    j = np.minimum(i + 1, len(time) - 1)
+    return values[i] * (1.0 - w)[:, None] + values[j] * w[:, None]
+
+
+def interp_slerp(time, quat, t):
+    '''
+    slerp of unit quaternions at the target times
+    Args:
+        time: n increasing timestamps
+        quat: nx4 numpy array [w, x, y, z]
+        t: m target times
+    returns:
+        mx4 numpy array
+    '''
+    i, w = bracket(time, t)
+    j = np.minimum(i + 1, len(time) - 1)
+    return quat_slerp(quat[i], quat[j], w)
+
+
+def interp_path(pos_time, path_data, t):
+    '''
+    linear interpolation of the ECEF path at the target times between the valid position fixes only, a fix with the
+    LLA is 0 (z == 0 in ECEF, about (Re, 0, 0)) would pull the interpolated points off the path
+    Args:
+        pos_time: n increasing timestamps of the position stream, s
+        path_data: nx3 numpy array of the ECEF position [x, y, z]
+        t: m target times
+    returns:
+        mx3 numpy array, the zero position at the times outside the valid fixes
+    '''
+    valid = path_data[:, 2] != 0
+    pos_time = np.asarray(pos_time)[valid]
+    path = np.zeros((len(t), 3))
+    if len(pos_time):
+        inside = (t >= pos_time[0]) & (t <= pos_time[-1])
+        path[inside] = interp_linear(pos_time, path_data[valid], t[inside])
+    return path
@@ -0,0 +1,149 @@
+/*
+ * Project: IMU_Path_Visualisation
+ * Introduction: clientside playback of plotly_dash_gesture_on_path.py. The gesture on path data is shipped once as
+ *               the "gesture-buffer" store (see dash_frames.gesture_buffer) and every frame is built in the browser,
+ *               so play, pause, step and seek never go to the server. In follow mode the records appended to the
+ *               log arrive as "tail-frame" updates which grow the decoded buffer and extend the path trace. A new
+ *               buffer, another dataset selected, resets the playback.
+ */
+(function () {
+    // decoded buffer, only decoded again when the dataset key changes, n records of 12 values are valid
+    var decoded = {key: null, values: null, n: 0};
+    // last seen control values, a clientside callback has no callback_context in this Dash version
+    var last = {n_intervals: 0, n_play: 0, n_pause: 0, n_forward: 0, n_back: 0, locate: null, tail: 0, key: null};
+
+    function toFloat32(data) {
+        var binary = window.atob(data);
+        var bytes = new Uint8Array(binary.length);
+        for (var i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new Float32Array(bytes.buffer);
+    }
+
+    function decode(buffer) {
+        if (decoded.key !== buffer.key) {
+            decoded = {key: buffer.key, values: toFloat32(buffer.data), n: buffer.n};
+        }
+        return decoded.values;
+    }
+
+    function count(buffer) {
+        if (!buffer) {
+            return 0;
+        }
+        decode(buffer);
+        return decoded.n;
+    }
+
+    // append the records of a tail frame, the capacity doubles so the buffer is not copied on every frame
+    function append(buffer, tail) {
+        decode(buffer);
+        if (tail.key !== decoded.key || tail.start !== decoded.n) {
+            return false;
+        }
+        var rows = toFloat32(tail.data);
+        var size = decoded.n * 12 + rows.length;
+        if (size > decoded.values.length) {
+            var values = new Float32Array(Math.max(size, 2 * decoded.values.length));
+            values.set(decoded.values.subarray(0, decoded.n * 12));
+            decoded.values = values;
+        }
+        decoded.values.set(rows, decoded.n * 12);
+        decoded.n = tail.n;
+        return true;
+    }
+
+    function clamp(index, n) {
+        return Math.max(0, Math.min(n - 1, index));
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        imu: {
+            // the playback state {index, playing} after a tick or a control change
+            tick: function (n_intervals, n_play, n_pause, n_forward, n_back, locate, buffer, stride, range, frame) {
+                var n = count(buffer);
+                var state = {index: frame ? frame.index : null, playing: frame ? frame.playing : false};
+                var key = buffer ? buffer.key : null;
+                if (key !== last.key) {
+                    last.key = key;
+                    state = {index: null, playing: false};
+                }
+                var index = state.index === null ? 0 : state.index;
+                if ((n_play || 0) !== last.n_play) {
+                    state.playing = true;
+                } else if ((n_pause || 0) !== last.n_pause) {
+                    state.playing = false;
+                } else if ((n_forward || 0) !== last.n_forward) {
+                    state.index = index + (range || 1);
+                } else if ((n_back || 0) !== last.n_back) {
+                    state.index = index - (range || 1);
+                } else if (locate !== last.locate && locate !== null && locate !== undefined) {
+                    state.index = locate;
+                } else if ((n_intervals || 0) !== last.n_intervals && state.playing) {
+                    state.index = index + (stride || 1);
+                    if (state.index >= n) {
+                        state.playing = false;
+                    }
+                }
+                last.n_intervals = n_intervals || 0;
+                last.n_play = n_play || 0;
+                last.n_pause = n_pause || 0;
+                last.n_forward = n_forward || 0;
+                last.n_back = n_back || 0;
+                last.locate = locate;
+                if (n === 0) {
+                    return {index: null, playing: false};
+                }
+                if (state.playing && state.index === null) {
+                    state.index = 0;
+                }
+                if (state.index !== null) {
+                    state.index = clamp(state.index, n);
+                }
+                return state;
+            },
+            // extendData replacing the three gesture axis lines by the gesture of the current record, or extending
+            // the path trace by the records of a new tail frame
+            frame: function (frame, tail, buffer) {
+                var no_update = window.dash_clientside.no_update || null;
+                if (tail && buffer && (tail.seq || 0) !== last.tail) {
+                    last.tail = tail.seq || 0;
+                    if (!tail.data || !append(buffer, tail)) {
+                        return no_update;
+                    }
+                    return [{x: [tail.x], y: [tail.y], z: [tail.z], customdata: [tail.customdata]}, [3]];
+                }
+                if (!frame || frame.index === null || frame.index >= count(buffer)) {
+                    return no_update;
+                }
+                var values = decode(buffer);
+                var base = frame.index * 12;
+                var origin = buffer.origin;
+                var update = {x: [], y: [], z: [], hovertext: []};
+                var axes = ["x", "y", "z"];
+                for (var j = 0; j < 3; j++) {
+                    for (var k = 0; k < 3; k++) {
+                        update[axes[k]].push([values[base + k] + origin[k],
+                                              values[base + 3 * (j + 1) + k] + origin[k]]);
+                    }
+                    var text = "point ID:" + frame.index;
+                    update.hovertext.push([text, text]);
+                }
+                return [update, [0, 1, 2], 2];
+            },
+            interval_disabled: function (frame) {
+                return !(frame && frame.playing);
+            },
+            interval_ms: function (fps) {
+                return Math.max(1, Math.round(1000 / (fps > 0 ? fps : 30)));
+            },
+            status: function (frame, buffer) {
+                if (!frame || frame.index === null || !buffer) {
+                    return "";
+                }
+                return "point ID: " + frame.index + " / " + (count(buffer) - 1) + (frame.playing ? " (playing)" : "");
+            }
+        }
+    });
+})();
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 10:20
+IDE: PyCharm
+Introduction: vectorized attitude conversions used by class Vis, e.g. euler angles to a stack of rotation matrices,
+              euler angles to unit quaternions and the slerp of quaternions.
+"""
+
+import numpy as np
+
+# rows converted per block, keeps the float64 temporaries inside the CPU cache
+EULER2ROTATION_BLOCK = 1 << 14
+
+
+def euler2rotation_batch(euler, out=None):
+    '''
+     get the rotation matrix of each euler angles record in one pass, R = R_z(roll) * R_y(pitch) * R_x(yaw) as
+     in the former per-row Vis.__eulerAnglesToRotationMatrix.
+    Args:
+        euler: euler angles [yaw, pitch, roll], [deg, deg, deg], nx3 array like
+        out: optional nx3x3 float array (may be a strided view) the rotation matrices are written into
+    returns:
+        R: rotation matrices, nx3x3 numpy array, R[i, :, j] is the unit vector of axis j of record i; out if given
+    '''
+    euler = np.asarray(euler, dtype=np.float64)
+    if euler.ndim != 2 or euler.shape[1] != 3:
+        raise ValueError("euler must be a nx3 array of [yaw, pitch, roll], got shape %s" % (euler.shape,))
+    n = euler.shape[0]
+    if out is None:
+        out = np.empty((n, 3, 3))
+    elif out.shape != (n, 3, 3):
+        raise ValueError("out must have shape %s, got %s" % ((n, 3, 3), out.shape))
+    tmp = np.empty(EULER2ROTATION_BLOCK)
+    for start in range(0, n, EULER2ROTATION_BLOCK):
+        stop = min(start + EULER2ROTATION_BLOCK, n)
+        m = stop - start
+        # theta = angle * pi / 180, [yaw, pitch, roll] rotate about [x, y, z]
+        theta = euler[start:stop].T * 3.141592653589793 / 180.0
+        ca, cb, cc = np.cos(theta)
+        sa, sb, sc = np.sin(theta)
+        b_tmp = tmp[:m]
+        R = out[start:stop]
+        # x axis: R_z * R_y * R_x * [1, 0, 0]
+        np.multiply(cc, cb, out=R[:, 0, 0])
+        np.multiply(sc, cb, out=R[:, 1, 0])
+        np.negative(sb, out=R[:, 2, 0])
+        # y axis
+        np.multiply(sb, sa, out=b_tmp)
+        np.multiply(cc, b_tmp, out=R[:, 0, 1])
+        R[:, 0, 1] -= sc * ca
+        np.multiply(sc, b_tmp, out=R[:, 1, 1])
+        R[:, 1, 1] += cc * ca
+        np.multiply(cb, sa, out=R[:, 2, 1])
+        # z axis
+        np.multiply(sb, ca, out=b_tmp)
+        np.multiply(cc, b_tmp, out=R[:, 0, 2])
+        R[:, 0, 2] += sc * sa
+        np.multiply(sc, b_tmp, out=R[:, 1, 2])
+        R[:, 1, 2] -= cc * sa
+        np.multiply(cb, ca, out=R[:, 2, 2])
+    return out
+
+
+def euler2quat_batch(euler, out=None):
+    '''
+     get the unit quaternion of each euler angles record, the quaternion of R = R_z(roll) * R_y(pitch) * R_x(yaw)
+     as in euler2rotation_batch
+    Args:
+        euler: euler angles [yaw, pitch, roll], [deg, deg, deg], nx3 array like
+        out: optional nx4 float array the quaternions are written into
+    returns:
+        q: quaternions [w, x, y, z], nx4 numpy array; out if given
+    '''
+    euler = np.asarray(euler, dtype=np.float64)
+    if euler.ndim != 2 or euler.shape[1] != 3:
+        raise ValueError("euler must be a nx3 array of [yaw, pitch, roll], got shape %s" % (euler.shape,))
+    n = euler.shape[0]
+    if out is None:
+        out = np.empty((n, 4))
+    elif out.shape != (n, 4):
+        raise ValueError("out must have shape %s, got %s" % ((n, 4), out.shape))
+    for start in range(0, n, EULER2ROTATION_BLOCK):
+        stop = min(start + EULER2ROTATION_BLOCK, n)
+        # half angles, [yaw, pitch, roll] rotate about [x, y, z]
+        half = euler[start:stop].T * (3.141592653589793 / 360.0)
+        ca, cb, cc = np.cos(half)
+        sa, sb, sc = np.sin(half)
+        q = out[start:stop]
+        q[:, 0] = cc * cb * ca + sc * sb * sa
+        q[:, 1] = cc * cb * sa - sc * sb * ca
+        q[:, 2] = cc * sb * ca + sc * cb * sa
+        q[:, 3] = sc * cb * ca - cc * sb * sa
+    return out
+
+
+def quat2rotation_batch(q, out=None):
+    '''
+     get the rotation matrix of each unit quaternion
+    Args:
+        q: quaternions [w, x, y, z], nx4 array like
+        out: optional nx3x3 float array (may be a strided view) the rotation matrices are written into
+    returns:
+        R: rotation matrices, nx3x3 numpy array, R[i, :, j] is the unit vector of axis j of record i; out if given
+    '''
+    q = np.asarray(q, dtype=np.float64)
+    if q.ndim != 2 or q.shape[1] != 4:
+        raise ValueError("q must be a nx4 array of [w, x, y, z], got shape %s" % (q.shape,))
+    n = q.shape[0]
+    if out is None:
+        out = np.empty((n, 3, 3))
+    elif out.shape != (n, 3, 3):
+        raise ValueError("out must have shape %s, got %s" % ((n, 3, 3), out.shape))
+    for start in range(0, n, EULER2ROTATION_BLOCK):
+        stop = min(start + EULER2ROTATION_BLOCK, n)
+        w, x, y, z = q[start:stop].T
+        R = out[start:stop]
+        R[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+        R[:, 0, 1] = 2.0 * (x * y - w * z)
+        R[:, 0, 2] = 2.0 * (x * z + w * y)
+        R[:, 1, 0] = 2.0 * (x * y + w * z)
+        R[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+        R[:, 1, 2] = 2.0 * (y * z - w * x)
+        R[:, 2, 0] = 2.0 * (x * z - w * y)
+        R[:, 2, 1] = 2.0 * (y * z + w * x)
+        R[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return out
+
+
+def quat_slerp(q0, q1, t):
+    '''
+     spherical linear interpolation between two stacks of unit quaternions, along the shorter arc
+    Args:
+        q0: quaternions at t = 0, nx4 numpy array
+        q1: quaternions at t = 1, nx4 numpy array
+        t: n numpy array of the interpolation weights in [0, 1]
+    returns:
+        q: unit quaternions, nx4 numpy array
+    '''
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    dot = np.einsum("ij,ij->i", q0, q1)
+    # q and -q are the same attitude, take the shorter arc
+    sign = np.where(dot < 0.0, -1.0, 1.0)
+    dot = np.minimum(np.abs(dot), 1.0)
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    # nearly identical quaternions, the linear interpolation is exact enough and avoids 0 / 0
+    near = sin_theta < 1e-6
+    safe = np.where(near, 1.0, sin_theta)
+    s0 = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / safe)
+    s1 = np.where(near, t, np.sin(t * theta) / safe) * sign
+    q = q0 * s0[:, None] + q1 * s1[:, None]
+    q /= np.linalg.norm(q, axis=1)[:, None]
+    return q
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 16:10
+IDE: PyCharm
+Introduction: batch entry point of vis_main.export_vtp. It discovers the pos-*.csv / att_euler-*.csv pairs below an
+              input directory and exports the path and gesture VTP files of each pair in a process pool into a
+              mirrored output tree. The options of an export are stored next to its VTP files, a pair is exported
+              again when its files are newer than the outputs or the options changed, e.g.
+              python -m IMU_Path_Vis.batch_export input_dir output_dir --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from IMU_Path_Vis.csv_reader import csv_stem
+from IMU_Path_Vis.vis_main import export_vtp
+
+POS_PREFIX = "pos-"
+EULER_PREFIX = "att_euler-"
+# the options of an export, <name>_export.json next to its VTP files
+OPTIONS_SUFFIX = "_export.json"
+
+
+def find_pairs(input_dir):
+    '''
+    find the position and euler file pairs below input_dir. pos-<name>.csv pairs with att_euler-<name>.csv in the
+    same directory; when there is none, trailing "_xxx" parts of the name are dropped one by one, e.g.
+    pos-algo0_0_hig.csv pairs with att_euler-algo0_0.csv. Compressed .csv.gz / .csv.zst files pair the same way.
+    Args:
+        input_dir: the directory searched recursively
+    returns:
+        pairs: sorted list of (relative directory, name, pos_file, eul_file)
+    '''
+    pairs = []
+    for dir_path, _, file_names in os.walk(input_dir):
+        # stem -> file, a plain .csv wins over a compressed copy of it
+        csv_files = {csv_stem(f): f for f in sorted(file_names, reverse=True) if csv_stem(f) is not None}
+        euler_files = {stem[len(EULER_PREFIX):]: f for stem, f in csv_files.items() if stem.startswith(EULER_PREFIX)}
+        for stem, f in csv_files.items():
+            if not stem.startswith(POS_PREFIX):
+                continue
+            name = stem[len(POS_PREFIX):]
+            parts = name.split("_")
+            while parts and "_".join(parts) not in euler_files:
+                parts.pop()
+            if not parts:
+                continue
+            eul_name = "_".join(parts)
+            pairs.append((os.path.relpath(dir_path, input_dir), name, os.path.join(dir_path, f),
+                          os.path.join(dir_path, euler_files[eul_name])))
+    return sorted(pairs)
+
+
+def output_files(output_dir, rel_dir, name):
+    '''
+    returns:
+        path_vtp, gesture_vtp, options_file: the output files of a pair in the mirrored output tree
+    '''
+    out_dir = os.path.normpath(os.path.join(output_dir, rel_dir))
+    return (os.path.join(out_dir, name + "_point_data.vtp"), os.path.join(out_dir, name + "_gesture_data.vtp"),
+            os.path.join(out_dir, name + OPTIONS_SUFFIX))
+
+
+def export_options(num, gesture_vtk, frame):
+    '''
+    returns:
+        dict of the options the VTP files of an export depend on, as stored in the options file
+    '''
+    return {"num": float(num), "gesture_vtk": gesture_vtk, "frame": frame}
+
+
+def is_up_to_date(inputs, outputs, options_file=None, options=None):
+    '''
+    Args:
+        inputs: the input files
+        outputs: the output files
+        options_file: optional options file of the outputs, see export_pair
+        options: the options of the export, compared with the ones in options_file
+    returns:
+        True if every output exists, is not older than any input and was written with the same options
+    '''
+    if not all(os.path.exists(f) for f in outputs):
+        return False
+    if min(os.path.getmtime(f) for f in outputs) < max(os.path.getmtime(f) for f in inputs):
+        return False
+    if options_file is None:
+        return True
+    try:
+        with open(options_file, "r") as f:
+            return json.load(f) == options
+    except (OSError, ValueError):
+        return False
+
+
+def export_pair(pos_file, eul_file, path_vtp, gesture_vtp, num, gesture_vtk, frame="ecef", options_file=None):
+    '''
+    process pool job, export one pair
+    Args:
+        options_file: optional file the options are written to after the export, see is_up_to_date
+    returns:
+        timing dict of vis_main.export_vtp, or {"error": message}
+    '''
+    try:
+        os.makedirs(os.path.dirname(path_vtp), exist_ok=True)
+        if options_file is not None and os.path.exists(options_file):
+            # the outputs are being replaced, they do not match the stored options until the export is done
+            os.remove(options_file)
+        timing = export_vtp(pos_file, eul_file, path_vtp, gesture_vtp, num=num, gesture_vtk=gesture_vtk,
+                            frame=frame)
+        if options_file is not None:
+            with open(options_file, "w") as f:
+                json.dump(export_options(num, gesture_vtk, frame), f)
+        return timing
+    except Exception as e:
+        return {"error": "%s: %s" % (type(e).__name__, e)}
+
+
+def run(input_dir, output_dir, workers=None, num=10, gesture_vtk="gesture", force=False, frame="ecef"):
+    '''
+    export every pair below input_dir and print a per-file and aggregate timing summary
+    Args:
+        input_dir: the directory searched recursively for pos-*.csv / att_euler-*.csv pairs
+        output_dir: the root of the mirrored output tree
+        workers: number of worker processes, None for the number of CPUs
+        num: 单位向量轴上的坐标点扩大的倍数
+        gesture_vtk: "gesture" for time series gesture files or "gesture_triads"
+        force: export pairs whose outputs are up to date and were written with the same options as well
+        frame: "ecef" or "enu" coordinates of the VTP files, see class Vis
+    returns:
+        number of failed pairs
+    '''
+    start = time.perf_counter()
+    jobs = []
+    skipped = 0
+    for rel_dir, name, pos_file, eul_file in find_pairs(input_dir):
+        path_vtp, gesture_vtp, options_file = output_files(output_dir, rel_dir, name)
+        if not force and is_up_to_date([pos_file, eul_file], [path_vtp, gesture_vtp], options_file,
+                                       export_options(num, gesture_vtk, frame)):
+            skipped += 1
+            print("%-50s up to date, skipped" % os.path.join(rel_dir, name))
+            continue
+        jobs.append((os.path.join(rel_dir, name),
+                     (pos_file, eul_file, path_vtp, gesture_vtp, num, gesture_vtk, frame, options_file)))
+    results = {}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(export_pair, *args): label for label, args in jobs}
+            for future in as_completed(futures):
+                label = futures[future]
+                timing = future.result()
+                results[label] = timing
+                if "error" in timing:
+                    print("%-50s FAILED %s" % (label, timing["error"]))
+                else:
+                    print("%-50s %10d records  convert %8.3fs  path %8.3fs  gesture %8.3fs  total %8.3fs" %
+                          (label, timing["records"], timing["convert"], timing["path"], timing["gesture"],
+                           timing["total"]))
+    wall = time.perf_counter() - start
+    done = [t for t in results.values() if "error" not in t]
+    failed = len(results) - len(done)
+    busy = sum(t["total"] for t in done)
+    print("%d exported, %d skipped, %d failed, %d records, %.3fs wall, %.3fs summed over files (%.2fx)" %
+          (len(done), skipped, failed, sum(t["records"] for t in done), wall, busy, busy / wall if wall else 0.0))
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="export path and gesture VTP files for every pos-*.csv / "
+                                                 "att_euler-*.csv pair below a directory")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, default number of CPUs")
+    parser.add_argument("--num", type=float, default=10, help="scale factor of the gesture unit vectors")
+    parser.add_argument("--gesture", choices=["gesture", "gesture_triads"], default="gesture",
+                        help="time series gesture file or a single PolyData of all triads")
+    parser.add_argument("--frame", choices=["ecef", "enu"], default="ecef",
+                        help="ECEF or float32 east/north/up coordinates around the first valid fix")
+    parser.add_argument("-f", "--force", action="store_true", help="export pairs whose outputs are up to date")
+    args = parser.parse_args(argv)
+    return 1 if run(args.input_dir, args.output_dir, args.workers, args.num, args.gesture, args.force,
+                    args.frame) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
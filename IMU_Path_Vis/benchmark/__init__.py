@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 09:30
+IDE: PyCharm
+Introduction: benchmark scripts for IMU_Path_Vis, run them from the project root, e.g.
+              python -m IMU_Path_Vis.benchmark.bench_lla2ecef
+"""
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 20:00
+IDE: PyCharm
+Introduction: time alignment of a 10 Hz position stream and a 100 Hz euler stream, per-step timings of the
+              searchsorted matching, the linear position interpolation and the quaternion slerp.
+              python -m IMU_Path_Vis.benchmark.bench_align [max_rows] [rate]
+"""
+
+import sys
+import numpy as np
+from IMU_Path_Vis.align import target_times, bracket, interp_linear, interp_slerp
+from IMU_Path_Vis.attitude import euler2quat_batch, quat2rotation_batch
+from IMU_Path_Vis.benchmark.synthetic import timed
+
+
+def make_streams(n, seed=0):
+    '''
+    n euler records at 100 Hz and n / 10 ECEF positions at 10 Hz with a jittered clock
+    '''
+    rng = np.random.default_rng(seed)
+    euler_time = np.cumsum(rng.uniform(0.009, 0.011, n))
+    pos_time = np.cumsum(rng.uniform(0.09, 0.11, max(n // 10, 2)))
+    path = np.cumsum(rng.normal(0.0, 0.1, (len(pos_time), 3)), axis=0) + [-2721620.0, 4713984.0, 3313292.0]
+    euler = np.cumsum(rng.normal(0.0, 0.5, (n, 3)), axis=0)
+    return pos_time, path, euler_time, euler
+
+
+def main(max_rows=10 ** 6, rate=None):
+    print("%10s %10s %10s %12s %12s %12s %12s %12s %12s %14s" %
+          ("euler rows", "pos rows", "out rows", "times (s)", "match (s)", "pos (s)", "quat (s)", "slerp (s)",
+           "rotate (s)", "total (rec/s)"))
+    n = 10 ** 4
+    while n <= max_rows:
+        pos_time, path, euler_time, euler = make_streams(n)
+        t_times, times = timed(target_times, pos_time, euler_time, rate)
+        t_match, _ = timed(lambda: (bracket(pos_time, times), bracket(euler_time, times)))
+        t_pos, _ = timed(interp_linear, pos_time, path, times)
+        t_quat, quat = timed(euler2quat_batch, euler)
+        t_slerp, aligned = timed(interp_slerp, euler_time, quat, times)
+        t_rotate, _ = timed(quat2rotation_batch, aligned)
+        # the matching is done again inside the interpolations, it is listed on its own for reference
+        total = t_times + t_pos + t_quat + t_slerp + t_rotate
+        print("%10d %10d %10d %12.4f %12.4f %12.4f %12.4f %12.4f %12.4f %14.3e" %
+              (n, len(pos_time), len(times), t_times, t_match, t_pos, t_quat, t_slerp, t_rotate, len(times) / total))
+        n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         float(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 20:40
+IDE: PyCharm
+Introduction: memory per record of the quaternion attitude store of class Vis against the former unit vector and
+              gesture columns, and the cost of generating the gesture axis ends on demand.
+              python -m IMU_Path_Vis.benchmark.bench_attitude_store [rows]
+"""
+
+import sys
+import tempfile
+import time
+import numpy as np
+from IMU_Path_Vis import IMU_Vis
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+
+# former float64 columns per record: path (3), unit_vector_coord (9), gesture_data (12) and the merged nx21 array
+FORMER_BYTES = 8 * (3 + 9 + 12 + 21)
+
+
+def main(n=10 ** 6):
+    print("%10s %10s %16s %16s %12s %14s %14s" % ("rows", "attitude", "stored (B/rec)", "former (B/rec)", "ratio",
+                                                  "gesture (s)", "max abs diff"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pos_file, eul_file = write_pair(tmp_dir, n)
+        reference = None
+        for dtype in (np.float64, np.float32):
+            vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file, attitude_dtype=dtype)
+            vis.gen_gesture_on_path(10)
+            stored = vis.path_data.nbytes + vis.attitude.nbytes + vis.valid_mask.nbytes
+            start = time.perf_counter()
+            gesture = vis.gesture_data
+            t_gesture = time.perf_counter() - start
+            if reference is None:
+                reference = gesture
+            print("%10d %10s %16.1f %16.1f %12.1f %14.4f %14.3e" %
+                  (n, np.dtype(dtype).name, stored / n, FORMER_BYTES, FORMER_BYTES * n / stored, t_gesture,
+                   np.abs(gesture - reference).max()))
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6)
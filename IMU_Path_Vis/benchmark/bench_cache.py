@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 13:40
+IDE: PyCharm
+Introduction: cold (parse and compute) against warm (memory-mapped from ArrayCache) Vis load timings.
+              python -m IMU_Path_Vis.benchmark.bench_cache [max_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from IMU_Path_Vis import IMU_Vis
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+from IMU_Path_Vis.cache import ArrayCache
+
+
+def load(pos_file, eul_file, cache, num=10):
+    start = time.perf_counter()
+    vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file, cache=cache)
+    vis.gen_gesture_on_path(num)
+    data = vis.get_path_gesture_data()
+    return time.perf_counter() - start, data
+
+
+def main(max_rows=10 ** 6):
+    print("%10s %12s %12s %10s %14s" % ("rows", "cold (s)", "warm (s)", "speedup", "cache (MB)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ArrayCache(os.path.join(tmp_dir, "cache"))
+        n = 10 ** 3
+        while n <= max_rows:
+            pos_file, eul_file = write_pair(tmp_dir, n)
+            cache.invalidate()
+            t_cold, cold = load(pos_file, eul_file, cache)
+            t_warm, warm = load(pos_file, eul_file, cache)
+            assert np.array_equal(cold, warm)
+            print("%10d %12.4f %12.4f %10.1f %14.1f" % (n, t_cold, t_warm, t_cold / t_warm, cache.size() / 1e6))
+            n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 11:05
+IDE: PyCharm
+Introduction: parse rate and peak memory of the chunked CSV reader against the former np.genfromtxt(dtype=str) load,
+              each measurement runs in a fresh process so its peak RSS is not polluted by the others.
+              python -m IMU_Path_Vis.benchmark.bench_csv_stream [max_rows]
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import numpy as np
+from IMU_Path_Vis.csv_reader import ChunkedCsvReader
+from IMU_Path_Vis.benchmark.synthetic import write_euler_csv
+
+
+def run_genfromtxt(file_name):
+    data_header = np.genfromtxt(open(file_name, "r"), delimiter=',', dtype=str)
+    return len(data_header[1:, :].astype(np.float64))
+
+
+def run_chunked(file_name):
+    rows = 0
+    for block in ChunkedCsvReader(file_name):
+        rows += len(block)
+    return rows
+
+
+def run_read_all(file_name):
+    return len(ChunkedCsvReader(file_name).read_all())
+
+
+def measure(mode, file_name, queue):
+    # the imports are done at this point, so ru_maxrss only grows with the parse
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    rows = MODES[mode](file_name)
+    elapsed = time.perf_counter() - start
+    queue.put((rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base))
+
+
+MODES = {"genfromtxt": run_genfromtxt, "chunked": run_chunked, "read_all": run_read_all}
+# np.genfromtxt(dtype=str) is only timed up to this size, it is far too slow and memory hungry beyond
+GENFROMTXT_MAX_ROWS = 10 ** 6
+
+
+def main(max_rows=10 ** 7):
+    ctx = multiprocessing.get_context("spawn")
+    print("%10s %10s %12s %12s %16s" % ("rows", "mode", "MB/s", "seconds", "peak RSS (MB)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        n = 10 ** 4
+        while n <= max_rows:
+            file_name = os.path.join(tmp_dir, "att_euler-%d.csv" % n)
+            write_euler_csv(file_name, n)
+            size = os.path.getsize(file_name)
+            for mode in MODES:
+                if mode == "genfromtxt" and n > GENFROMTXT_MAX_ROWS:
+                    continue
+                queue = ctx.Queue()
+                p = ctx.Process(target=measure, args=(mode, file_name, queue))
+                p.start()
+                rows, elapsed, peak_kb = queue.get()
+                p.join()
+                assert rows == n
+                print("%10d %10s %12.1f %12.3f %16.1f" % (n, mode, size / elapsed / 1e6, elapsed, peak_kb / 1024.0))
+            os.remove(file_name)
+            n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7)
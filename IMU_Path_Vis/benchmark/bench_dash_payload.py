@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 18:00
+IDE: PyCharm
+Introduction: bytes sent to the browser per playback / locate frame: the former full figure response, the former
+              server side extendData update of the three gesture traces, and the clientside playback which gets the
+              gesture buffer once (see dash_frames.gesture_buffer) and sends nothing per frame.
+              python -m IMU_Path_Vis.benchmark.bench_dash_payload [max_rows]
+"""
+
+import sys
+import numpy as np
+import plotly.graph_objects as go
+from IMU_Path_Vis.dash_frames import gesture_buffer, payload_bytes
+
+# indices of the x, y and z axis gesture traces in the path figure
+GESTURE_TRACES = [0, 1, 2]
+
+
+def full_figure_frame(path_data, n):
+    '''
+    the former plot_path_graph response, all traces of the figure including the full path trace
+    '''
+    data = [go.Scatter3d(
+        x=[path_data[n, 0], path_data[n, 3 * (j + 1)]],
+        y=[path_data[n, 1], path_data[n, 3 * (j + 1) + 1]],
+        z=[path_data[n, 2], path_data[n, 3 * (j + 1) + 2]],
+        hoverinfo="x+y+z+text", hovertext=["point ID:" + str(n) for _ in range(3)],
+        mode="markers+lines", marker=dict(size=5)) for j in range(3)]
+    data.append(go.Scatter3d(
+        x=path_data[:, 0], y=path_data[:, 1], z=path_data[:, 2],
+        mode='markers+lines', customdata=[i for i in range(len(path_data))], name="path",
+        hoverinfo="x+y+z+text", hovertext=["point ID:" + str(i) for i in range(len(path_data))],
+        marker={'size': 1, 'opacity': 0.8}))
+    return {"data": [trace.to_plotly_json() for trace in data]}
+
+
+def extend_data_frame(path_data, index):
+    '''
+    the former server side frame, the extendData of dcc.Graph which replaces the three gesture axis lines by the
+    gesture of a record, every trace keeps only the 2 new points, origin and axis end
+    '''
+    row = path_data[index]
+    update = {"x": [], "y": [], "z": [], "hovertext": []}
+    for j in range(3):
+        for k, axis in enumerate("xyz"):
+            update[axis].append([float(row[k]), float(row[3 * (j + 1) + k])])
+        update["hovertext"].append(["point ID:" + str(index)] * 2)
+    return [update, GESTURE_TRACES, 2]
+
+
+def main(max_rows=10 ** 6):
+    print("%10s %18s %18s %10s %18s" % ("rows", "full figure (B)", "extendData (B)", "ratio", "buffer once (B)"))
+    rng = np.random.default_rng(0)
+    n = 10 ** 3
+    while n <= max_rows:
+        path_data = np.array([-2.85e6, 4.66e6, 3.31e6] * 4) + rng.normal(0.0, 100.0, (n, 12))
+        before = payload_bytes(full_figure_frame(path_data, n // 2))
+        after = payload_bytes(extend_data_frame(path_data, n // 2))
+        buffer = payload_bytes(gesture_buffer(path_data))
+        print("%10d %18d %18d %10.0f %18d" % (n, before, after, before / after, buffer))
+        n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6)
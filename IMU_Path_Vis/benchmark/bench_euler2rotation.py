@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 10:20
+IDE: PyCharm
+Introduction: throughput of the batched euler->rotation matrix kernel against the original per-row path.
+              python -m IMU_Path_Vis.benchmark.bench_euler2rotation [max_rows]
+"""
+
+import math
+import sys
+import time
+import numpy as np
+from IMU_Path_Vis.attitude import euler2rotation_batch
+from IMU_Path_Vis.benchmark.synthetic import best_of
+
+# the per-row path is only timed up to this size, it is far too slow beyond
+LOOP_MAX_ROWS = 100000
+
+
+def euler_angles_to_rotation_matrix(angles):
+    '''
+    the original per-row Vis.__eulerAnglesToRotationMatrix, kept as the reference
+    '''
+    theta = np.zeros((3, 1), dtype=np.float64)
+    theta[0] = angles[0] * 3.141592653589793 / 180.0
+    theta[1] = angles[1] * 3.141592653589793 / 180.0
+    theta[2] = angles[2] * 3.141592653589793 / 180.0
+    R_x = np.array([[1, 0, 0],
+                    [0, math.cos(theta[0, 0]), -math.sin(theta[0, 0])],
+                    [0, math.sin(theta[0, 0]), math.cos(theta[0, 0])]
+                    ])
+    R_y = np.array([[math.cos(theta[1, 0]), 0, math.sin(theta[1, 0])],
+                    [0, 1, 0],
+                    [-math.sin(theta[1, 0]), 0, math.cos(theta[1, 0])]
+                    ])
+    R_z = np.array([[math.cos(theta[2, 0]), -math.sin(theta[2, 0]), 0],
+                    [math.sin(theta[2, 0]), math.cos(theta[2, 0]), 0],
+                    [0, 0, 1]
+                    ])
+    return np.dot(R_z, np.dot(R_y, R_x))
+
+
+def euler_to_gesture_loop(euler_data):
+    '''
+    the original per-row Vis.__euler_to_gesture, kept as the reference
+    '''
+    Vector = np.array([
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 0, 1]
+    ])
+    unit_vector_coord = np.zeros((euler_data.shape[0], 9))
+    for i in range(euler_data.shape[0]):
+        unit_vector_coord[i, 0:3] = euler_angles_to_rotation_matrix(euler_data[i, :]).dot(Vector)[:, 0]
+        unit_vector_coord[i, 3:6] = euler_angles_to_rotation_matrix(euler_data[i, :]).dot(Vector)[:, 1]
+        unit_vector_coord[i, 6:9] = euler_angles_to_rotation_matrix(euler_data[i, :]).dot(Vector)[:, 2]
+    return unit_vector_coord
+
+
+def euler_to_gesture_batch(euler_data):
+    unit_vector_coord = np.zeros((euler_data.shape[0], 9))
+    euler2rotation_batch(euler_data, out=unit_vector_coord.reshape(-1, 3, 3).transpose(0, 2, 1))
+    return unit_vector_coord
+
+
+def main(max_rows=10 ** 7):
+    print("%10s %18s %18s %14s" % ("rows", "loop (samples/s)", "batch (samples/s)", "max abs diff"))
+    rng = np.random.default_rng(0)
+    n = 10 ** 3
+    while n <= max_rows:
+        euler_data = rng.uniform(-180.0, 180.0, (n, 3))
+        t_batch = best_of(lambda: euler_to_gesture_batch(euler_data), 5 if n <= 10 ** 6 else 2)[0]
+        if n <= LOOP_MAX_ROWS:
+            start = time.perf_counter()
+            ref = euler_to_gesture_loop(euler_data)
+            t_loop = time.perf_counter() - start
+            loop_rate = "%18.3e" % (n / t_loop)
+            diff = "%14.3e" % np.abs(ref - euler_to_gesture_batch(euler_data)).max()
+        else:
+            loop_rate = "%18s" % "-"
+            diff = "%14s" % "-"
+        print("%10d %s %18.3e %s" % (n, loop_rate, n / t_batch, diff))
+        n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 09:30
+IDE: PyCharm
+Introduction: throughput of the vectorized LLA->ECEF conversion against the original per-row loop.
+              python -m IMU_Path_Vis.benchmark.bench_lla2ecef [max_rows]
+"""
+
+import math
+import sys
+import time
+import numpy as np
+from IMU_Path_Vis.benchmark.synthetic import best_of
+from IMU_Path_Vis.geo_transform import Re, E_SQR, D2R, lla2ecef_batch
+
+# the per-row loop is only timed up to this size, it is far too slow beyond
+LOOP_MAX_ROWS = 100000
+
+
+def lla2ecef_loop(lla):
+    '''
+    the former per-row conversion of class Vis, kept as the reference
+    '''
+    n = lla.shape[0]
+    ecef_xyz = np.zeros((n, 3))
+    for i in range(0, n):
+        sl = math.sin(lla[i, 0])
+        cl = math.cos(lla[i, 0])
+        sl_sqr = sl * sl
+        r = Re / math.sqrt(1.0 - E_SQR * sl_sqr)
+        rho = (r + lla[i, 2]) * cl
+        ecef_xyz[i, 0] = rho * math.cos(lla[i, 1])
+        ecef_xyz[i, 1] = rho * math.sin(lla[i, 1])
+        ecef_xyz[i, 2] = (r * (1.0 - E_SQR) + lla[i, 2]) * sl
+    return ecef_xyz
+
+
+def random_lla(n, seed=0):
+    '''
+    random LLA positions, [rad, rad, meter], nx3
+    '''
+    rng = np.random.default_rng(seed)
+    lla = np.empty((n, 3))
+    lla[:, 0] = rng.uniform(-90.0, 90.0, n) * D2R
+    lla[:, 1] = rng.uniform(-180.0, 180.0, n) * D2R
+    lla[:, 2] = rng.uniform(-100.0, 10000.0, n)
+    return lla
+
+
+def main(max_rows=10 ** 7):
+    print("%10s %18s %18s %20s %10s" % ("rows", "loop (samples/s)", "f64 (samples/s)", "f32 out= (samples/s)",
+                                        "bit-exact"))
+    n = 10 ** 4
+    while n <= max_rows:
+        lla = random_lla(n)
+        repeat = 5 if n <= 10 ** 6 else 2
+        t_f64 = best_of(lambda: lla2ecef_batch(lla), repeat)[0]
+        out32 = np.empty((n, 3), dtype=np.float32)
+        t_f32 = best_of(lambda: lla2ecef_batch(lla, out=out32), repeat)[0]
+        if n <= LOOP_MAX_ROWS:
+            start = time.perf_counter()
+            ref = lla2ecef_loop(lla)
+            t_loop = time.perf_counter() - start
+            loop_rate = "%18.3e" % (n / t_loop)
+            exact = str(np.array_equal(ref, lla2ecef_batch(lla)))
+        else:
+            loop_rate = "%18s" % "-"
+            exact = "-"
+        print("%10d %s %18.3e %20.3e %10s" % (n, loop_rate, n / t_f64, n / t_f32, exact))
+        n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 02:20
+IDE: PyCharm
+Introduction: render time and size of the overview tiles (see overview_tiles.py) of a synthetic path for both views,
+              plain and density shaded, at zoom 0, 2 and the deepest zoom (at most SAMPLE_TILES tiles of the path
+              each), the time of a TileCache memory and disk hit against a render, and the payload of the zoom 0
+              tile against the decimated Scatter3d path trace the Dash app sends for the default camera.
+              python -m IMU_Path_Vis.benchmark.bench_overview_tiles [rows]
+"""
+
+import sys
+import tempfile
+import time
+import numpy as np
+import plotly.graph_objects as go
+from IMU_Path_Vis.benchmark.synthetic import trajectory, ORIGIN_LLA
+from IMU_Path_Vis.dash_frames import json_coords, payload_bytes
+from IMU_Path_Vis.decimation import PathLOD
+from IMU_Path_Vis.geo_transform import D2R, Re
+from IMU_Path_Vis.overview_tiles import OverviewTiles, TileCache, TILE_MAX_ZOOM, VIEWS
+
+SAMPLE_TILES = 16
+REPEAT = 20
+
+
+def enu_path(n):
+    '''
+    returns:
+        nx3 float32 east/north/up path of the synthetic trajectory around its start
+    '''
+    _, lla, _ = trajectory(n)
+    path = np.empty((n, 3), dtype=np.float32)
+    path[:, 0] = (lla[:, 1] - ORIGIN_LLA[1]) * D2R * Re * np.cos(ORIGIN_LLA[0] * D2R)
+    path[:, 1] = (lla[:, 0] - ORIGIN_LLA[0]) * D2R * Re
+    path[:, 2] = lla[:, 2] - ORIGIN_LLA[2]
+    return path
+
+
+def per_call(func, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(n=10 ** 6):
+    path = enu_path(n)
+    overview = OverviewTiles(path)
+    print("%d samples" % n)
+    print("%6s %8s %6s %8s %12s %12s" % ("view", "density", "zoom", "tiles", "ms / tile", "KB / tile"))
+    for view in sorted(VIEWS):
+        for density in (False, True):
+            for z in (0, 2, TILE_MAX_ZOOM):
+                tiles = overview.tiles(view, z)
+                sample = tiles[::max(1, len(tiles) // SAMPLE_TILES)][:SAMPLE_TILES]
+                start = time.perf_counter()
+                size = sum(len(overview.render(view, z, tx, ty, density)) for tx, ty in sample)
+                seconds = time.perf_counter() - start
+                print("%6s %8s %6d %8d %12.2f %12.2f" % (view, density, z, len(tiles), 1e3 * seconds / len(sample),
+                                                         size / 1024.0 / len(sample)))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = TileCache(tmp_dir)
+        start = time.perf_counter()
+        cache.get("bench", overview, "top", 0, 0, 0)
+        render = time.perf_counter() - start
+        memory_hit = per_call(lambda: cache.get("bench", overview, "top", 0, 0, 0))
+        disk_hit = per_call(lambda: TileCache(tmp_dir).get("bench", overview, "top", 0, 0, 0))
+    print("%-12s %12s" % ("top z 0", "ms"))
+    print("%-12s %12.3f\n%-12s %12.3f\n%-12s %12.3f" % ("render", 1e3 * render, "memory hit", 1e3 * memory_hit,
+                                                        "disk hit", 1e3 * disk_hit))
+    indices = PathLOD(path).levels[PathLOD(path).level_for_camera(None)]
+    trace = go.Scatter3d(x=json_coords(path[indices, 0]), y=json_coords(path[indices, 1]),
+                         z=json_coords(path[indices, 2]), customdata=indices, mode="markers+lines")
+    print("payload: top z 0 tile %.1f KB, Scatter3d of %d decimated points %.1f KB" %
+          (len(overview.render("top", 0, 0, 0)) / 1024.0, len(indices), payload_bytes(trace) / 1024.0))
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 00:10
+IDE: PyCharm
+Introduction: scaling of the chunked multi-core conversions of class Vis (see parallel.py) from 1 to N threads: LLA to
+              ECEF, euler to quaternion, quaternion to rotation, gesture offset and the gesture_data of a Vis, with
+              the speedup against one thread and a check that every result is identical to the serial one.
+              python -m IMU_Path_Vis.benchmark.bench_parallel [rows] [max workers]
+"""
+
+import sys
+import tempfile
+import numpy as np
+from IMU_Path_Vis import IMU_Vis
+from IMU_Path_Vis.attitude import euler2quat_batch, quat2rotation_batch
+from IMU_Path_Vis.benchmark.synthetic import trajectory, write_pair, best_of
+from IMU_Path_Vis.geo_transform import D2R, lla2ecef_batch
+from IMU_Path_Vis.parallel import ChunkExecutor, cpu_count
+
+REPEAT = 3
+NUM = 10
+
+
+def kernels(executor, lla, euler):
+    '''
+    returns:
+        list of (stage name, function returning the result array) on the executor
+    '''
+    n = len(lla)
+    attitude = euler2quat_batch(euler)
+    unit_vectors = np.empty((n, 9))
+    quat2rotation_batch(attitude, out=unit_vectors.reshape(-1, 3, 3).transpose(0, 2, 1))
+    path = lla2ecef_batch(lla)
+
+    def rotations():
+        out = np.empty((n, 9))
+        executor.map_rows(quat2rotation_batch, [attitude], out.reshape(-1, 3, 3).transpose(0, 2, 1))
+        return out
+    return [("lla2ecef", lambda: executor.map_rows(lla2ecef_batch, [lla], np.empty((n, 3)))),
+            ("euler2quat", lambda: executor.map_rows(euler2quat_batch, [euler], np.empty((n, 4)))),
+            ("quat2rotation", rotations),
+            ("gesture_offset", lambda: executor.map_rows(IMU_Vis.Vis._Vis__offset_axes, [path, unit_vectors],
+                                                         np.empty((n, 9)), num=NUM))]
+
+
+def vis_gesture(pos_file, eul_file, workers):
+    '''
+    returns:
+        function returning the gesture_data of a new Vis on workers threads, the files are parsed beforehand
+    '''
+    vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file, workers=workers)
+    vis.gen_gesture_on_path(NUM)
+    vis.path_data, vis.euler_data
+
+    def gesture():
+        # the attitude stage is memoized, drop it so it is converted again
+        vis._Vis__stages.pop("attitude", None)
+        vis.attitude
+        return vis.gesture_data
+    return gesture
+
+
+def main(n=10 ** 6, max_workers=None):
+    max_workers = max_workers or cpu_count()
+    worker_counts = sorted({1, max_workers} | {w for w in (2, 4, 8, 16, 32, 64) if w < max_workers})
+    _, lla, euler = trajectory(n)
+    lla[:, 0:2] *= D2R
+    print("%d rows, %d cores" % (n, cpu_count()))
+    print("%16s %8s %12s %10s %10s" % ("stage", "workers", "seconds", "speedup", "identical"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pos_file, eul_file = write_pair(tmp_dir, n)
+        serial = {}
+        for workers in worker_counts:
+            executor = ChunkExecutor(workers)
+            stages = kernels(executor, lla, euler) + [("Vis.gesture_data",
+                                                       vis_gesture(pos_file, eul_file, workers))]
+            for name, func in stages:
+                seconds, result = best_of(func, REPEAT)
+                if workers == 1:
+                    serial[name] = (seconds, result)
+                print("%16s %8d %12.4f %10.2f %10s" % (name, workers, seconds, serial[name][0] / seconds,
+                                                       np.array_equal(result, serial[name][1])))
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         int(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 23:40
+IDE: PyCharm
+Introduction: benchmark suite of the class Vis conversion and export pipeline. Every stage is timed on its own on a
+              synthetic log (see synthetic.py) of 1e3 up to 1e7 records: the CSV load, __gps_to_ecef,
+              __euler_to_gesture, __gesture_for_path, get_path_gesture_data, __gen_path_vtp and __gen_gesture_vtp.
+              Each size runs in a fresh process, so the peak RSS belongs to that run. tracemalloc slows down every
+              allocation, so the allocations are traced in a second run of every size and the timings of the first
+              run stay clean. Throughput, peak RSS and the traced allocations go to a JSON file,
+              --compare prints the speedup against the JSON of another commit.
+              python -m IMU_Path_Vis.benchmark.bench_pipeline [--min-rows 1e3] [--max-rows 1e6] [--out file.json]
+                                                              [--compare base.json] [--no-alloc]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from IMU_Path_Vis import IMU_Vis
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+
+try:
+    import resource
+except ImportError:
+    # not on Windows, the peak RSS is not recorded there
+    resource = None
+
+# the time series gesture VTP writer spends ~0.25 ms per record, larger logs only write this many records
+GESTURE_VTP_MAX_ROWS = 10 ** 5
+NUM = 10
+
+
+def peak_rss_mb():
+    '''
+    returns:
+        the peak resident set size of this process in MB, None if it is not available
+    '''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak / 1024.0 ** 2 if sys.platform == "darwin" else peak / 1024.0
+
+
+def reset_traced_peak():
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        # before Python 3.9 clearing the traces resets the peak as well
+        tracemalloc.clear_traces()
+
+
+def measure(results, stage, func, rows, nbytes=None):
+    '''
+    run func once and append its timing and memory record to results, with the traced allocations if tracemalloc
+    is tracing
+    Args:
+        results: list of the stage records of this run
+        stage: the stage name
+        func: the stage, called without arguments
+        rows: the number of records the stage processes, for the throughput
+        nbytes: optional bytes the stage reads or writes
+    returns:
+        the result of func
+    '''
+    trace = tracemalloc.is_tracing()
+    if trace:
+        reset_traced_peak()
+        before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    seconds = time.perf_counter() - start
+    record = {"rows": rows, "stage": stage, "seconds": seconds, "rows_per_s": rows / seconds if seconds else None,
+              "peak_rss_mb": peak_rss_mb()}
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        record["peak_alloc_mb"] = (peak - before) / 1024.0 ** 2
+        record["retained_mb"] = (current - before) / 1024.0 ** 2
+    if nbytes is not None:
+        record["mb_per_s"] = nbytes / 1024.0 ** 2 / seconds if seconds else None
+    results.append(record)
+    return result
+
+
+def run_size(n, work_dir, gesture_max=GESTURE_VTP_MAX_ROWS, trace=False):
+    '''
+    benchmark every stage on a synthetic log of n records, run in a fresh process
+    Args:
+        n: number of records
+        work_dir: directory of the inputs and the outputs
+        gesture_max: records written by __gen_gesture_vtp at most
+        trace: trace the allocations with tracemalloc, the stages run slower
+    returns:
+        list of the stage records
+    '''
+    pos_file = os.path.join(work_dir, "pos-%d.csv" % n)
+    eul_file = os.path.join(work_dir, "att_euler-%d.csv" % n)
+    if not os.path.exists(pos_file):
+        write_pair(work_dir, n)
+    # the VTP export imports vtk on first use, which is not part of the stage
+    from IMU_Path_Vis import vtp_writer
+    input_bytes = os.path.getsize(pos_file) + os.path.getsize(eul_file)
+    results = []
+    if trace:
+        tracemalloc.start()
+    try:
+        def load():
+            vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file)
+            # __init__ only reads the headers, the stages parse the files on first access
+            vis.pos_data, vis.euler_data
+            return vis
+        vis = measure(results, "csv_load", load, n, input_bytes)
+        measure(results, "__gps_to_ecef", lambda: vis.path_data, n)
+        measure(results, "__euler_to_gesture", lambda: vis.attitude, n)
+        vis.gen_gesture_on_path(NUM)
+        measure(results, "__gesture_for_path", lambda: vis._Vis__gesture_for_path(), n)
+        measure(results, "get_path_gesture_data", vis.get_path_gesture_data, n)
+        valid_mask = vis.valid_mask
+        path_vtp = os.path.join(work_dir, "path.vtp")
+        measure(results, "__gen_path_vtp", lambda: vis._Vis__gen_path_vtp(vis.path_data[valid_mask], path_vtp),
+                int(np.count_nonzero(valid_mask)))
+        results[-1]["mb_per_s"] = os.path.getsize(path_vtp) / 1024.0 ** 2 / results[-1]["seconds"]
+        gesture = vis._Vis__gesture_for_path(valid_mask)[:gesture_max]
+        gesture_vtp = os.path.join(work_dir, "gesture.vtp")
+        measure(results, "__gen_gesture_vtp", lambda: vis._Vis__gen_gesture_vtp(gesture, gesture_vtp), len(gesture))
+        results[-1]["mb_per_s"] = os.path.getsize(gesture_vtp) / 1024.0 ** 2 / results[-1]["seconds"]
+    finally:
+        if trace:
+            tracemalloc.stop()
+    for record in results:
+        record["log_rows"] = n
+    return results
+
+
+def metadata():
+    '''
+    returns:
+        the commit and environment of the run
+    '''
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=root,
+                                         stderr=subprocess.DEVNULL).decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "date": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform(), "cpu_count": os.cpu_count()}
+
+
+def compare(base, results):
+    '''
+    print the speedup of every stage against the results of another run
+    '''
+    base_seconds = {(r["log_rows"], r["stage"]): r["seconds"] for r in base["results"]}
+    print("compared with %s" % (base["meta"].get("commit"),))
+    print("%10s %24s %12s %12s %10s" % ("rows", "stage", "base (s)", "now (s)", "speedup"))
+    for record in results:
+        key = (record["log_rows"], record["stage"])
+        if key in base_seconds:
+            print("%10d %24s %12.4f %12.4f %10.2f" % (key[0], key[1], base_seconds[key], record["seconds"],
+                                                     base_seconds[key] / record["seconds"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="time every stage of the Vis pipeline on synthetic logs")
+    parser.add_argument("--min-rows", type=float, default=1e3)
+    parser.add_argument("--max-rows", type=float, default=1e6, help="up to 1e7, the inputs take ~1.5 GB of disk")
+    parser.add_argument("--gesture-max", type=float, default=GESTURE_VTP_MAX_ROWS,
+                        help="records written by __gen_gesture_vtp at most")
+    parser.add_argument("--out", default="bench_pipeline.json", help="the JSON file of the results")
+    parser.add_argument("--compare", help="the JSON file of an earlier run")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the traced run of the allocations")
+    args = parser.parse_args(argv)
+    report = {"meta": metadata(), "results": []}
+    print("%10s %24s %10s %12s %12s %14s %12s" % ("rows", "stage", "seconds", "rows/s", "MB/s", "peak RSS (MB)",
+                                                 "alloc (MB)"))
+    n = int(args.min_rows)
+    while n <= int(args.max_rows):
+        with tempfile.TemporaryDirectory() as work_dir:
+            # a fresh process per size, the peak RSS of a smaller run does not hide the one of a larger run
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = executor.submit(run_size, n, work_dir, int(args.gesture_max)).result()
+            if not args.no_alloc:
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    traced = executor.submit(run_size, n, work_dir, int(args.gesture_max), True).result()
+                for r, t in zip(results, traced):
+                    r["peak_alloc_mb"], r["retained_mb"] = t["peak_alloc_mb"], t["retained_mb"]
+        for r in results:
+            print("%10d %24s %10.4f %12.3e %12s %14s %12s" %
+                  (r["rows"], r["stage"], r["seconds"], r["rows_per_s"] or 0.0,
+                   "%.1f" % r["mb_per_s"] if r.get("mb_per_s") else "-",
+                   "%.1f" % r["peak_rss_mb"] if r["peak_rss_mb"] is not None else "-",
+                   "%.1f" % r["peak_alloc_mb"] if "peak_alloc_mb" in r else "-"))
+        report["results"].extend(results)
+        n *= 10
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1)
+    print("results written to %s" % args.out)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(json.load(f), report["results"])
+
+
+if __name__ == "__main__":
+    main()
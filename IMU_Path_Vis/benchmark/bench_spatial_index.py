@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 21:00
+IDE: PyCharm
+Introduction: build time and per-query latency of the PathIndex nearest, radius and bounding box queries against a
+              brute force scan of all path points.
+              python -m IMU_Path_Vis.benchmark.bench_spatial_index [max_rows] [queries]
+"""
+
+import sys
+import time
+import numpy as np
+from IMU_Path_Vis.spatial_index import PathIndex
+
+
+def make_path(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(0.0, 0.3, (n, 3)), axis=0) + [-2721620.0, 4713984.0, 3313292.0]
+
+
+def per_query(func, queries):
+    start = time.perf_counter()
+    results = [func(q) for q in queries]
+    return (time.perf_counter() - start) / len(queries) * 1e3, results
+
+
+def main(max_rows=10 ** 6, n_queries=200):
+    print("%10s %10s %12s %12s %12s %12s %12s" % ("rows", "build (s)", "nearest (ms)", "radius (ms)", "bbox (ms)",
+                                                   "brute (ms)", "mismatches"))
+    rng = np.random.default_rng(1)
+    n = 10 ** 4
+    while n <= max_rows:
+        path = make_path(n)
+        start = time.perf_counter()
+        index = PathIndex(path)
+        t_build = time.perf_counter() - start
+        queries = path[rng.integers(0, n, n_queries)] + rng.normal(0.0, 2.0, (n_queries, 3))
+        t_nearest, nearest = per_query(index.nearest, queries)
+        t_radius, _ = per_query(lambda q: index.radius(q, 5.0), queries)
+        t_bbox, _ = per_query(lambda q: index.bbox(q - 10.0, q + 10.0), queries)
+        t_brute, brute = per_query(lambda q: int(np.argmin(np.linalg.norm(path - q, axis=1))), queries)
+        mismatches = sum(found != expected for (found, _), expected in zip(nearest, brute))
+        print("%10d %10.3f %12.4f %12.4f %12.4f %12.4f %12d" %
+              (n, t_build, t_nearest, t_radius, t_bbox, t_brute, mismatches))
+        n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         int(float(sys.argv[2])) if len(sys.argv) > 2 else 200)
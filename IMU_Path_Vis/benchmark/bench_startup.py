@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 23:20
+IDE: PyCharm
+Introduction: startup time of the Dash app plotly_dash_gesture_on_path.py. The app is started in a sub process on a
+              synthetic log and polled over HTTP: the seconds from the start of the process to the end of the module
+              import, to the first response of the layout and to the gesture buffer of the default dataset, with a
+              cold and a warm ArrayCache.
+              python -m IMU_Path_Vis.benchmark.bench_startup [rows] [port]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.request import Request, urlopen
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+
+# the input files of the app relative to its working directory
+APP_POS_FILE = os.path.join("input_file", "pos-algo0_0_hig.csv")
+APP_EUL_FILE = os.path.join("input_file", "att_euler-algo0_0.csv")
+APP_SCRIPT = '''
+import time
+start = time.perf_counter()
+from IMU_Path_Vis import plotly_dash_gesture_on_path as app
+print("import %%f" %% (time.perf_counter() - start), flush=True)
+app.server.run(port=%d)
+'''
+POLL_SECONDS = 0.01
+TIMEOUT_SECONDS = 600
+
+
+def request(url, body=None):
+    '''
+    returns:
+        the HTTP status and the response body, None if the server does not answer yet
+    '''
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    req = Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(req, timeout=TIMEOUT_SECONDS) as response:
+            return response.status, response.read()
+    except OSError:
+        return None, None
+
+
+def dataset_callback():
+    '''
+    the request body of the callback shipping the gesture buffer of the default dataset
+    '''
+    outputs = ["gesture-buffer.data", "tail-frame.data", "locate_nb.max", "input_range.max", "load-interval.disabled",
+               "load_status.children"]
+    return {"output": ".." + "...".join(outputs) + "..",
+            "outputs": [dict(zip(("id", "property"), o.split("."))) for o in outputs],
+            "inputs": [{"id": "dataset", "property": "value", "value": "algo0_0_hig"},
+                       {"id": "tail-interval", "property": "n_intervals", "value": 0},
+                       {"id": "load-interval", "property": "n_intervals", "value": 0}],
+            "state": [{"id": "tail-frame", "property": "data", "value": None}],
+            "changedPropIds": ["load-interval.n_intervals"]}
+
+
+def start_app(app_dir, port):
+    '''
+    returns:
+        seconds to the end of the import, the first layout response and the gesture buffer, from the process start
+    '''
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env["PYTHONPATH"] = os.pathsep.join([root] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", APP_SCRIPT % port], cwd=app_dir, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    try:
+        t_import = float(process.stdout.readline().split()[1]) if process.stdout else float("nan")
+        url = "http://127.0.0.1:%d" % port
+        t_layout = t_data = None
+        while time.perf_counter() - start < TIMEOUT_SECONDS and process.poll() is None:
+            if t_layout is None:
+                status, _ = request(url + "/_dash-layout")
+                if status == 200:
+                    t_layout = time.perf_counter() - start
+            else:
+                status, body = request(url + "/_dash-update-component", dataset_callback())
+                if status == 200 and "gesture-buffer" in json.loads(body.decode("utf-8"))["response"]:
+                    t_data = time.perf_counter() - start
+                    break
+            time.sleep(POLL_SECONDS)
+        return t_import, t_layout, t_data
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(n=10 ** 6, port=8059):
+    print("%10s %8s %12s %16s %14s" % ("rows", "cache", "import (s)", "first resp. (s)", "data (s)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pos_file, eul_file = write_pair(tmp_dir, n)
+        os.makedirs(os.path.join(tmp_dir, "input_file"), exist_ok=True)
+        shutil.move(pos_file, os.path.join(tmp_dir, APP_POS_FILE))
+        shutil.move(eul_file, os.path.join(tmp_dir, APP_EUL_FILE))
+        for label in ("cold", "warm"):
+            t_import, t_layout, t_data = start_app(tmp_dir, port)
+            print("%10d %8s %12.3f %16.3f %14.3f" % (n, label, t_import, t_layout or float("nan"),
+                                                     t_data or float("nan")))
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8059)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 01:40
+IDE: PyCharm
+Introduction: wall time of the streaming export (see stream_pipeline.py) with the stages run one after another
+              against the overlapped pipeline, for plain, .csv.gz and .csv.zst inputs. Each run writes the path and
+              gesture VTP pieces and the .npy table. The busy time of every stage is printed with their sum, the
+              serial bound, and their maximum, the bound of a perfect overlap; the overlapped wall time should
+              approach the maximum as far as the cores allow. With fewer cores than stages the stages share the
+              cores, their wall clock busy times grow and only the CPU seconds (second line) still add up to the
+              work. .csv.zst is skipped without zstandard.
+              python -m IMU_Path_Vis.benchmark.bench_stream [rows] [chunk rows] [queue blocks]
+"""
+
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+from IMU_Path_Vis.csv_reader import CHUNK_ROWS
+from IMU_Path_Vis.parallel import cpu_count
+from IMU_Path_Vis.stream_pipeline import QUEUE_BLOCKS, STAGES, stream_export
+
+
+def compress(file_name, extension):
+    '''
+    returns:
+        the compressed copy of file_name, None if its library is not installed
+    '''
+    if extension == ".gz":
+        with open(file_name, "rb") as src, gzip.open(file_name + extension, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst)
+    else:
+        try:
+            import zstandard
+        except ImportError:
+            return None
+        with open(file_name, "rb") as src, open(file_name + extension, "wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+    return file_name + extension
+
+
+def main(n=10 ** 6, chunk_rows=CHUNK_ROWS, queue_blocks=QUEUE_BLOCKS):
+    print("%d records, %d records per block, %d blocks per queue, %d cores" % (n, chunk_rows, queue_blocks,
+                                                                               cpu_count()))
+    print("%10s %10s" % ("input", "mode") + "".join("%12s" % stage for stage in STAGES) +
+          "%10s %10s %10s %12s" % ("sum", "max", "wall", "wall / max"))
+    print("%21s busy wall clock seconds of the stages on the first line, CPU seconds on the second" % "")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pos_file, eul_file = write_pair(tmp_dir, n)
+        out_dir = os.path.join(tmp_dir, "out")
+        for extension in ("", ".gz", ".zst"):
+            inputs = (pos_file, eul_file) if not extension else (compress(pos_file, extension),
+                                                                 compress(eul_file, extension))
+            label = extension or ".csv"
+            if inputs[0] is None:
+                print("%10s skipped, pip install zstandard" % label)
+                continue
+            for overlap in (False, True):
+                os.makedirs(out_dir)
+                timing = stream_export(inputs[0], inputs[1], os.path.join(out_dir, "path.pvtp"),
+                                       os.path.join(out_dir, "gesture.pvd"), os.path.join(out_dir, "table.npy"),
+                                       chunk_rows=chunk_rows, queue_blocks=queue_blocks, overlap=overlap)
+                for i, suffix in enumerate(("", "_cpu")):
+                    busy = [timing[stage + suffix] for stage in STAGES]
+                    print("%10s %10s" % ((label, "overlapped" if overlap else "serial") if i == 0 else ("", "")) +
+                          "".join("%12.3f" % seconds for seconds in busy) +
+                          "%10.3f %10.3f %10.3f %12.2f" % (sum(busy), max(busy), timing["wall"],
+                                                           timing["wall"] / max(busy)))
+                shutil.rmtree(out_dir)
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         int(float(sys.argv[2])) if len(sys.argv) > 2 else CHUNK_ROWS,
+         int(sys.argv[3]) if len(sys.argv) > 3 else QUEUE_BLOCKS)
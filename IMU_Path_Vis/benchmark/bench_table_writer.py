@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 00:30
+IDE: PyCharm
+Introduction: write throughput of the table side output (see table_writer.py) against the former np.savetxt dump of
+              the ECEF path. MB/s is measured on the bytes of the array in memory, so formats with compression compare
+              fairly; the formats whose library is not installed are skipped.
+              python -m IMU_Path_Vis.benchmark.bench_table_writer [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from IMU_Path_Vis.table_writer import PATH_COLUMNS, GESTURE_ON_PATH_COLUMNS, write_table
+
+# (label, file extension, table, options)
+CASES = [("savetxt path", ".csv", "path", {}),
+         ("npy", ".npy", "gesture_on_path", {}),
+         ("parquet snappy", ".parquet", "gesture_on_path", {}),
+         ("parquet zstd", ".parquet", "gesture_on_path", {"compression": "zstd"}),
+         ("arrow", ".arrow", "gesture_on_path", {"compression": "uncompressed"}),
+         ("arrow lz4", ".arrow", "gesture_on_path", {"compression": "lz4"}),
+         ("hdf5", ".h5", "gesture_on_path", {"compression": "none"}),
+         ("hdf5 gzip 1", ".h5", "gesture_on_path", {"compression": "gzip", "compression_level": 1}),
+         ("hdf5 lzf", ".h5", "gesture_on_path", {"compression": "lzf"})]
+
+
+def gesture_on_path(n):
+    '''
+    returns:
+        a nx21 gesture on path like table, ECEF positions and unit vectors
+    '''
+    rng = np.random.default_rng(0)
+    data = np.empty((n, 21))
+    data[:, 0:3] = [-2.8e6, 4.7e6, 3.3e6] + np.cumsum(rng.normal(0.0, 0.1, (n, 3)), axis=0)
+    data[:, 3:12] = rng.uniform(-1.0, 1.0, (n, 9))
+    data[:, 12:21] = 10.0 * data[:, 3:12] + np.tile(data[:, 0:3], 3)
+    return data
+
+
+def main(n=10 ** 6):
+    data = gesture_on_path(n)
+    tables = {"path": (data[:, 0:3].copy(), PATH_COLUMNS), "gesture_on_path": (data, GESTURE_ON_PATH_COLUMNS)}
+    print("%10s %16s %8s %10s %12s %10s %12s" % ("rows", "format", "columns", "seconds", "file (MB)", "MB/s",
+                                                "vs savetxt"))
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, extension, table, options in CASES:
+            values, columns = tables[table]
+            file_name = os.path.join(tmp_dir, "table" + extension)
+            start = time.perf_counter()
+            try:
+                size = write_table(values, file_name, columns, **options)
+            except ImportError as e:
+                print("%10d %16s skipped, %s" % (n, label, e))
+                continue
+            seconds = time.perf_counter() - start
+            rate = values.nbytes / 1024.0 ** 2 / seconds
+            if reference is None:
+                reference = rate
+            print("%10d %16s %8d %10.4f %12.2f %10.1f %12.1f" % (n, label, len(columns), seconds,
+                                                                size / 1024.0 ** 2, rate, rate / reference))
+            os.remove(file_name)
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 19:10
+IDE: PyCharm
+Introduction: cost of a VisTail update against the length of the followed log. The same number of rows is appended
+              to logs of growing length, the update time should stay flat while a full Vis reload grows.
+              python -m IMU_Path_Vis.benchmark.bench_tail [max_rows] [append_rows]
+"""
+
+import sys
+import tempfile
+import time
+import numpy as np
+from IMU_Path_Vis.vis_tail import VisTail
+from IMU_Path_Vis.benchmark.bench_cache import load
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+
+
+def append_rows(pos_file, eul_file, pos_rows, euler_rows):
+    with open(pos_file, "ab") as f:
+        np.savetxt(f, pos_rows, delimiter=',')
+    with open(eul_file, "ab") as f:
+        np.savetxt(f, euler_rows, delimiter=',')
+
+
+def main(max_rows=10 ** 6, rows=1000):
+    print("%10s %10s %14s %14s %12s" % ("log rows", "appended", "update (ms)", "reload (ms)", "records"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        n = 10 ** 4
+        while n <= max_rows:
+            pos_file, eul_file = write_pair(tmp_dir, n + rows)
+            pos = np.loadtxt(pos_file, delimiter=',', skiprows=1)
+            euler = np.loadtxt(eul_file, delimiter=',', skiprows=1)
+            # the log as the logger left it before the last rows
+            np.savetxt(pos_file, pos[:n], delimiter=',', header="pos_lat (deg),pos_lon (deg),pos_alt (m)",
+                       comments='')
+            np.savetxt(eul_file, euler[:n], delimiter=',', header="Yaw (deg),Pitch (deg),Roll (deg)",
+                       comments='')
+            tail = VisTail(pos_file, eul_file, 10)
+            tail.update()
+            append_rows(pos_file, eul_file, pos[n:], euler[n:])
+            start = time.perf_counter()
+            new = tail.update()
+            t_update = time.perf_counter() - start
+            t_reload, full = load(pos_file, eul_file, None)
+            assert len(new) == rows and np.allclose(tail.path_gesture_data, full, rtol=0, atol=1e-6)
+            print("%10d %10d %14.3f %14.3f %12d" % (n, rows, t_update * 1e3, t_reload * 1e3,
+                                                    len(tail.path_gesture_data)))
+            n *= 10
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         int(float(sys.argv[2])) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 15:20
+IDE: PyCharm
+Introduction: gesture VTP export throughput of the former per-step writer, the single-pass time series writer and
+              the single PolyData triads writer.
+              python -m IMU_Path_Vis.benchmark.bench_vtp_gesture [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import vtk
+from IMU_Path_Vis.vtp_writer import write_gesture_vtp, write_gesture_triads_vtp
+
+# the time series writers are only timed up to these sizes, vtkXMLPolyDataWriter spends ~0.25 ms per time step
+PER_STEP_MAX_ROWS = 10 ** 4
+TIME_SERIES_MAX_ROWS = 10 ** 5
+
+
+def write_gesture_vtp_per_step(path_gesture_data, vtk_path):
+    '''
+    the former Vis.__gen_gesture_vtp, kept as the reference
+    '''
+    number_of_steps = path_gesture_data.shape[0]
+    writer = vtk.vtkXMLPolyDataWriter()
+    data_to_write = vtk.vtkPolyData()
+    writer.SetNumberOfTimeSteps(number_of_steps)
+    writer.SetInputData(data_to_write)
+    writer.SetFileName(vtk_path)
+    writer.Start()
+    for i in range(number_of_steps):
+        linepoly = vtk.vtkPolyData()
+        each_ges_points = vtk.vtkPoints()
+        each_ges_points.SetNumberOfPoints(4)
+        each_ges_points.SetPoint(0, path_gesture_data[i, 0], path_gesture_data[i, 1], path_gesture_data[i, 2])
+        for j in range(1, 4):
+            each_ges_points.SetPoint(j, path_gesture_data[i, 3 * j], path_gesture_data[i, 3 * j + 1],
+                                     path_gesture_data[i, 3 * j + 2])
+        linepoly.SetPoints(each_ges_points)
+        lines = vtk.vtkCellArray()
+        for j in range(1, 4):
+            line = vtk.vtkLine()
+            line.GetPointIds().SetId(0, 0)
+            line.GetPointIds().SetId(1, j)
+            lines.InsertNextCell(line)
+        colors = vtk.vtkNamedColors()
+        Colors = vtk.vtkUnsignedCharArray()
+        Colors.SetNumberOfComponents(3)
+        Colors.SetName("Colors")
+        Colors.InsertNextTypedTuple(colors.GetColor3ub("red"))
+        Colors.InsertNextTypedTuple(colors.GetColor3ub("yellow"))
+        Colors.InsertNextTypedTuple(colors.GetColor3ub("green"))
+        linepoly.SetLines(lines)
+        linepoly.GetCellData().SetScalars(Colors)
+        data_to_write.ShallowCopy(linepoly)
+        writer.WriteNextTime(i)
+    writer.Stop()
+
+
+def random_gesture(n, seed=0):
+    rng = np.random.default_rng(seed)
+    gesture = np.empty((n, 12))
+    gesture[:, 0:3] = np.array([-2.85e6, 4.66e6, 3.31e6]) + np.cumsum(rng.normal(0.0, 0.1, (n, 3)), axis=0)
+    for j in range(1, 4):
+        gesture[:, 3 * j:3 * j + 3] = gesture[:, 0:3] + rng.normal(0.0, 10.0, (n, 3))
+    return gesture
+
+
+def main(sizes=(10 ** 4, 10 ** 5, 10 ** 6)):
+    print("%10s %16s %10s %14s %12s" % ("records", "writer", "seconds", "records/s", "size (MB)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vtk_path = os.path.join(tmp_dir, "gesture_data.vtp")
+        for n in sizes:
+            gesture = random_gesture(n)
+            cases = []
+            if n <= PER_STEP_MAX_ROWS:
+                cases.append(("per step", lambda: write_gesture_vtp_per_step(gesture, vtk_path)))
+            if n <= TIME_SERIES_MAX_ROWS:
+                cases += [("time series", lambda: write_gesture_vtp(gesture, vtk_path)),
+                          ("time series raw", lambda: write_gesture_vtp(gesture, vtk_path, compressor="none",
+                                                                         encode_appended=False))]
+            cases += [("triads", lambda: write_gesture_triads_vtp(gesture, vtk_path)),
+                      ("triads raw", lambda: write_gesture_triads_vtp(gesture, vtk_path, compressor="none",
+                                                                      encode_appended=False))]
+            for name, func in cases:
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                print("%10d %16s %10.3f %14.3e %12.2f" % (n, name, elapsed, n / elapsed,
+                                                          os.path.getsize(vtk_path) / 1e6))
+
+
+if __name__ == "__main__":
+    main([int(float(n)) for n in sys.argv[1:]] or (10 ** 4, 10 ** 5, 10 ** 6))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 14:30
+IDE: PyCharm
+Introduction: path VTP write time and file size of the former per-point writer against the bulk-array writer with
+              the different compressor / encoding choices.
+              python -m IMU_Path_Vis.benchmark.bench_vtp_path [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import vtk
+from IMU_Path_Vis.vtp_writer import write_path_vtp
+
+BULK_OPTIONS = [
+    ("bulk zlib", {}),
+    ("bulk zlib f64", {"points_dtype": np.float64}),
+    ("bulk lz4", {"compressor": "lz4"}),
+    ("bulk lzma", {"compressor": "lzma"}),
+    ("bulk raw", {"compressor": "none", "encode_appended": False}),
+    ("bulk raw f64", {"compressor": "none", "encode_appended": False, "points_dtype": np.float64}),
+    ("bulk lz4 raw", {"compressor": "lz4", "encode_appended": False}),
+]
+
+
+def write_path_vtp_per_point(path_gesture_data, vtk_path):
+    '''
+    the former Vis.__gen_path_vtp, kept as the reference
+    '''
+    number_of_steps = path_gesture_data.shape[0]
+    points = vtk.vtkPoints()
+    points.SetNumberOfPoints(number_of_steps)
+    vertices = vtk.vtkCellArray()
+    vertices.InsertNextCell(number_of_steps)
+    for i in range(number_of_steps):
+        points.SetPoint(i, path_gesture_data[i, 0], path_gesture_data[i, 1], path_gesture_data[i, 2])
+        vertices.InsertCellPoint(i)
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(points)
+    polydata.SetLines(vertices)
+    namedColors = vtk.vtkNamedColors()
+    colors = vtk.vtkUnsignedCharArray()
+    colors.SetNumberOfComponents(3)
+    colors.InsertNextTypedTuple(namedColors.GetColor3ub("white"))
+    polydata.GetCellData().SetScalars(colors)
+    writer = vtk.vtkXMLPolyDataWriter()
+    writer.SetFileName(vtk_path)
+    writer.SetInputData(polydata)
+    writer.Write()
+
+
+def random_path(n, seed=0):
+    rng = np.random.default_rng(seed)
+    path = np.empty((n, 3))
+    path[:, 0] = -2.85e6 + np.cumsum(rng.normal(0.0, 0.1, n))
+    path[:, 1] = 4.66e6 + np.cumsum(rng.normal(0.0, 0.1, n))
+    path[:, 2] = 3.31e6 + np.cumsum(rng.normal(0.0, 0.1, n))
+    return path
+
+
+def main(sizes=(10 ** 5, 10 ** 6)):
+    print("%10s %16s %10s %14s %12s" % ("points", "writer", "seconds", "points/s", "size (MB)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vtk_path = os.path.join(tmp_dir, "point_data.vtp")
+        for n in sizes:
+            path = random_path(n)
+            cases = [("per point", lambda: write_path_vtp_per_point(path, vtk_path))]
+            cases += [(name, lambda options=options: write_path_vtp(path, vtk_path, **options))
+                      for name, options in BULK_OPTIONS]
+            for name, func in cases:
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                print("%10d %16s %10.3f %14.3e %12.2f" % (n, name, elapsed, n / elapsed,
+                                                          os.path.getsize(vtk_path) / 1e6))
+
+
+if __name__ == "__main__":
+    main([int(float(n)) for n in sys.argv[1:]] or (10 ** 5, 10 ** 6))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 01:10
+IDE: PyCharm
+Introduction: total export time of the partitioned VTP export (see vtp_partition.py) against the single file writers,
+              for the path, the gesture triads and the gesture time steps, with 1 to N worker processes. The single
+              file time series gesture writer is only timed up to TIME_SERIES_MAX_ROWS and extrapolated beyond.
+              python -m IMU_Path_Vis.benchmark.bench_vtp_pieces [rows] [piece rows] [max workers]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from IMU_Path_Vis.benchmark.bench_vtp_gesture import random_gesture, TIME_SERIES_MAX_ROWS
+from IMU_Path_Vis.benchmark.synthetic import timed
+from IMU_Path_Vis.parallel import cpu_count
+from IMU_Path_Vis.vtp_partition import PIECE_ROWS, write_pieces
+from IMU_Path_Vis.vtp_writer import write_path_vtp, write_gesture_vtp, write_gesture_triads_vtp
+
+
+def main(n=10 ** 6, piece_rows=PIECE_ROWS, max_workers=None):
+    max_workers = max_workers or cpu_count()
+    worker_counts = sorted({1, max_workers} | {w for w in (2, 4, 8, 16) if w < max_workers})
+    gesture = random_gesture(n)
+    print("%d records, %d records per piece, %d cores" % (n, piece_rows, cpu_count()))
+    print("%16s %14s %8s %8s %10s %12s" % ("export", "writer", "workers", "pieces", "seconds", "size (MB)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        single = os.path.join(tmp_dir, "single.vtp")
+        for what_vtk, data in (("path", gesture[:, 0:3]), ("gesture_triads", gesture), ("gesture", gesture)):
+            if what_vtk == "path":
+                seconds = timed(write_path_vtp, data, single)[0]
+            elif what_vtk == "gesture_triads":
+                seconds = timed(write_gesture_triads_vtp, data, single)[0]
+            else:
+                rows = min(n, TIME_SERIES_MAX_ROWS)
+                seconds = timed(write_gesture_vtp, data[:rows], single)[0] * n / rows
+            print("%16s %14s %8d %8d %10.3f %12.2f%s" % (what_vtk, "single file", 1, 1, seconds,
+                                                         os.path.getsize(single) / 1024.0 ** 2,
+                                                         "" if what_vtk != "gesture" or n <= TIME_SERIES_MAX_ROWS
+                                                         else "  (extrapolated from %d records)" % rows))
+            for workers in worker_counts:
+                index = os.path.join(tmp_dir, what_vtk + (".pvd" if what_vtk == "gesture" else ".pvtp"))
+                result = write_pieces(what_vtk, data, index, piece_rows=piece_rows, workers=workers)
+                print("%16s %14s %8d %8d %10.3f %12.2f" % (what_vtk, "pieces", workers, result["pieces"],
+                                                           result["seconds"], result["bytes"] / 1024.0 ** 2))
+                shutil.rmtree(os.path.splitext(index)[0] + "_pieces")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6,
+         int(float(sys.argv[2])) if len(sys.argv) > 2 else PIECE_ROWS,
+         int(sys.argv[3]) if len(sys.argv) > 3 else None)
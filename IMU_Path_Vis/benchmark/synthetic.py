@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 23:40
+IDE: PyCharm
+Introduction: shared helpers of the benchmarks. Synthetic IMU logs of any length: a vehicle-like trajectory is
+              integrated from speed and heading random walks, the attitude follows the heading with small pitch and
+              roll, and the pair is written as the position and euler CSV files class Vis reads. write_euler_csv
+              writes random euler angles alone, timed and best_of time a function.
+"""
+
+import os
+import time
+import numpy as np
+from IMU_Path_Vis.geo_transform import Re, D2R
+from IMU_Path_Vis.csv_reader import POS_COLUMN, EULER_COLUMN, TIME_COLUMN
+
+# start of the synthetic trajectories, [deg, deg, m]
+ORIGIN_LLA = [31.5, 120.0, 10.0]
+
+
+def timed(func, *args):
+    '''
+    Args:
+        func: function
+        args: the arguments of func
+    returns:
+        the seconds of one call and its result
+    '''
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def best_of(func, repeat):
+    '''
+    Args:
+        func: function without arguments
+        repeat: number of calls
+    returns:
+        the seconds of the fastest call and the result of the last call
+    '''
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def trajectory(n, rate=100.0, seed=0):
+    '''
+    a reproducible vehicle-like trajectory of n records
+    Args:
+        n: number of records
+        rate: sample rate in Hz
+        seed: random seed, the same seed gives the same trajectory
+    returns:
+        time: n numpy array in s
+        lla: nx3 numpy array [lat, lon, alt], [deg, deg, m]
+        euler: nx3 numpy array [yaw, pitch, roll] in deg
+    '''
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / rate
+    time = np.arange(n) * dt
+    speed = np.clip(10.0 + np.cumsum(rng.normal(0.0, 0.05, n)), 0.0, 40.0)
+    heading = rng.uniform(0.0, 360.0) + np.cumsum(rng.normal(0.0, 0.2, n))
+    east = np.cumsum(speed * np.sin(heading * D2R) * dt)
+    north = np.cumsum(speed * np.cos(heading * D2R) * dt)
+    lla = np.empty((n, 3))
+    lla[:, 0] = ORIGIN_LLA[0] + north / Re / D2R
+    lla[:, 1] = ORIGIN_LLA[1] + east / (Re * np.cos(ORIGIN_LLA[0] * D2R)) / D2R
+    lla[:, 2] = ORIGIN_LLA[2] + np.cumsum(rng.normal(0.0, 0.01, n))
+    euler = np.empty((n, 3))
+    euler[:, 0] = (heading + 180.0) % 360.0 - 180.0
+    euler[:, 1] = np.clip(np.cumsum(rng.normal(0.0, 0.05, n)), -10.0, 10.0)
+    euler[:, 2] = np.clip(np.cumsum(rng.normal(0.0, 0.05, n)), -5.0, 5.0)
+    return time, lla, euler
+
+
+def write_pair(out_dir, n, name=None, rate=100.0, seed=0, timed=False):
+    '''
+    write a synthetic position and euler CSV pair
+    Args:
+        out_dir: the directory of the files
+        n: number of records
+        name: the files are pos-<name>.csv and att_euler-<name>.csv, None for the number of records
+        rate, seed: see trajectory
+        timed: start both files with the TIME_COLUMN timestamps
+    returns:
+        pos_file, eul_file
+    '''
+    time, lla, euler = trajectory(n, rate, seed)
+    name = str(n) if name is None else name
+    pos_file = os.path.join(out_dir, "pos-%s.csv" % name)
+    eul_file = os.path.join(out_dir, "att_euler-%s.csv" % name)
+    for file_name, columns, data, fmt in ((pos_file, POS_COLUMN, lla, ["%.10f", "%.10f", "%.4f"]),
+                                          (eul_file, EULER_COLUMN, euler, ["%.6f", "%.6f", "%.6f"])):
+        if timed:
+            columns = [TIME_COLUMN] + columns
+            data = np.column_stack([time, data])
+            fmt = ["%.4f"] + fmt
+        np.savetxt(file_name, data, fmt=fmt, delimiter=',', header=",".join(columns), comments='')
+    return pos_file, eul_file
+
+
+def write_euler_csv(file_name, n, seed=0):
+    '''
+    write an euler CSV file of n uniformly random [yaw, pitch, roll] records
+    '''
+    rng = np.random.default_rng(seed)
+    np.savetxt(file_name, rng.uniform(-180.0, 180.0, (n, 3)), delimiter=',', header=",".join(EULER_COLUMN),
+               comments='')
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 13:40
+IDE: PyCharm
+Introduction: class ArrayCache is a directory cache of the arrays class Vis parses and computes from the input files.
+              Every entry is a sub directory of .npy files keyed on the source files path, size and mtime (and the
+              scale factor num for the gesture arrays), so later Vis instances memory-map them instead of re-parsing.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import numpy as np
+
+# default upper bound of the cache directory size in bytes
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+META_FILE = "meta.json"
+# attempts to move a stored entry in place while other processes store or remove the same key
+STORE_ATTEMPTS = 3
+
+
+class ArrayCache(object):
+    '''
+    size-bounded cache of numpy arrays stored as memory-mappable .npy files
+    '''
+    def __init__(self, cache_dir, max_bytes=CACHE_MAX_BYTES):
+        '''
+        Args:
+            cache_dir: the directory holding the cache entries, created if missing
+            max_bytes: the least recently used entries are evicted once the entries exceed this size
+        '''
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, source_files, **params):
+        '''
+        get the cache key of arrays derived from the source files
+        Args:
+            source_files: list of input file paths
+            params: extra values the arrays depend on, e.g. num=10
+        returns:
+            key: hex string, changes whenever a source file is modified
+        '''
+        parts = []
+        for file_name in source_files:
+            st = os.stat(file_name)
+            parts.append([os.path.abspath(file_name), st.st_size, st.st_mtime_ns])
+        parts.append(sorted((k, repr(v)) for k, v in params.items()))
+        return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def load(self, key):
+        '''
+        memory-map the arrays of an entry
+        Args:
+            key: the cache key
+        returns:
+            arrays: dict of read-only numpy memmaps, None if the entry is not cached
+        '''
+        entry_dir = os.path.join(self.cache_dir, key)
+        meta_file = os.path.join(entry_dir, META_FILE)
+        try:
+            with open(meta_file, "r") as f:
+                meta = json.load(f)
+            arrays = {name: np.load(os.path.join(entry_dir, name + ".npy"), mmap_mode="r")
+                      for name in meta["arrays"]}
+        except (OSError, ValueError, KeyError):
+            return None
+        # the access time of the meta file drives the eviction order, the entry may be evicted by another process
+        # meanwhile, the memory maps stay valid
+        try:
+            os.utime(meta_file)
+        except OSError:
+            pass
+        return arrays
+
+    def store(self, key, arrays, source_files=()):
+        '''
+        store the arrays of an entry and evict old entries if the cache is too large
+        Args:
+            key: the cache key
+            arrays: dict of name to numpy array
+            source_files: the input files of the entry, used by invalidate
+        '''
+        entry_dir = os.path.join(self.cache_dir, key)
+        # the Dash workers and threads may store the same key at the same time, each writes its own directory
+        tmp_dir = "%s.tmp-%d-%d" % (entry_dir, os.getpid(), threading.get_ident())
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_dir, name + ".npy"), np.ascontiguousarray(array))
+            with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+                json.dump({"arrays": list(arrays),
+                           "source_files": [os.path.abspath(file_name) for file_name in source_files],
+                           "created": time.time()}, f)
+            for _ in range(STORE_ATTEMPTS):
+                try:
+                    os.replace(tmp_dir, entry_dir)
+                    break
+                except OSError:
+                    # a complete entry of the same key holds the same arrays, keep it. An incomplete one is left
+                    # by a failed store or is being removed, replace it
+                    if os.path.isfile(os.path.join(entry_dir, META_FILE)):
+                        break
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict(keep=key)
+
+    def invalidate(self, file_name=None):
+        '''
+        remove cached entries
+        Args:
+            file_name: remove the entries derived from this input file, None to remove all entries
+        returns:
+            number of removed entries
+        '''
+        target = None if file_name is None else os.path.abspath(file_name)
+        removed = 0
+        for key, entry_dir, meta in self.__entries():
+            if target is None or target in meta.get("source_files", []):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def evict(self, keep=None):
+        '''
+        remove the least recently used entries until the cache is not larger than max_bytes
+        Args:
+            keep: key of an entry which is never evicted, e.g. the one just stored
+        '''
+        entries = []
+        total = 0
+        for key, entry_dir, meta in self.__entries():
+            try:
+                size = self.__entry_size(entry_dir)
+                entries.append((os.path.getmtime(os.path.join(entry_dir, META_FILE)), key, entry_dir, size))
+            except OSError:
+                # removed by another process meanwhile
+                continue
+            total += size
+        for _, key, entry_dir, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def size(self):
+        '''
+        returns:
+            total size of the cached entries in bytes
+        '''
+        total = 0
+        for _, entry_dir, _ in self.__entries():
+            try:
+                total += self.__entry_size(entry_dir)
+            except OSError:
+                # removed by another process meanwhile
+                continue
+        return total
+
+    @staticmethod
+    def __entry_size(entry_dir):
+        return sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+
+    def __entries(self):
+        for key in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, key)
+            try:
+                with open(os.path.join(entry_dir, META_FILE), "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                # not an entry, e.g. an entry being written by another process
+                continue
+            yield key, entry_dir, meta
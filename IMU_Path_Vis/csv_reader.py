@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 11:05
+IDE: PyCharm
+Introduction: streaming reader for the position and euler CSV files. The header line is parsed once and the data rows
+              are yielded as fixed-size float64 blocks, so the whole file is never held in memory as strings.
+              Class CsvTail follows a file which is still being appended to and parses only the new rows.
+              Compressed .csv.gz and .csv.zst files are decompressed while they are read, see open_csv.
+"""
+
+import gzip
+import io
+import os
+import time
+import numpy as np
+import pandas as pd
+
+POS_COLUMN = ['pos_lat (deg)', 'pos_lon (deg)', 'pos_alt (m)']
+EULER_COLUMN = ['Yaw (deg)', 'Pitch (deg)', 'Roll (deg)']
+# optional timestamp column in front of the data columns, the streams are aligned on it, see align.py
+TIME_COLUMN = 'time (s)'
+# default number of rows per block
+CHUNK_ROWS = 1 << 16
+# the file extensions of the CSV files, plain or compressed
+CSV_EXTENSIONS = (".csv", ".csv.gz", ".csv.zst")
+
+
+def open_csv(file_name):
+    '''
+    open a CSV file for reading in binary mode, a .gz or .zst file is decompressed while it is read so the
+    decompressed text is never held in memory as a whole. zstandard is optional, it is only imported for .zst.
+    returns:
+        a binary file object
+    '''
+    lower = file_name.lower()
+    if lower.endswith(".gz"):
+        return gzip.open(file_name, "rb")
+    if lower.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("reading %s needs zstandard, pip install zstandard" % file_name)
+        f = open(file_name, "rb")
+        try:
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(f, closefd=True), 1 << 20)
+        except Exception:
+            f.close()
+            raise
+    return open(file_name, "rb")
+
+
+def csv_stem(file_name):
+    '''
+    returns:
+        the file name without its CSV extension, see CSV_EXTENSIONS, None for other files
+    '''
+    for extension in CSV_EXTENSIONS:
+        if file_name.lower().endswith(extension):
+            return file_name[:-len(extension)]
+    return None
+
+
+def check_pos_header(header):
+    '''
+    check the pos file header
+    Args:
+        header: list of column names in the first line of the pos file, optionally starting with TIME_COLUMN
+    '''
+    if list(header) != POS_COLUMN and list(header) != [TIME_COLUMN] + POS_COLUMN:
+        raise ValueError("pos file must have the header['pos_lat (deg)', 'pos_lon (deg)', 'pos_alt (m)'], \
+             please check the position file")
+
+
+def check_euler_header(header):
+    '''
+    check the euler file header
+    Args:
+        header: list of column names in the first line of the euler file, optionally starting with TIME_COLUMN
+    '''
+    if list(header) != EULER_COLUMN and list(header) != [TIME_COLUMN] + EULER_COLUMN:
+        raise ValueError("euler file must have the header ('Yaw_deg', 'Pitch_deg', 'Roll_deg'),\
+             please check the euler file")
+
+
+def has_time_column(header):
+    '''
+    returns:
+        True if the first column of the header is the timestamp column TIME_COLUMN
+    '''
+    return len(header) > 0 and header[0] == TIME_COLUMN
+
+
+class ChunkedCsvReader(object):
+    '''
+    read a CSV file with one header line and float data rows block by block
+    '''
+    def __init__(self, file_name, chunk_rows=CHUNK_ROWS):
+        '''
+        Args:
+            file_name: the CSV file, row 1 is the header line and the rest rows contain the data, .csv.gz and
+                .csv.zst are decompressed on the fly
+            chunk_rows: number of rows in each yielded block, the last block may be shorter
+        '''
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self.file_name = file_name
+        self.chunk_rows = chunk_rows
+        # the size on disk, bytes_read and parse_rate of a compressed file count its compressed bytes
+        self.file_size = os.path.getsize(file_name)
+        # the header line, empty list for an empty file
+        with open_csv(file_name) as f:
+            line = f.readline()
+        self.header = line.decode("utf-8").rstrip("\r\n").split(",") if line.strip() else []
+        # statistics of the last iteration
+        self.rows_read = 0
+        self.bytes_read = 0
+        self.parse_time = 0.0
+
+    def __iter__(self):
+        '''
+        yield the data rows as float64 numpy arrays of shape (chunk_rows, number of columns)
+        '''
+        self.rows_read = 0
+        self.bytes_read = 0
+        self.parse_time = 0.0
+        if len(self.header) == 0:
+            return
+        with open_csv(self.file_name) as f:
+            f.readline()
+            start = time.perf_counter()
+            try:
+                reader = pd.read_csv(f, header=None, dtype=np.float64, chunksize=self.chunk_rows,
+                                     float_precision="round_trip")
+            except pd.errors.EmptyDataError:
+                # header line only
+                return
+            try:
+                for chunk in reader:
+                    block = chunk.to_numpy(dtype=np.float64)
+                    self.rows_read += len(block)
+                    self.parse_time += time.perf_counter() - start
+                    yield block
+                    start = time.perf_counter()
+            finally:
+                reader.close()
+            self.parse_time += time.perf_counter() - start
+        self.bytes_read = self.file_size
+
+    def read_all(self):
+        '''
+        read every data row
+        returns:
+            data: float64 numpy array, (number of rows, number of columns)
+        '''
+        blocks = list(self)
+        if len(blocks) == 0:
+            return np.zeros((0, len(self.header)))
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    @property
+    def parse_rate(self):
+        '''
+        parse rate of the last iteration in MB/s
+        '''
+        if self.parse_time == 0:
+            return 0.0
+        return self.bytes_read / self.parse_time / 1e6
+
+
+class CsvTail(object):
+    '''
+    follow a CSV file a logger keeps appending to. The byte offset of the first unparsed row is kept, so every
+    read_new only parses the rows appended since the last call. A last line without its line break yet is left
+    for the next call.
+    '''
+    def __init__(self, file_name):
+        '''
+        Args:
+            file_name: the CSV file, row 1 is the header line and the rest rows contain the data
+        '''
+        if csv_stem(file_name) is not None and not file_name.lower().endswith(".csv"):
+            raise ValueError("could not follow the compressed file %s, only a plain .csv can be followed" % file_name)
+        self.file_name = file_name
+        # the header line, empty list until the logger wrote it
+        self.header = []
+        # byte offset of the first row not parsed yet
+        self.offset = 0
+        # statistics of all calls
+        self.rows_read = 0
+        self.bytes_read = 0
+        self.parse_time = 0.0
+
+    def read_new(self):
+        '''
+        parse the complete rows appended since the last call
+        returns:
+            data: float64 numpy array, (number of new rows, number of columns), 0 rows if nothing was appended
+        '''
+        file_size = os.path.getsize(self.file_name)
+        if file_size < self.offset:
+            raise ValueError("%s was truncated, could not follow it any more" % self.file_name)
+        with open(self.file_name, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(file_size - self.offset)
+        # only complete lines
+        end = data.rfind(b"\n") + 1
+        if len(self.header) == 0:
+            line_end = data.find(b"\n") + 1
+            if line_end == 0 or not data[:line_end].strip():
+                return np.zeros((0, 0))
+            self.header = data[:line_end].decode("utf-8").rstrip("\r\n").split(",")
+            self.offset += line_end
+            data = data[line_end:]
+            end -= line_end
+        if end <= 0 or not data[:end].strip():
+            return np.zeros((0, len(self.header)))
+        start = time.perf_counter()
+        block = pd.read_csv(io.BytesIO(data[:end]), header=None, dtype=np.float64,
+                            float_precision="round_trip").to_numpy(dtype=np.float64)
+        self.parse_time += time.perf_counter() - start
+        self.offset += end
+        self.rows_read += len(block)
+        self.bytes_read += end
+        return block
+
+    @property
+    def parse_rate(self):
+        '''
+        parse rate of all calls in MB/s
+        '''
+        if self.parse_time == 0:
+            return 0.0
+        return self.bytes_read / self.parse_time / 1e6
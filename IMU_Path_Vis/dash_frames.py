@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 18:00
+IDE: PyCharm
+Introduction: partial updates of the Dash 3D path figure. For the clientside playback the gesture on path data is
+              shipped to the browser once as a compact float32 buffer, assets/playback.js then moves the three
+              gesture axis traces with dcc.Graph extendData updates instead of requesting the full figure. Records
+              appended to a followed log are sent as tail frames.
+"""
+
+import base64
+import json
+import numpy as np
+import plotly
+
+# decimals of the east/north/up coordinates sent as JSON, millimetres. A float32 value is written with the 17 digits
+# of its float64 repr otherwise, which makes the JSON larger than for the float64 ECEF coordinates.
+JSON_DECIMALS = 3
+
+
+def json_coords(values):
+    '''
+    returns:
+        values as float64 rounded to JSON_DECIMALS, for the coordinates of a figure trace
+    '''
+    return np.round(np.asarray(values, dtype=np.float64), JSON_DECIMALS)
+
+
+def payload_bytes(obj):
+    '''
+    returns:
+        size in bytes of obj serialized the way Dash sends it to the browser
+    '''
+    return len(json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def gesture_buffer(path_data, key=None):
+    '''
+    pack the gesture on path data into a compact buffer for the clientside playback in assets/playback.js. float32
+    cannot hold ECEF coordinates to the metre, so the values are stored relative to the first position and the
+    browser adds the float64 origin back.
+    Args:
+        path_data: nx12 numpy array, [x, y, z, pos_xaxis_x, pos_xaxis_y, pos_xaxis_z, pos_yaxis_x, pos_yaxis_y,
+            pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
+        key: identifies the dataset, the browser decodes the buffer again only when the key changes
+    returns:
+        dict {"key", "n", "origin": [x, y, z], "data": base64 of the nx12 little-endian float32 offsets}
+    '''
+    n = len(path_data)
+    origin = path_data[0, 0:3] if n else np.zeros(3)
+    offsets = (path_data[:, 0:12] - np.tile(origin, 4)).astype("<f4")
+    return {"key": key if key is not None else "%d-%r" % (n, tuple(float(v) for v in origin)), "n": n,
+            "origin": [float(v) for v in origin],
+            "data": base64.b64encode(offsets.tobytes()).decode("ascii")}
+
+
+def path_tail_frame(path_data, start, origin, key, seq):
+    '''
+    the records appended to a followed log since the browser got start records, for assets/playback.js. The path
+    trace is extended by the new points and the gesture buffer by their float32 offsets.
+    Args:
+        path_data: nx12 numpy array, see gesture_buffer
+        start: number of records the browser already has
+        origin: the origin of the browser gesture buffer, see gesture_buffer
+        key: the key of the browser gesture buffer
+        seq: sequence number of the frame
+    returns:
+        dict {"key", "seq", "start", "n", "x", "y", "z", "customdata", "data"}
+    '''
+    rows = path_data[start:]
+    offsets = (rows[:, 0:12] - np.tile(np.asarray(origin, dtype=np.float64), 4)).astype("<f4")
+    return {"key": key, "seq": seq, "start": start, "n": len(path_data),
+            "x": json_coords(rows[:, 0]).tolist(), "y": json_coords(rows[:, 1]).tolist(),
+            "z": json_coords(rows[:, 2]).tolist(),
+            "customdata": list(range(start, len(path_data))),
+            "data": base64.b64encode(offsets.tobytes()).decode("ascii")}
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 22:50
+IDE: PyCharm
+Introduction: the datasets served by plotly_dash_gesture_on_path.py. Class DatasetRegistry knows the position and
+              euler file pairs below the input and upload directories and loads them on demand into class Dataset,
+              the processed arrays of one pair. The loaded datasets are kept in a bounded LRU and shared read-only by
+              every session, the per-session state (selected dataset, playback, level of detail) stays in the
+              browser. Every server process has its own registry; the uploads are saved to disk and the arrays go
+              through the ArrayCache, so all workers of e.g. gunicorn serve the same datasets. load_async loads in
+              a background thread, so the server answers while a large log is parsed.
+"""
+
+import base64
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from IMU_Path_Vis import IMU_Vis
+from IMU_Path_Vis.batch_export import find_pairs, POS_PREFIX, EULER_PREFIX
+from IMU_Path_Vis.csv_reader import check_pos_header, check_euler_header
+from IMU_Path_Vis.dash_frames import gesture_buffer
+from IMU_Path_Vis.decimation import PathLOD
+from IMU_Path_Vis.overview_tiles import OverviewTiles
+from IMU_Path_Vis.spatial_index import PathIndex
+from IMU_Path_Vis.vis_tail import VisTail
+
+# number of loaded datasets kept in memory
+DATASET_MAX = 4
+# the directory the uploaded file pairs are saved to
+UPLOAD_DIR = "upload_file"
+# dataset names of the uploads start with this
+UPLOAD_PREFIX = "upload/"
+# overview tile pyramids kept per dataset, the current path and the state still shown by a browser
+OVERVIEW_VERSIONS = 2
+
+
+class Dataset(object):
+    '''
+    the path and gesture arrays of one position and euler file pair, read-only once loaded. A followed dataset
+    grows on update, the arrays of an earlier state stay valid.
+    '''
+    def __init__(self, name, pos_file, eul_file, num, cache=None, follow=False, profiler=None):
+        '''
+        Args:
+            name: the dataset name, see DatasetRegistry
+            pos_file: position CSV file, see class Vis
+            eul_file: euler CSV file, see class Vis
+            num: 单位向量轴上的坐标点扩大的倍数
+            cache: optional ArrayCache
+            follow: follow the files while the logger appends to them, see class VisTail
+            profiler: optional profiling.StageProfiler recording the stages of the load
+        '''
+        self.name = name
+        self.num = num
+        # the input files as of the load, the overview tiles of another version of the files get another key
+        self.__source = hashlib.sha1(repr([(os.path.abspath(f), os.stat(f).st_size, os.stat(f).st_mtime_ns)
+                                           for f in (pos_file, eul_file)]).encode("utf-8")).hexdigest()[:16]
+        # number of samples -> OverviewTiles, LRU
+        self.__overviews = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__tail = None
+        if follow:
+            self.__tail = VisTail(pos_file=pos_file, eul_file=eul_file, num=num)
+            self.__tail.update()
+            path_data = self.__tail.path_gesture_enu
+        else:
+            vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file, cache=cache, profiler=profiler)
+            vis.gen_gesture_on_path(num=num)
+            path_data = vis.get_path_gesture_enu()
+            path_data.setflags(write=False)
+        # nx12 float32 [east, north, up, pos_xaxis_e, ..., pos_zaxis_u], see Vis.get_path_gesture_enu
+        self.path_data = path_data
+        self.__lod = PathLOD(path_data)
+        self.__index = PathIndex(path_data)
+
+    @property
+    def follow(self):
+        return self.__tail is not None
+
+    def __len__(self):
+        return len(self.path_data)
+
+    def buffer(self):
+        '''
+        returns:
+            the gesture buffer of the clientside playback, see dash_frames.gesture_buffer
+        '''
+        path_data = self.path_data
+        return gesture_buffer(path_data, key="%s-%d" % (self.name, len(path_data)))
+
+    def path_lod(self):
+        '''
+        returns:
+            the levels of detail of the path, rebuilt after a followed dataset grew
+        '''
+        with self.__lock:
+            if len(self.__lod.levels[0]) != len(self.path_data):
+                self.__lod = PathLOD(self.path_data)
+            return self.__lod
+
+    @property
+    def key(self):
+        '''
+        the key of the current path, changes with the input files and when a followed dataset grew
+        '''
+        return "%s-%d" % (self.__source, len(self.path_data))
+
+    def overview(self, key=None):
+        '''
+        Args:
+            key: the key of the path drawn, see key, a followed dataset may have grown since; None for the current
+                path
+        returns:
+            the overview tiles of the path as of key, see overview_tiles.OverviewTiles, built for a new key
+        '''
+        with self.__lock:
+            path_data = self.path_data
+            n = len(path_data)
+            if key is not None:
+                # the path of an earlier key is a prefix of the path of a followed dataset
+                source, _, length = str(key).rpartition("-")
+                if source != self.__source or not length.isdigit() or int(length) > n:
+                    raise ValueError("%r is not a key of the dataset %s" % (key, self.name))
+                n = int(length)
+            if n in self.__overviews:
+                self.__overviews.move_to_end(n)
+            else:
+                self.__overviews[n] = OverviewTiles(path_data[:n])
+                while len(self.__overviews) > OVERVIEW_VERSIONS:
+                    self.__overviews.popitem(last=False)
+            return self.__overviews[n]
+
+    def nearest(self, point):
+        '''
+        returns:
+            the index of the path sample nearest to point [east, north, up], None for an empty dataset
+        '''
+        with self.__lock:
+            if len(self.__index) != len(self.path_data):
+                self.__index = PathIndex(self.path_data)
+            index = self.__index
+        return index.nearest(point)[0]
+
+    def update(self):
+        '''
+        parse the rows appended to the files of a followed dataset
+        returns:
+            True if the dataset grew
+        '''
+        if self.__tail is None:
+            return False
+        with self.__lock:
+            if len(self.__tail.update()) == 0:
+                return False
+            self.path_data = self.__tail.path_gesture_enu
+            return True
+
+
+class DatasetRegistry(object):
+    '''
+    the position and euler file pairs which can be shown and a bounded LRU of the loaded datasets
+    '''
+    def __init__(self, input_dir="input_file", upload_dir=UPLOAD_DIR, num=100, cache=None, follow=False,
+                 max_datasets=DATASET_MAX, profiler=None):
+        '''
+        Args:
+            input_dir: the directory searched recursively for pos-*.csv / att_euler-*.csv pairs, see batch_export
+            upload_dir: the directory the uploaded pairs are saved to
+            num: 单位向量轴上的坐标点扩大的倍数
+            cache: optional ArrayCache shared by the datasets
+            follow: follow the files of the datasets, see class VisTail
+            max_datasets: the least recently used dataset is dropped once more are loaded
+            profiler: optional profiling.StageProfiler recording the stages of every load
+        '''
+        self.input_dir = input_dir
+        self.upload_dir = upload_dir
+        self.num = num
+        self.cache = cache
+        self.follow = follow
+        self.max_datasets = max_datasets
+        self.profiler = profiler
+        # name -> (pos_file, eul_file) of the pairs added by add
+        self.__added = OrderedDict()
+        # name -> Dataset, most recently used last
+        self.__loaded = OrderedDict()
+        self.__lock = threading.Lock()
+        # name -> lock held while the dataset loads, other sessions wait instead of loading it again
+        self.__loading = {}
+        # name -> thread of load_async, and the message of a failed one until load_async reported it
+        self.__threads = {}
+        self.__errors = {}
+
+    def add(self, name, pos_file, eul_file):
+        '''
+        add a pair which is not below input_dir, e.g. the default input files
+        '''
+        self.__added[name] = (pos_file, eul_file)
+
+    def pairs(self):
+        '''
+        returns:
+            OrderedDict of name to (pos_file, eul_file), the added pairs, the pairs below input_dir and the uploads
+        '''
+        pairs = OrderedDict(self.__added)
+        known = {os.path.abspath(pos_file) for pos_file, _ in pairs.values()}
+        for prefix, root in (("", self.input_dir), (UPLOAD_PREFIX, self.upload_dir)):
+            if not os.path.isdir(root):
+                continue
+            for rel_dir, name, pos_file, eul_file in find_pairs(root):
+                if os.path.abspath(pos_file) in known:
+                    continue
+                parts = [] if rel_dir == os.curdir else rel_dir.split(os.sep)
+                pairs[prefix + "/".join(parts + [name])] = (pos_file, eul_file)
+        return pairs
+
+    def options(self):
+        '''
+        returns:
+            the options of a dcc.Dropdown selecting a dataset
+        '''
+        return [{"label": name, "value": name} for name in self.pairs()]
+
+    def get(self, name):
+        '''
+        the loaded dataset, it is loaded first if it is not in memory
+        Args:
+            name: a name of pairs
+        returns:
+            Dataset
+        '''
+        with self.__lock:
+            if name in self.__loaded:
+                self.__loaded.move_to_end(name)
+                return self.__loaded[name]
+            loading = self.__loading.setdefault(name, threading.Lock())
+        with loading:
+            with self.__lock:
+                if name in self.__loaded:
+                    return self.__loaded[name]
+            pairs = self.pairs()
+            if name not in pairs:
+                raise ValueError("unknown dataset %r" % name)
+            pos_file, eul_file = pairs[name]
+            start = time.perf_counter()
+            dataset = Dataset(name, pos_file, eul_file, self.num, cache=self.cache, follow=self.follow,
+                              profiler=self.profiler)
+            print("dataset %s: %d records loaded in %.3fs" % (name, len(dataset), time.perf_counter() - start))
+            with self.__lock:
+                self.__loaded[name] = dataset
+                while len(self.__loaded) > self.max_datasets:
+                    self.__loaded.popitem(last=False)
+                self.__loading.pop(name, None)
+        return dataset
+
+    def load_async(self, name):
+        '''
+        the loaded dataset, or start loading it in a background thread instead of waiting
+        Args:
+            name: a name of pairs
+        returns:
+            Dataset, None while it is loading
+        '''
+        with self.__lock:
+            if name in self.__loaded:
+                self.__loaded.move_to_end(name)
+                return self.__loaded[name]
+            if name in self.__errors:
+                # reported once, selecting the dataset again retries
+                raise ValueError(self.__errors.pop(name))
+            if name in self.__threads:
+                return None
+        if name not in self.pairs():
+            raise ValueError("unknown dataset %r" % name)
+        with self.__lock:
+            if name not in self.__threads and name not in self.__loaded:
+                self.__threads[name] = threading.Thread(target=self.__load, args=(name,), daemon=True)
+                self.__threads[name].start()
+        return None
+
+    def __load(self, name):
+        try:
+            self.get(name)
+        except Exception as e:
+            with self.__lock:
+                self.__errors[name] = "could not load %s, %s: %s" % (name, type(e).__name__, e)
+        finally:
+            with self.__lock:
+                self.__threads.pop(name, None)
+
+    def upload(self, file_names, contents):
+        '''
+        save an uploaded position and euler file pair to upload_dir, identical uploads share the same files
+        Args:
+            file_names: the names of the two uploaded files
+            contents: the data URLs of the two files, as dcc.Upload gives them
+        returns:
+            the dataset name of the pair
+        '''
+        files = {}
+        for file_name, content in zip(file_names, contents):
+            data = base64.b64decode(content.split(",", 1)[1])
+            header = data.split(b"\n", 1)[0].decode("utf-8").rstrip("\r").split(",")
+            for kind, check_header in (("pos", check_pos_header), ("euler", check_euler_header)):
+                try:
+                    check_header(header)
+                except ValueError:
+                    continue
+                files[kind] = (file_name, data)
+        if len(file_names) != 2 or len(files) != 2:
+            raise ValueError("please upload one position and one euler CSV file")
+        stem = os.path.splitext(os.path.basename(files["pos"][0]))[0]
+        if stem.startswith(POS_PREFIX):
+            stem = stem[len(POS_PREFIX):]
+        # only characters safe in a file name
+        stem = re.sub(r"[^0-9A-Za-z_.-]+", "-", stem).strip(".-") or "data"
+        digest = hashlib.sha1(files["pos"][1] + b"\0" + files["euler"][1]).hexdigest()[:12]
+        pair_dir = os.path.join(self.upload_dir, digest)
+        os.makedirs(pair_dir, exist_ok=True)
+        for prefix, kind in ((POS_PREFIX, "pos"), (EULER_PREFIX, "euler")):
+            file_name = os.path.join(pair_dir, prefix + stem + ".csv")
+            if not os.path.exists(file_name):
+                # another worker only ever sees the complete file
+                with open(file_name + ".part", "wb") as f:
+                    f.write(files[kind][1])
+                os.replace(file_name + ".part", file_name)
+        return UPLOAD_PREFIX + digest + "/" + stem
+
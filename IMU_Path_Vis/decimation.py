@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 17:00
+IDE: PyCharm
+Introduction: level-of-detail decimation of the ECEF path. Class PathLOD precomputes multi-resolution versions of
+              the path by min/max bucketing, every level keeps the original point indices so a decimated point
+              still resolves to the right record.
+"""
+
+import numpy as np
+
+# points kept per bucket at most: the first point and the min and max of x, y and z
+POINTS_PER_BUCKET = 7
+# every level has about 1/LOD_FACTOR of the points of the previous one
+LOD_FACTOR = 4
+# the coarsest level has at least this many points
+LOD_MIN_POINTS = 2000
+# number of points of the level shown at the default camera distance
+LOD_BASE_POINTS = 20000
+# default plotly 3D camera eye distance, eye = (1.25, 1.25, 1.25)
+DEFAULT_EYE_DISTANCE = float(np.sqrt(3 * 1.25 ** 2))
+
+
+def minmax_bucket_indices(points, n_buckets):
+    '''
+    decimate a path by splitting it into n_buckets consecutive buckets and keeping the first point and the points
+    with the min and max x, y, z of each bucket, so spikes and turns survive the decimation
+    Args:
+        points: nx3 numpy array of [x, y, z]
+        n_buckets: number of buckets
+    returns:
+        indices: sorted unique int64 numpy array of the kept point indices, the last point is always kept
+    '''
+    n = len(points)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    n_buckets = int(min(max(n_buckets, 1), n))
+    bucket_size = -(-n // n_buckets)
+    n_buckets = -(-n // bucket_size)
+    # pad the last bucket with its last point so every bucket has bucket_size points
+    padded = np.empty((n_buckets * bucket_size, 3), dtype=points.dtype)
+    padded[:n] = points[:, 0:3]
+    padded[n:] = points[n - 1, 0:3]
+    buckets = padded.reshape(n_buckets, bucket_size, 3)
+    base = np.arange(n_buckets) * bucket_size
+    kept = [base, np.array([n - 1])]
+    kept += [base + np.argmin(buckets[:, :, axis], axis=1) for axis in range(3)]
+    kept += [base + np.argmax(buckets[:, :, axis], axis=1) for axis in range(3)]
+    indices = np.unique(np.concatenate(kept))
+    return indices[indices < n].astype(np.int64)
+
+
+class PathLOD(object):
+    '''
+    multi-resolution versions of a path, level 0 is the full path and every next level is about LOD_FACTOR times
+    smaller until LOD_MIN_POINTS
+    '''
+    def __init__(self, path_data, min_points=LOD_MIN_POINTS, factor=LOD_FACTOR, base_points=LOD_BASE_POINTS):
+        '''
+        Args:
+            path_data: nx3 (or wider) numpy array, the first 3 columns are the ECEF [x, y, z]
+            min_points: the coarsest level has at least this many points
+            factor: reduction factor between two levels
+            base_points: number of points of the level shown at the default camera distance
+        '''
+        self.base_points = base_points
+        n = len(path_data)
+        # indices of the points of each level into path_data
+        self.levels = [np.arange(n, dtype=np.int64)]
+        target = n // factor
+        while target >= min_points:
+            indices = minmax_bucket_indices(path_data, max(target // POINTS_PER_BUCKET, 1))
+            if len(indices) >= len(self.levels[-1]):
+                break
+            self.levels.append(indices)
+            target //= factor
+
+    def level_for_points(self, max_points):
+        '''
+        returns:
+            the finest level with at most max_points points, the coarsest level if none is small enough
+        '''
+        for level, indices in enumerate(self.levels):
+            if len(indices) <= max_points:
+                return level
+        return len(self.levels) - 1
+
+    def level_for_camera(self, camera):
+        '''
+        choose the level for a plotly 3D scene camera, zooming in by 2 allows 4 times more points
+        Args:
+            camera: plotly scene camera dict with an "eye" {x, y, z}, None for the default camera
+        returns:
+            level
+        '''
+        zoom = 1.0
+        if camera and camera.get("eye"):
+            eye = camera["eye"]
+            distance = float(np.sqrt(eye.get("x", 0) ** 2 + eye.get("y", 0) ** 2 + eye.get("z", 0) ** 2))
+            if distance > 0:
+                zoom = DEFAULT_EYE_DISTANCE / distance
+        return self.level_for_points(self.base_points * max(zoom, 1.0) ** 2)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 09:30
+IDE: PyCharm
+Introduction: vectorized coordinate conversions used by class Vis, e.g. GPS LLA position to ECEF position and ECEF
+              position to local east/north/up coordinates.
+"""
+
+import math
+import numpy as np
+
+Re = 6378137                        # m
+ECCENTRICITY = 0.0818191908426215   # Earth eccentricy, e2 = 2*f-f^2
+E_SQR = ECCENTRICITY**2             # squared eccentricity
+D2R = math.pi/180.0
+
+# rows converted per block, keeps the float64 temporaries inside the CPU cache
+LLA2ECEF_BLOCK = 1 << 14
+
+
+def lla2ecef_batch(lla, dtype=np.float64, out=None):
+    '''
+     convert the LLA coordinate [Lat Lon Alt] position to xyz ecef position with numpy, the result is bit-identical
+     to the per-row math.sin/math.cos conversion in Vis.
+    Args:
+        lla: GPS LLA position [Lat, Lon, Alt], [rad, rad, meter], nx3 (or (3,)) array like
+        dtype: numpy float dtype of the returned array, np.float64 or np.float32. Ignored if out is given.
+        out: optional caller-supplied nx3 float array the ecef position is written into
+    returns:
+        ecef_xyz: ecef position [x, y, z], nx3 numpy array (or (3,) for a single LLA), out if given
+    '''
+    lla = np.asarray(lla, dtype=np.float64)
+    single = lla.ndim == 1
+    if single:
+        lla = lla.reshape(1, 3)
+    if lla.ndim != 2 or lla.shape[1] != 3:
+        raise ValueError("lla must be a nx3 array of [Lat, Lon, Alt], got shape %s" % (lla.shape,))
+    n = lla.shape[0]
+    if out is None:
+        out = np.empty((n, 3), dtype=dtype)
+    elif out.shape != (n, 3) and not (single and out.shape == (3,)):
+        raise ValueError("out must have shape %s, got %s" % ((n, 3), out.shape))
+    elif out.dtype.kind != 'f':
+        raise TypeError("out must be a float array, got %s" % out.dtype)
+    ecef_xyz = out.reshape(n, 3)
+    # the operation order below mirrors the former per-row conversion of class Vis (lla2ecef_loop in
+    # benchmark/bench_lla2ecef.py) exactly so that the float64 result matches to the last bit
+    sl = np.empty(LLA2ECEF_BLOCK)
+    cl = np.empty(LLA2ECEF_BLOCK)
+    r = np.empty(LLA2ECEF_BLOCK)
+    tmp = np.empty(LLA2ECEF_BLOCK)
+    for start in range(0, n, LLA2ECEF_BLOCK):
+        stop = min(start + LLA2ECEF_BLOCK, n)
+        m = stop - start
+        lat = lla[start:stop, 0]
+        lon = lla[start:stop, 1]
+        alt = lla[start:stop, 2]
+        b_sl, b_cl, b_r, b_tmp = sl[:m], cl[:m], r[:m], tmp[:m]
+        np.sin(lat, out=b_sl)
+        np.cos(lat, out=b_cl)
+        # r = Re / sqrt(1.0 - E_SQR * sl * sl)
+        np.multiply(b_sl, b_sl, out=b_r)
+        np.multiply(E_SQR, b_r, out=b_r)
+        np.subtract(1.0, b_r, out=b_r)
+        np.sqrt(b_r, out=b_r)
+        np.divide(Re, b_r, out=b_r)
+        # z = (r * (1.0 - E_SQR) + alt) * sl
+        np.multiply(b_r, 1.0 - E_SQR, out=b_tmp)
+        np.add(b_tmp, alt, out=b_tmp)
+        np.multiply(b_tmp, b_sl, out=b_tmp)
+        ecef_xyz[start:stop, 2] = b_tmp
+        # rho = (r + alt) * cl, x = rho * cos(lon), y = rho * sin(lon)
+        np.add(b_r, alt, out=b_r)
+        np.multiply(b_r, b_cl, out=b_r)
+        np.cos(lon, out=b_tmp)
+        np.multiply(b_r, b_tmp, out=b_tmp)
+        ecef_xyz[start:stop, 0] = b_tmp
+        np.sin(lon, out=b_tmp)
+        np.multiply(b_r, b_tmp, out=b_tmp)
+        ecef_xyz[start:stop, 1] = b_tmp
+    return out[0] if single and out.ndim == 2 else out
+
+
+def enu_rotation(lat, lon):
+    '''
+     the rotation from ECEF to the local east/north/up axes at a position
+    Args:
+        lat: latitude, rad
+        lon: longitude, rad
+    returns:
+        R: 3x3 numpy array, enu = R * (ecef - ecef_origin)
+    '''
+    sl, cl = math.sin(lat), math.cos(lat)
+    so, co = math.sin(lon), math.cos(lon)
+    return np.array([[-so, co, 0.0],
+                     [-sl * co, -sl * so, cl],
+                     [cl * co, cl * so, sl]])
+
+
+def ecef2enu_batch(ecef, origin_lla, dtype=np.float64, out=None):
+    '''
+     convert ECEF positions to local east/north/up coordinates. The difference to the origin is taken in float64
+     before the rotation, so a float32 result keeps millimetre precision near the origin.
+    Args:
+        ecef: ECEF position [x, y, z], nx3 array like
+        origin_lla: the origin [Lat, Lon, Alt], [rad, rad, meter]
+        dtype: numpy float dtype of the returned array, e.g. np.float32. Ignored if out is given.
+        out: optional caller-supplied nx3 float array the ENU position is written into
+    returns:
+        enu: [east, north, up] in meter, nx3 numpy array, out if given
+    '''
+    ecef = np.asarray(ecef, dtype=np.float64)
+    if ecef.ndim != 2 or ecef.shape[1] != 3:
+        raise ValueError("ecef must be a nx3 array of [x, y, z], got shape %s" % (ecef.shape,))
+    n = ecef.shape[0]
+    if out is None:
+        out = np.empty((n, 3), dtype=dtype)
+    elif out.shape != (n, 3):
+        raise ValueError("out must have shape %s, got %s" % ((n, 3), out.shape))
+    origin = lla2ecef_batch(np.asarray(origin_lla, dtype=np.float64))
+    rotation_t = enu_rotation(origin_lla[0], origin_lla[1]).T
+    for start in range(0, n, LLA2ECEF_BLOCK):
+        stop = min(start + LLA2ECEF_BLOCK, n)
+        out[start:stop] = np.dot(ecef[start:stop] - origin, rotation_t)
+    return out
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 11:05
+IDE: PyCharm
+Introduction: gesture on path conversion of one block of position and euler records: ECEF, rotation and gesture
+              offset. The block by block export (stream_pipeline.py, vis_main.py --stream) and the followed logs
+              (vis_tail.py) convert every block on its own, so their peak memory only depends on the block size and
+              not on the length of the log. Class Vis reads the whole files.
+"""
+
+import numpy as np
+from IMU_Path_Vis.geo_transform import D2R, lla2ecef_batch
+from IMU_Path_Vis.attitude import euler2rotation_batch
+
+
+def gesture_on_path_block(pos_block, euler_block, num, out=None):
+    '''
+    convert a block of position and euler records to the gesture on path layout
+    Args:
+        pos_block: mx3 numpy array [lat, lon, alt], [deg, deg, m]
+        euler_block: mx3 numpy array [yaw, pitch, roll], [deg, deg, deg]
+        num: 单位向量轴上的坐标点扩大的倍数
+        out: optional mx21 float64 numpy array written in place
+    returns:
+        out: mx21 numpy array with the layout of Vis.get_path_gesture_data, records with the LLA is 0 are kept
+    '''
+    m = len(pos_block)
+    if out is None:
+        out = np.empty((m, 21))
+    path = out[:, 0:3]
+    # convert deg to rad for lat, lon
+    lla = np.array(pos_block[:, 0:3])
+    lla[:, 0:2] *= D2R
+    lla2ecef_batch(lla, out=path)
+    # unit vector coordinates, R[i, :, j] is axis j of record i
+    euler2rotation_batch(euler_block, out=out[:, 3:12].reshape(m, 3, 3).transpose(0, 2, 1))
+    # gesture = path + unit vector * num
+    np.multiply(out[:, 3:12], num, out=out[:, 12:21])
+    for j in range(3):
+        out[:, 12 + 3 * j:15 + 3 * j] += path
+    return out
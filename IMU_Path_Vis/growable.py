@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 19:10
+IDE: PyCharm
+Introduction: class GrowableArray is a 2D numpy buffer rows are appended to. The capacity doubles when it is full, so
+              appending m rows costs O(m) amortized instead of copying the whole array as np.concatenate does.
+"""
+
+import numpy as np
+
+# default initial number of rows
+GROWABLE_CAPACITY = 1024
+
+
+class GrowableArray(object):
+    '''
+    2D numpy array with amortized O(1) row appends
+    '''
+    def __init__(self, columns, dtype=np.float64, capacity=GROWABLE_CAPACITY):
+        '''
+        Args:
+            columns: number of columns
+            dtype: numpy dtype of the buffer
+            capacity: initial number of rows
+        '''
+        self.__buffer = np.empty((max(int(capacity), 1), columns), dtype=dtype)
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    @property
+    def capacity(self):
+        return len(self.__buffer)
+
+    @property
+    def data(self):
+        '''
+        the rows appended so far, a view which is only valid until the next append
+        '''
+        return self.__buffer[:self.__size]
+
+    def reserve(self, rows):
+        '''
+        get the next rows of the buffer to be written in place, doubling the capacity if needed
+        Args:
+            rows: number of rows
+        returns:
+            view of the reserved rows, they count as appended
+        '''
+        size = self.__size + rows
+        if size > len(self.__buffer):
+            capacity = len(self.__buffer)
+            while capacity < size:
+                capacity *= 2
+            buffer = np.empty((capacity, self.__buffer.shape[1]), dtype=self.__buffer.dtype)
+            buffer[:self.__size] = self.__buffer[:self.__size]
+            self.__buffer = buffer
+        reserved = self.__buffer[self.__size:size]
+        self.__size = size
+        return reserved
+
+    def append(self, rows):
+        '''
+        append rows
+        Args:
+            rows: mxcolumns numpy array
+        returns:
+            view of the appended rows in the buffer
+        '''
+        reserved = self.reserve(len(rows))
+        reserved[...] = rows
+        return reserved
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 02:20
+IDE: PyCharm
+Introduction: server side overview of the path for the Dash app. Class OverviewTiles projects the east/north/up path
+              on a top-down (east, north) or side (east, up) view and rasterizes it with NumPy only into PNG tiles of
+              a zoom pyramid: zoom z has 2^z x 2^z tiles of TILE_SIZE pixels, the line through the consecutive
+              samples is drawn in the path colour or shaded by the number of samples per pixel. A click on the
+              overview maps back to the index of the nearest sample of path_data. Class TileCache keeps the rendered
+              tiles in a LRU in memory and optionally on disk, and counts the render time and the cache hits.
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+import numpy as np
+from IMU_Path_Vis.profiling import profile_stage
+from IMU_Path_Vis.spatial_index import PathIndex
+
+# pixels of a tile edge, the whole view is one tile at zoom 0
+TILE_SIZE = 256
+# the deepest zoom level, 2^TILE_MAX_ZOOM tiles along each axis
+TILE_MAX_ZOOM = 6
+# view name -> (horizontal column, vertical column, same scale on both axes) of the east/north/up path
+VIEWS = {"top": (0, 1, True), "side": (0, 2, False)}
+# margin around the path, fraction of its extent
+TILE_MARGIN = 0.02
+# the path colour of the overview, orange as the path trace
+PATH_RGB = (255, 165, 0)
+# colours of the density shading from one sample per pixel up to DENSITY_SATURATION samples per pixel
+DENSITY_RGB = [(255, 237, 160), (254, 178, 76), (240, 59, 32), (128, 0, 38)]
+DENSITY_SATURATION = 256
+# rendered tiles kept in memory by TileCache
+TILE_CACHE_MAX = 512
+
+
+def encode_png(rgba):
+    '''
+    encode an image as an 8 bit RGBA PNG with zlib only
+    Args:
+        rgba: hxwx4 uint8 numpy array
+    returns:
+        the PNG file as bytes
+    '''
+    height, width = rgba.shape[0:2]
+    # filter type 0 (none) in front of every row
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)) + \
+        chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b"")
+
+
+def segment_pixels(start, end, size):
+    '''
+    the pixels crossed by line segments, clipped to the tile (Liang-Barsky) and sampled at one point per pixel
+    Args:
+        start, end: mx2 numpy arrays of the segment ends in tile pixels, [column, row]
+        size: pixels of a tile edge
+    returns:
+        flat int64 numpy array of the pixel ids row * size + column, with repetitions
+    '''
+    delta = end - start
+    # only the segments leaving the tile are clipped
+    outside = np.flatnonzero(np.any((start < 0) | (start > size) | (end < 0) | (end > size), axis=1))
+    t0 = np.zeros(len(outside))
+    t1 = np.ones(len(outside))
+    keep = np.ones(len(start), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for k in range(2):
+            d, a = delta[outside, k], start[outside, k]
+            for p, q in ((-d, a), (d, size - a)):
+                r = q / p
+                keep[outside] &= ~((p == 0) & (q < 0))
+                t0 = np.where(p < 0, np.maximum(t0, r), t0)
+                t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    keep[outside] &= t0 <= t1
+    start = start.copy()
+    start[outside] += t0[:, None] * delta[outside]
+    delta[outside] *= (t1 - t0)[:, None]
+    clipped_start, clipped_delta = start[keep], delta[keep]
+    steps = np.ceil(np.abs(clipped_delta).max(axis=1)).astype(np.int64) + 1 if len(clipped_delta) else \
+        np.zeros(0, dtype=np.int64)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    # t = 0, 1 / (steps - 1), ..., 1 along every segment
+    t = (np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)) / np.maximum(steps - 1, 1)[segment]
+    points = np.floor(clipped_start[segment] + t[:, None] * clipped_delta[segment]).astype(np.int64)
+    np.clip(points, 0, size - 1, out=points)
+    return points[:, 1] * size + points[:, 0]
+
+
+def rasterize(pixels, size, density=False):
+    '''
+    draw the line through consecutive samples, 2 pixels wide
+    Args:
+        pixels: nx2 numpy array of the samples in tile pixels, [column, row], may lie outside the tile
+        size: pixels of a tile edge
+        density: shade every pixel by the number of samples in it instead of the plain path colour
+    returns:
+        sizexsizex4 uint8 RGBA numpy array, transparent outside the line
+    '''
+    # -1 empty, else the shading level 0..1
+    level = np.full(size * size, -1.0)
+    if len(pixels) > 1:
+        # only the first and the last sample of a run of samples in the same pixel, the samples outside the tile are
+        # put in the pixel next to the tile edge; a long log has many samples per pixel at the low zoom levels. The
+        # line inside a run stays in its pixel or outside the tile, the segments entering and leaving the run start
+        # at its first and last sample
+        cells = np.floor(pixels).astype(np.int64)
+        np.clip(cells, -1, size, out=cells)
+        runs = np.flatnonzero(np.any(cells[1:] != cells[:-1], axis=1)) + 1
+        kept = np.unique(np.concatenate([[0], runs - 1, runs, [len(pixels) - 1]]))
+        line, line_cells = pixels[kept], cells[kept]
+        # the segments between neighbour pixels are drawn by their end samples, the longer ones which may cross
+        # the tile are rasterized
+        start, end = line[:-1], line[1:]
+        crossing = np.all((np.minimum(start, end) < size) & (np.maximum(start, end) >= 0), axis=1) & \
+            (np.abs(line_cells[1:] - line_cells[:-1]).max(axis=1) > 1)
+        level[segment_pixels(start[crossing], end[crossing], size)] = 0.0
+    inside = np.all((pixels >= 0) & (pixels < size), axis=1)
+    sample_ids = np.floor(pixels[inside]).astype(np.int64)
+    sample_ids = sample_ids[:, 1] * size + sample_ids[:, 0]
+    if density:
+        counts = np.bincount(sample_ids, minlength=size * size)
+        occupied = counts > 0
+        level[occupied] = np.minimum(np.log(counts[occupied]) / np.log(DENSITY_SATURATION), 1.0)
+    else:
+        level[sample_ids] = 0.0
+    level = level.reshape(size, size)
+    # one more pixel to the right and below, a thin line vanishes in the scaled overview
+    level[:, 1:] = np.maximum(level[:, 1:], level[:, :-1])
+    level[1:, :] = np.maximum(level[1:, :], level[:-1, :])
+    rgba = np.zeros((size, size, 4), dtype=np.uint8)
+    drawn = level >= 0
+    if density:
+        stops = np.linspace(0.0, 1.0, len(DENSITY_RGB))
+        for channel in range(3):
+            rgba[drawn, channel] = np.interp(level[drawn], stops, [rgb[channel] for rgb in DENSITY_RGB])
+    else:
+        rgba[drawn, 0:3] = PATH_RGB
+    rgba[drawn, 3] = 255
+    return rgba
+
+
+class OverviewTiles(object):
+    '''
+    the tile pyramids of the views of one path. The views share the overview coordinates: zoom 0 pixels, u from
+    left to right and v from top to bottom in [0, tile_size), tile (tx, ty) of zoom z covers u in
+    [tx, tx + 1) * tile_size / 2^z and v in [ty, ty + 1) * tile_size / 2^z.
+    '''
+    def __init__(self, path_data, tile_size=TILE_SIZE, max_zoom=TILE_MAX_ZOOM):
+        '''
+        Args:
+            path_data: nx3 (or wider, only the first 3 columns are used) numpy array of [east, north, up], the
+                order of the samples is kept, pick returns indices into it
+            tile_size: pixels of a tile edge
+            max_zoom: the deepest zoom level
+        '''
+        self.path_data = path_data
+        self.tile_size = tile_size
+        self.max_zoom = max_zoom
+        self.__views = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.path_data)
+
+    def __view(self, view):
+        '''
+        returns:
+            dict of the samples "uv" in overview coordinates, their "bounds" [u_min, v_min, u_max, v_max], the
+            "origin" and "scale" of the projection and the lazily built PathIndex "index" of the view
+        '''
+        if view not in VIEWS:
+            raise ValueError("unknown view %r, use one of %s" % (view, ", ".join(sorted(VIEWS))))
+        with self.__lock:
+            if view in self.__views:
+                return self.__views[view]
+            column, row, equal_scale = VIEWS[view]
+            projected = np.asarray(self.path_data[:, [column, row]], dtype=np.float64)
+            if len(projected):
+                low, high = projected.min(axis=0), projected.max(axis=0)
+            else:
+                low, high = np.zeros(2), np.zeros(2)
+            extent = np.maximum(high - low, 1e-6)
+            if equal_scale:
+                extent[:] = extent.max()
+            # the path fills the overview but the margin, centred on the axes with the smaller extent
+            scale = self.tile_size * (1.0 - 2 * TILE_MARGIN) / extent
+            origin = (low + high) / 2 - self.tile_size / 2 / scale
+            uv = (projected - origin) * scale
+            # v grows downwards
+            uv[:, 1] = self.tile_size - uv[:, 1]
+            bounds = np.concatenate([uv.min(axis=0), uv.max(axis=0)]) if len(uv) else np.zeros(4)
+            self.__views[view] = {"uv": uv, "bounds": bounds, "origin": origin, "scale": scale, "index": None}
+            return self.__views[view]
+
+    def world(self, view, u, v):
+        '''
+        returns:
+            the [horizontal, vertical] coordinates in m of a point of the overview, e.g. [east, up] of the side view
+        '''
+        projection = self.__view(view)
+        return projection["origin"] + np.array([u, self.tile_size - v]) / projection["scale"]
+
+    def zoom_for_width(self, width):
+        '''
+        returns:
+            the zoom level showing width overview units with about one tile pixel per screen pixel
+        '''
+        if width is None or width <= 0:
+            return 0
+        return int(np.clip(np.ceil(np.log2(self.tile_size / width) - 1e-9), 0, self.max_zoom))
+
+    def tiles(self, view, z, u_range=None, v_range=None):
+        '''
+        the tiles of a zoom level showing a part of the path
+        Args:
+            view: a key of VIEWS
+            z: zoom level
+            u_range, v_range: optional visible ranges in overview coordinates, the whole overview by default
+        returns:
+            list of (tx, ty)
+        '''
+        self.check_tile(z, 0, 0)
+        u_min, v_min, u_max, v_max = self.__view(view)["bounds"]
+        if len(self) == 0:
+            return []
+        if u_range is not None:
+            u_min, u_max = max(u_min, min(u_range)), min(u_max, max(u_range))
+        if v_range is not None:
+            v_min, v_max = max(v_min, min(v_range)), min(v_max, max(v_range))
+        if u_min > u_max or v_min > v_max:
+            return []
+        unit = self.tile_size / 2.0 ** z
+        last = 2 ** z - 1
+        tx_range = range(int(np.clip(u_min // unit, 0, last)), int(np.clip(u_max // unit, 0, last)) + 1)
+        ty_range = range(int(np.clip(v_min // unit, 0, last)), int(np.clip(v_max // unit, 0, last)) + 1)
+        return [(tx, ty) for ty in ty_range for tx in tx_range]
+
+    def render(self, view, z, tx, ty, density=False):
+        '''
+        rasterize one tile
+        Args:
+            view: a key of VIEWS
+            z, tx, ty: the zoom level and the column and row of the tile
+            density: shade the path by the number of samples per pixel
+        returns:
+            the tile as PNG bytes
+        '''
+        self.check_tile(z, tx, ty)
+        uv = self.__view(view)["uv"]
+        pixels = uv * 2 ** z - np.array([tx, ty]) * self.tile_size
+        return encode_png(rasterize(pixels, self.tile_size, density))
+
+    def pick(self, view, u, v):
+        '''
+        returns:
+            the index of the path_data sample nearest to the point (u, v) of the overview, None for an empty path
+        '''
+        projection = self.__view(view)
+        with self.__lock:
+            if projection["index"] is None:
+                uv = projection["uv"]
+                projection["index"] = PathIndex(np.column_stack([uv, np.zeros(len(uv))]))
+            index = projection["index"]
+        return index.nearest([u, v, 0.0])[0]
+
+    def check_tile(self, z, tx, ty, view=None):
+        '''
+        raise a ValueError for a tile which is not part of the pyramid or an unknown view
+        '''
+        if view is not None and view not in VIEWS:
+            raise ValueError("unknown view %r, use one of %s" % (view, ", ".join(sorted(VIEWS))))
+        if not 0 <= z <= self.max_zoom:
+            raise ValueError("zoom level must be in 0..%d, got %r" % (self.max_zoom, z))
+        if not (0 <= tx < 2 ** z and 0 <= ty < 2 ** z):
+            raise ValueError("tile (%r, %r) is not part of zoom level %d" % (tx, ty, z))
+
+
+class TileCache(object):
+    '''
+    LRU of rendered tiles in memory, optionally backed by a directory so the tiles survive a restart and are
+    shared by the workers of a server. Thread-safe.
+    '''
+    def __init__(self, cache_dir=None, max_tiles=TILE_CACHE_MAX, profiler=None):
+        '''
+        Args:
+            cache_dir: optional directory of the tiles, <cache_dir>/<dataset key>/<view>/<z>/<tx>_<ty>[_density].png
+            max_tiles: tiles kept in memory
+            profiler: optional profiling.StageProfiler, every rendered tile is recorded as "overview_tile"
+        '''
+        self.cache_dir = cache_dir
+        self.max_tiles = max_tiles
+        self.profiler = profiler
+        self.__tiles = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.render_seconds = 0.0
+
+    def get(self, key, overview, view, z, tx, ty, density=False):
+        '''
+        the PNG of a tile, rendered on a miss
+        Args:
+            key: the key of the path, changes with the path, e.g. Dataset.key
+            overview: the OverviewTiles of the path
+            view, z, tx, ty, density: see OverviewTiles.render
+        returns:
+            the tile as PNG bytes
+        '''
+        overview.check_tile(z, tx, ty, view)
+        tile = (key, view, int(z), int(tx), int(ty), bool(density))
+        with self.__lock:
+            if tile in self.__tiles:
+                self.__tiles.move_to_end(tile)
+                self.hits += 1
+                return self.__tiles[tile]
+        tile_file = self.__file(tile)
+        if tile_file is not None and os.path.isfile(tile_file):
+            with open(tile_file, "rb") as f:
+                png = f.read()
+            with self.__lock:
+                self.disk_hits += 1
+                self.__store(tile, png)
+            return png
+        start = time.perf_counter()
+        with profile_stage(self.profiler, "overview_tile", rows=len(overview)) as record:
+            png = overview.render(view, z, tx, ty, density)
+            record["bytes_written"] = len(png)
+        seconds = time.perf_counter() - start
+        if tile_file is not None:
+            os.makedirs(os.path.dirname(tile_file), exist_ok=True)
+            tmp_file = "%s.tmp-%d-%d" % (tile_file, os.getpid(), threading.get_ident())
+            with open(tmp_file, "wb") as f:
+                f.write(png)
+            os.replace(tmp_file, tile_file)
+        with self.__lock:
+            self.misses += 1
+            self.render_seconds += seconds
+            self.__store(tile, png)
+        return png
+
+    def stats(self):
+        '''
+        returns:
+            dict of the "tiles" in memory, the memory "hits", "disk_hits", "misses" (rendered tiles), the
+            "hit_rate" of all requests and the total and mean render time "render_seconds", "render_ms"
+        '''
+        with self.__lock:
+            requests = self.hits + self.disk_hits + self.misses
+            return {"tiles": len(self.__tiles), "hits": self.hits, "disk_hits": self.disk_hits,
+                    "misses": self.misses,
+                    "hit_rate": (self.hits + self.disk_hits) / requests if requests else 0.0,
+                    "render_seconds": self.render_seconds,
+                    "render_ms": 1e3 * self.render_seconds / self.misses if self.misses else 0.0}
+
+    def __file(self, tile):
+        if self.cache_dir is None:
+            return None
+        key, view, z, tx, ty, density = tile
+        return os.path.join(self.cache_dir, key, view, str(z), "%d_%d%s.png" % (tx, ty, "_density" if density else ""))
+
+    def __store(self, tile, png):
+        # with the lock held
+        self.__tiles[tile] = png
+        self.__tiles.move_to_end(tile)
+        while len(self.__tiles) > self.max_tiles:
+            self.__tiles.popitem(last=False)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 00:10
+IDE: PyCharm
+Introduction: multi-core chunked execution of the row-wise batch conversions of class Vis (LLA to ECEF, euler to
+              quaternion, quaternion to rotation, gesture offset). The rows are split into chunks which are converted
+              by a thread pool straight into the slices of the preallocated output; NumPy releases the GIL in the
+              ufuncs, so the threads run on all cores without copying the arrays to other processes. Every row is
+              converted by the same function as in the serial path, so the result is bit-identical.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# rows per task, four blocks of the batch conversions, 1.5 MB of nx3 float64
+CHUNK_ROWS = 1 << 16
+
+# workers -> ChunkExecutor, see get_executor
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def cpu_count():
+    '''
+    returns:
+        the number of cores this process may run on
+    '''
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class ChunkExecutor(object):
+    '''
+    runs a row-wise batch function over row chunks of its inputs and of a preallocated output on a thread pool
+    '''
+    def __init__(self, workers=None, chunk_rows=CHUNK_ROWS):
+        '''
+        Args:
+            workers: number of threads, None for all cores, 1 converts in the calling thread
+            chunk_rows: rows per task
+        '''
+        self.workers = cpu_count() if workers is None else int(workers)
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1, got %d" % self.workers)
+        self.chunk_rows = int(chunk_rows)
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def map_rows(self, func, inputs, out, **kwargs):
+        '''
+        call func(*[a[start:stop] for a in inputs], out=out[start:stop], **kwargs) for every chunk of rows
+        Args:
+            func: batch function writing row i of out from row i of the inputs only, e.g. lla2ecef_batch
+            inputs: list of arrays with the rows of out
+            out: the preallocated output, may be a strided view
+            kwargs: extra arguments of func
+        returns:
+            out
+        '''
+        n = len(out)
+        for a in inputs:
+            if len(a) != n:
+                raise ValueError("the inputs must have the %d rows of out, got %d" % (n, len(a)))
+        if self.workers == 1 or n <= self.chunk_rows:
+            func(*inputs, out=out, **kwargs)
+            return out
+        futures = [self.__executor().submit(func, *[a[start:start + self.chunk_rows] for a in inputs],
+                                            out=out[start:start + self.chunk_rows], **kwargs)
+                   for start in range(0, n, self.chunk_rows)]
+        for future in futures:
+            # raises the exception of a failed chunk
+            future.result()
+        return out
+
+    def shutdown(self):
+        with self.__lock:
+            if self.__pool is not None:
+                self.__pool.shutdown()
+                self.__pool = None
+
+    def __executor(self):
+        with self.__lock:
+            if self.__pool is None:
+                self.__pool = ThreadPoolExecutor(max_workers=self.workers)
+            return self.__pool
+
+
+def get_executor(workers=None):
+    '''
+    the ChunkExecutor with the given number of workers shared by the whole process, so many Vis objects do not
+    start many pools
+    '''
+    workers = cpu_count() if workers is None else int(workers)
+    with _executors_lock:
+        if workers not in _executors:
+            _executors[workers] = ChunkExecutor(workers)
+        return _executors[workers]
@@ -8,12 +8,23 @@ Introduction: call class Vis by using input files position and euler to generate
               the path data and gesture via plotly Dash
 """
 
+import json
+import logging
+import os
+import sys
+import time
+from urllib.parse import quote
 import dash
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.exceptions import PreventUpdate
+from flask import Response, abort, request
 import plotly.graph_objects as go
-from IMU_Path_Vis import IMU_Vis
+from IMU_Path_Vis.cache import ArrayCache
+from IMU_Path_Vis.dash_frames import path_tail_frame, json_coords
+from IMU_Path_Vis.dataset_registry import DatasetRegistry
+from IMU_Path_Vis.overview_tiles import TileCache, TILE_SIZE
+from IMU_Path_Vis.profiling import StageProfiler
 import numpy as np
 
 
@@ -22,16 +33,91 @@ external_stylesheets = ['https://codepen.io/chriddyp/pen/bWLwgP.css',
                         'https://codepen.io/chriddyp/pen/brPBPO.css'
                         ]
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+# the WSGI application for a multi-worker server, e.g. gunicorn -w 4 IMU_Path_Vis.plotly_dash_gesture_on_path:server
+server = app.server
 
 # prepare the data
-pos_file = "input_file\\pos-algo0_0_hig.csv"
-eul_file = "input_file\\att_euler-algo0_0.csv"
-Vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file)
-Vis.gen_gesture_on_path(num=100)
-gesture_data = Vis.get_path_gesture_data()
-path_data = gesture_data[:, [0, 1, 2, 12, 13, 14, 15, 16, 17, 18, 19, 20]]
-min_value = np.min(path_data, axis=0)
-max_value = np.max(path_data, axis=0)
+pos_file = os.path.join("input_file", "pos-algo0_0_hig.csv")
+eul_file = os.path.join("input_file", "att_euler-algo0_0.csv")
+# 单位向量轴上的坐标点扩大的倍数
+gesture_num = 100
+# python plotly_dash_gesture_on_path.py --follow keeps reading the rows the logger appends to the input files
+follow = "--follow" in sys.argv
+# the latency of the plot callbacks and the stages of the dataset loads, served as text at /_profile and as a
+# Chrome trace at /_profile/trace.json; python plotly_dash_gesture_on_path.py --profile also logs every record
+if "--profile" in sys.argv:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+profiler = StageProfiler(logger=logging.getLogger("IMU_Path_Vis") if "--profile" in sys.argv else None,
+                         max_records=10000)
+# the datasets, loaded on demand and shared read-only by all sessions of this server process. The path and the
+# gesture axis ends are float32 east/north/up coordinates around the first valid fix, see Vis.get_path_gesture_enu
+registry = DatasetRegistry(input_dir="input_file", num=gesture_num, cache=ArrayCache("cache"), follow=follow,
+                           profiler=profiler)
+default_dataset = "algo0_0_hig"
+registry.add(default_dataset, pos_file, eul_file)
+# the layout is served right away, the default dataset is parsed and converted in the background meanwhile
+registry.load_async(default_dataset)
+# the rendered PNG tiles of the overview, in memory and in tile_cache shared with the other server processes; the
+# render time of every tile is recorded by the profiler as "overview_tile", the hit rate is served at /_tiles/stats
+tile_cache = TileCache("tile_cache", profiler=profiler)
+# the overview is clicked on a grid of this many cells along each axis of the visible part
+OVERVIEW_CLICK_GRID = 64
+
+
+def get_dataset(name):
+    '''
+    the loaded dataset of a session, the callback is skipped for an unknown dataset or one still loading
+    '''
+    if not name:
+        raise PreventUpdate
+    try:
+        dataset = registry.load_async(name)
+    except ValueError:
+        raise PreventUpdate
+    if dataset is None:
+        raise PreventUpdate
+    return dataset
+
+
+@server.route("/_profile")
+def profile_report():
+    return Response(profiler.report() + "\n", mimetype="text/plain")
+
+
+@server.route("/_profile/trace.json")
+def profile_trace():
+    return Response(json.dumps(profiler.chrome_trace()), mimetype="application/json")
+
+
+@server.route("/_tiles/<view>/<int:z>/<int:tx>/<int:ty>.png")
+def overview_tile(view, z, tx, ty):
+    # ?dataset=name&key=key&density=1, the tiles of the path as of the key the overview figure was drawn from, a
+    # followed dataset may have grown since
+    try:
+        dataset = registry.load_async(request.args.get("dataset", ""))
+    except ValueError:
+        abort(404)
+    if dataset is None:
+        abort(503)
+    key = request.args.get("key") or dataset.key
+    try:
+        png = tile_cache.get(key, dataset.overview(key), view, z, tx, ty, request.args.get("density") == "1")
+    except ValueError:
+        abort(404)
+    response = Response(png, mimetype="image/png")
+    response.headers["Cache-Control"] = "max-age=86400"
+    return response
+
+
+@server.route("/_tiles/stats")
+def overview_tile_stats():
+    return Response(json.dumps(tile_cache.stats()), mimetype="application/json")
+
+
+def triggered_by(prop_id):
+    return any(t["prop_id"] == prop_id for t in dash.callback_context.triggered)
+
+
 demo_intro_md = "The scatter plot below is the result of running the t-SNE algorithm on the MNIST digits, \
 nd using your own datasets, follow the instructions on the project repo to setup the local version. To learn more about how the t-SNE Explorer works, click on Learn More below."
 
@@ -46,243 +132,476 @@ color = {
     "background-color": "#FFFFFF"
 }
 name_axis = ['x axis', 'y axis', 'z axis']
-trace = [go.Scatter3d(
-    x=[0], y=[0], z=[0],
-    mode='markers+lines',
-    name="x axis",
-    marker={'size': 1, 'color': color["x axis"]}),
-    go.Scatter3d(
-        x=[0], y=[0], z=[0],
-        mode='markers+lines',
-        name="y axis",
-        marker={'size': 1, 'color': color["y axis"]}),
-    go.Scatter3d(
-        x=[0], y=[0], z=[0],
-        mode='markers+lines',
-        name="z axis",
-        marker={'size': 1, 'color': color["z axis"]}),
-    go.Scatter3d(
-        x=path_data[:, 0], y=path_data[:, 1], z=path_data[:, 2],
-        mode='markers+lines', customdata=[i for i in range(len(path_data))],
+
+
+def create_path_trace(dataset, level, n=None):
+    '''
+    the path trace of a level of detail, customdata holds the original point index of every shown point
+    Args:
+        dataset: the Dataset shown
+        level: level of detail
+        n: only the first n points, the points the browser got so far in follow mode
+    '''
+    path_data = dataset.path_data
+    indices = dataset.path_lod().levels[level]
+    if n is not None:
+        indices = indices[indices < n]
+    return go.Scatter3d(
+        x=json_coords(path_data[indices, 0]), y=json_coords(path_data[indices, 1]),
+        z=json_coords(path_data[indices, 2]),
+        mode='markers+lines', customdata=indices,
         name="path",
-        hoverinfo="x+y+z+text",   # set point index for path data
-        hovertext=["point ID:" + str(i) for i in range(len(path_data))],
+        hovertemplate="E: %{x}<br>N: %{y}<br>U: %{z}<br>point ID:%{customdata}<extra>path</extra>",
         marker={'size': 1, 'color': color["path"], 'colorscale': 'Blackbody', 'opacity': 0.8, "showscale": False,
-                "colorbar": {"thickness": 15, "len": 0.5, "x": 0.8, "y": 0.6, }, }),
-]
-figure = {"data": trace,
-          "layout": go.Layout(
-             height=960,
-             title={"text": "IMU 3D path picture",
-                    "font": {"family": "Open Sans", "size": 30, "color": color["font"]}},
-             scene={"aspectmode": "manual",
-                    "xaxis": {"title": {"text": "x轴(由纬度lat转换而来)",
-                                        "font": {"family": "Open Sans", "size": 10, "color": color["font"]}},
-                              'showticklabels': True, 'autorange': False, "color": color["font"],
-                              'range': [min_value[0], max_value[0]]},
-                    "yaxis": {"title": {"text": "y轴(由经度lon转换而来)",
-                                        "font": {"family": "Open Sans", "size": 10, "color": color["font"]}},
-                              'showticklabels': True, 'autorange': False, "color": color["font"],
-                              'range': [min_value[1], max_value[1]]},
-                    "zaxis": {"title": {"text": "z轴(由高度alt转换而来)",
-                                       "font": {"family": "Open Sans", "size": 10, "color": color["font"]}},
-                              'showticklabels': True, 'autorange': False, "color": color["font"],
-                              'range': [min_value[2], max_value[2]]}
-             },
-             clickmode='event+select',
-             paper_bgcolor="#ffffff",
-             legend=dict(
-                    font={"family": "Open Sans", "size": 10, "color": color["font"]},
-                ),
-         )}
+                "colorbar": {"thickness": 15, "len": 0.5, "x": 0.8, "y": 0.6, }, })
+
+
+def create_gesture_trace(path_data, j, index=None):
+    '''
+    the gesture trace of axis j on the path, playback and locate move it with extendData
+    Args:
+        path_data: the path and gesture axis ends, see Dataset.path_data
+        j: 0, 1, 2 for the x, y, z axis
+        index: the record shown, None for the initial trace at the origin
+    '''
+    if index is None or index >= len(path_data):
+        x = y = z = [0]
+        hovertext = [""]
+    else:
+        x = json_coords([path_data[index, 0], path_data[index, 3 * (j + 1)]])
+        y = json_coords([path_data[index, 1], path_data[index, 3 * (j + 1) + 1]])
+        z = json_coords([path_data[index, 2], path_data[index, 3 * (j + 1) + 2]])
+        hovertext = ["point ID:" + str(index) for _ in range(2)]
+    return go.Scatter3d(
+        x=x, y=y, z=z,
+        name=name_axis[j],
+        hoverinfo="x+y+z+text",  # set point index for gesture data
+        hovertext=hovertext,
+        mode="markers+lines", marker=dict(color=color[name_axis[j]], size=5)
+    )
+
+
+def create_figure(dataset, level, index=None, n=None):
+    '''
+    the path figure of a session
+    Args:
+        dataset: the Dataset shown
+        level: level of detail of the path trace
+        index: the record of the gesture traces, None for the initial traces at the origin
+        n: only the first n points, see create_path_trace
+    '''
+    path_data = dataset.path_data if n is None else dataset.path_data[:n]
+    min_value = np.min(path_data[:, 0:3], axis=0) if len(path_data) else np.zeros(3)
+    max_value = np.max(path_data[:, 0:3], axis=0) if len(path_data) else np.zeros(3)
+    trace = [create_gesture_trace(path_data, j, index) for j in range(3)] + [create_path_trace(dataset, level, n)]
+    return {"data": trace,
+            "layout": go.Layout(
+               height=960,
+               title={"text": "IMU 3D path picture",
+                      "font": {"family": "Open Sans", "size": 30, "color": color["font"]}},
+               scene={"aspectmode": "manual",
+                      "xaxis": {"title": {"text": "东 E (m)",
+                                          "font": {"family": "Open Sans", "size": 10, "color": color["font"]}},
+                                'showticklabels': True, 'autorange': follow, "color": color["font"],
+                                'range': [min_value[0], max_value[0]]},
+                      "yaxis": {"title": {"text": "北 N (m)",
+                                          "font": {"family": "Open Sans", "size": 10, "color": color["font"]}},
+                                'showticklabels': True, 'autorange': follow, "color": color["font"],
+                                'range': [min_value[1], max_value[1]]},
+                      "zaxis": {"title": {"text": "天 U (m)",
+                                         "font": {"family": "Open Sans", "size": 10, "color": color["font"]}},
+                                'showticklabels': True, 'autorange': follow, "color": color["font"],
+                                'range': [min_value[2], max_value[2]]}
+               },
+               clickmode='event+select',
+               # keep the camera when the path trace is swapped for another level of detail of the dataset
+               uirevision=dataset.name,
+               paper_bgcolor="#ffffff",
+               legend=dict(
+                      font={"family": "Open Sans", "size": 10, "color": color["font"]},
+                  ),
+           )}
+
+
+def create_overview(dataset, view, density, u_range=None, v_range=None):
+    '''
+    the overview figure, the PNG tiles of the visible part as layout images at the zoom level matching its width,
+    under a transparent grid catching the clicks
+    Args:
+        dataset: the Dataset shown
+        view: "top" or "side", see overview_tiles.VIEWS
+        density: shade the path by the number of samples per pixel
+        u_range, v_range: the visible part in overview coordinates, the whole overview by default
+    returns:
+        figure, status, key: the figure, the text of the zoom level, the rendered tiles and the cache hit rate, and
+            the key of the path drawn, clicks are picked on the overview of this key
+    '''
+    key = dataset.key
+    overview = dataset.overview(key)
+    u_range = u_range or [0, TILE_SIZE]
+    v_range = v_range or [0, TILE_SIZE]
+    z = overview.zoom_for_width(abs(u_range[1] - u_range[0]))
+    tiles = overview.tiles(view, z, u_range, v_range)
+    # render the missing tiles now, the browser then gets them from the cache
+    misses = tile_cache.misses
+    start = time.perf_counter()
+    for tx, ty in tiles:
+        tile_cache.get(key, overview, view, z, tx, ty, density)
+    seconds = time.perf_counter() - start
+    unit = TILE_SIZE / 2.0 ** z
+    images = [dict(source="/_tiles/%s/%d/%d/%d.png?dataset=%s&key=%s%s" % (view, z, tx, ty, quote(dataset.name),
+                                                                         key, "&density=1" if density else ""),
+                   xref="x", yref="y", x=tx * unit, y=ty * unit, sizex=unit, sizey=unit, xanchor="left",
+                   yanchor="top", sizing="stretch", layer="below") for tx, ty in tiles]
+    cells = [np.linspace(min(r), max(r), OVERVIEW_CLICK_GRID) for r in (u_range, v_range)]
+    clicks = go.Heatmap(x=json_coords(cells[0]), y=json_coords(cells[1]),
+                        z=np.zeros((OVERVIEW_CLICK_GRID, OVERVIEW_CLICK_GRID), dtype=np.int8).tolist(),
+                        opacity=0, showscale=False, hoverinfo="none")
+    axis = {"showticklabels": False, "showgrid": False, "zeroline": False}
+    figure = {"data": [clicks],
+              "layout": go.Layout(
+                  height=300, margin=dict(l=0, r=0, t=0, b=0), images=images,
+                  xaxis=dict(range=[0, TILE_SIZE], **axis),
+                  yaxis=dict(range=[TILE_SIZE, 0], scaleanchor="x", **axis),
+                  # keep the zoom of the overview when the tiles of another zoom level are swapped in
+                  uirevision="%s-%s" % (dataset.name, view),
+                  paper_bgcolor="#ffffff", plot_bgcolor="#ffffff")}
+    stats = tile_cache.stats()
+    status = "zoom %d, %d tiles, %d rendered in %.1f ms, cache hit rate %.0f %%" % (
+        z, len(tiles), tile_cache.misses - misses, 1e3 * seconds, 100 * stats["hit_rate"])
+    return figure, status, key
+
 
 ################ Dash plot starts ################################
-app.layout = html.Div(
- [
-    html.Div(html.H1("IMU 3D path and gesture picture", style={"color": "#1c1c1c"}),
-             style={'textAlign': "center", "width": "100%", "float": "left"}),
-    html.Div(
-         [
-             html.Div(
-                 [dcc.Dropdown(
-                     id='input_number',
-                     options=[{'label': i, 'value': i} for i in [300, 500, 1000]],
-                     value=1000)], style={'width': '100%', "margin-top": "5px"}),
-             dcc.Input(
-                 id="locate_nb",
-                 type="number",
-                 debounce=True,
-                 placeholder="定位",
-                 style={"width": "100%", "margin-top": "5px"},
-                 max=len(path_data),
-                 min=0
-             ),
-             dcc.Input(
-                 id="input_range",
-                 type="number",
-                 placeholder="跨越点",
-                 style={"width": "100%", "margin-top": "5px"},
-                 max=len(path_data),
-                 min=0
-             ),
-             html.Button(
-                 '前进',
-                 id='Forward_Submit',
-                 n_clicks_timestamp=0,
-                 style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
-             ),
-             html.Button(
-                 '后退',
-                 id='Rollback_Submit',
-                 n_clicks_timestamp=0,
-                 style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
-             ),
-             html.Button(
-                 '开始',
-                 id='Play_gesture',
-                 n_clicks=0,
-                 n_clicks_timestamp=0,
-                 style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
-             ),
-             html.Button(
-                 '暂停',
-                 id='Stop_gesture',
-                 n_clicks=0,
-                 n_clicks_timestamp=0,
-                 style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
-             ),
-             # store the locate number value
-             dcc.Store(
-                 id='locate_store',
-                 data=dict(value=0)
-             ),
-             # store the input number value
-             # dcc.Store(
-             #     id='input_store',
-             #     data=dict(value=0)
-             # ),
-         ], style={"width": "10%", "float": "left", "margin-top": "150px", "margin-left": "2%"}
-    ),
-    html.Div([dcc.Graph(id='my_general_path', figure=figure, clickData={'points': [{'customdata': 0}]}),
-              dcc.Interval(id='interval-component', interval=1 * 3000, disabled=True,  # in milliseconds
-                           n_intervals=0
-              )], style={"width": "64%", "float": "left", "margin-top": "150px", "margin-left": "2%"}),
-    html.Div([
-        html.H3("please click the path data scatter on the left side to see gesture", id="output_text"),
-        dcc.Graph(id='gesture')],
-             style={"width": "19%", "float": "left", "margin-left": "2%", "margin-top": "150px", "margin-right": "1%"}),
- ], style={"height": "1000px", "width": "100%", "background-color": color["background-color"]}
-)
+def serve_layout():
+    '''
+    the layout is built for every page load, so it lists the datasets added since, e.g. uploaded in another worker
+    '''
+    return html.Div(
+     [
+        html.Div(html.H1("IMU 3D path and gesture picture", style={"color": "#1c1c1c"}),
+                 style={'textAlign': "center", "width": "100%", "float": "left"}),
+        html.Div(
+             [
+                 html.Div(
+                     [dcc.Dropdown(
+                         id='dataset',
+                         options=registry.options(),
+                         value=default_dataset,
+                         clearable=False)], style={'width': '100%', "margin-top": "5px"}),
+                 dcc.Upload(
+                     id='upload',
+                     children=html.Div('上传 pos / att_euler CSV'),
+                     multiple=True,
+                     style={"width": "100%", "margin-top": "5px", "border": "1px dashed #888", "textAlign": "center"}
+                 ),
+                 html.Div(id="upload_status", style={"width": "100%", "margin-top": "5px"}),
+                 html.Div(id="load_status", style={"width": "100%", "margin-top": "5px"}),
+                 html.Div(
+                     [dcc.Dropdown(
+                         id='input_number',
+                         options=[{'label': i, 'value': i} for i in [1, 10, 100, 300, 500, 1000]],
+                         value=10)], style={'width': '100%', "margin-top": "5px"}),
+                 dcc.Input(
+                     id="playback_fps",
+                     type="number",
+                     placeholder="fps",
+                     value=30,
+                     style={"width": "100%", "margin-top": "5px"},
+                     min=1
+                 ),
+                 dcc.Input(
+                     id="locate_nb",
+                     type="number",
+                     debounce=True,
+                     placeholder="定位",
+                     style={"width": "100%", "margin-top": "5px"},
+                     min=0
+                 ),
+                 dcc.Input(
+                     id="nearest_xyz",
+                     type="text",
+                     debounce=True,
+                     placeholder="最近点 E, N, U",
+                     style={"width": "100%", "margin-top": "5px"}
+                 ),
+                 dcc.Input(
+                     id="input_range",
+                     type="number",
+                     placeholder="跨越点",
+                     style={"width": "100%", "margin-top": "5px"},
+                     min=0
+                 ),
+                 html.Button(
+                     '前进',
+                     id='Forward_Submit',
+                     n_clicks=0,
+                     style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
+                 ),
+                 html.Button(
+                     '后退',
+                     id='Rollback_Submit',
+                     n_clicks=0,
+                     style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
+                 ),
+                 html.Button(
+                     '开始',
+                     id='Play_gesture',
+                     n_clicks=0,
+                     style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
+                 ),
+                 html.Button(
+                     '暂停',
+                     id='Stop_gesture',
+                     n_clicks=0,
+                     style={"width": "100%", "margin-top": "5px", "font-size": "15px"}
+                 ),
+                 html.Div(id="playback_status", style={"width": "100%", "margin-top": "5px"}),
+                 # the gesture on path data of the selected dataset, shipped to the browser once for the clientside playback
+                 dcc.Store(
+                     id='gesture-buffer'
+                 ),
+                 # the clientside playback state, {index, playing}
+                 dcc.Store(
+                     id='playback-frame',
+                     data=dict(index=None, playing=False)
+                 ),
+                 # the records appended to the followed input files, see path_tail_frame, seq 0 when a dataset was loaded
+                 dcc.Store(
+                     id='tail-frame'
+                 ),
+                 # the level of detail of the path trace shown, {dataset, level}
+                 dcc.Store(
+                     id='path-level'
+                 ),
+                 # the key of the path drawn in the overview, see Dataset.key
+                 dcc.Store(
+                     id='overview-key'
+                 ),
+             ], style={"width": "10%", "float": "left", "margin-top": "150px", "margin-left": "2%"}
+        ),
+        html.Div([dcc.Graph(id='my_general_path', clickData={'points': [{'customdata': 0}]}),
+                  dcc.Interval(id='playback-interval', interval=1000 // 30, disabled=True,  # in milliseconds
+                               n_intervals=0
+                  ),
+                  dcc.Interval(id='tail-interval', interval=1000, disabled=not follow, n_intervals=0),
+                  # polls a dataset loading in the background
+                  dcc.Interval(id='load-interval', interval=500, disabled=True, n_intervals=0)
+                  ], style={"width": "64%", "float": "left", "margin-top": "150px", "margin-left": "2%"}),
+        html.Div([
+            # the server rendered overview of the whole path, a click locates the nearest record
+            dcc.RadioItems(
+                id='overview_view',
+                options=[{'label': '俯视 top', 'value': 'top'}, {'label': '侧视 side', 'value': 'side'}],
+                value='top',
+                labelStyle={'display': 'inline-block', 'margin-right': '10px'}),
+            dcc.Checklist(
+                id='overview_density',
+                options=[{'label': '密度 density', 'value': 'density'}],
+                value=[]),
+            dcc.Graph(id='overview', config={'displayModeBar': False}),
+            html.Div(id="overview_status", style={"width": "100%", "font-size": "12px"}),
+            html.H3("please click the path data scatter on the left side to see gesture", id="output_text"),
+            dcc.Graph(id='gesture')],
+                 style={"width": "19%", "float": "left", "margin-left": "2%", "margin-top": "150px", "margin-right": "1%"}),
+     ], style={"height": "1000px", "width": "100%", "background-color": color["background-color"]}
+    )
+
 
+app.layout = serve_layout
 
 
 @app.callback(
     [dash.dependencies.Output("my_general_path", "figure"),
-     dash.dependencies.Output('interval-component', 'disabled')],
-    [dash.dependencies.Input('input_number', 'value'),
-     dash.dependencies.Input('locate_nb', 'value'),
-     dash.dependencies.Input('Forward_Submit', 'n_clicks_timestamp'),
-     dash.dependencies.Input('Rollback_Submit', 'n_clicks_timestamp'),
-     dash.dependencies.Input('Play_gesture', 'n_clicks_timestamp'),
-     dash.dependencies.Input('Stop_gesture', 'n_clicks_timestamp'),
-     dash.dependencies.Input('interval-component', 'n_intervals')
-     ],
-    [dash.dependencies.State('input_range', 'value')]
+     dash.dependencies.Output("path-level", "data")],
+    [dash.dependencies.Input('tail-frame', 'data'),
+     dash.dependencies.Input('my_general_path', 'relayoutData')],
+    [dash.dependencies.State('playback-frame', 'data'),
+     dash.dependencies.State('path-level', 'data')]
 )
-def plot_path_graph(input_number, locate_nb,n_clicks_fw, n_clicks_rb, n_clicks_play, n_clicks_stop, n, input_range):
-    ctx = dash.callback_context
-    # 获取被触发的控件
-    if ctx.triggered[0]['prop_id'].split('.')[0] == 'Play_gesture' or \
-            (n_clicks_play > n_clicks_fw and n_clicks_play > n_clicks_rb and n_clicks_play > n_clicks_stop):
-        # 只触发play button
-        print("input_number", input_number)
-        if input_number is None:
-            # raise PreventUpdate
-            disable = True
-            return figure, disable
-        print("n before", n)
-        n = n * input_number
-        if n > len(path_data):
-            # raise PreventUpdate
-            disable = True
-            return figure, disable
-        print("Play_gesture", n)
-        for j in range(3):
-            figure['data'][j] = go.Scatter3d(
-                        x=[path_data[n, 0], path_data[n, 3 * (j + 1)]],
-                        y=[path_data[n, 1], path_data[n, 3 * (j + 1) + 1]],
-                        z=[path_data[n, 2], path_data[n, 3 * (j + 1) + 2]],
-                        name=name_axis[j],
-                        hoverinfo="x+y+z+text",  # set point index for gesture data
-                        hovertext=["point ID:" + str(n) for _ in range(3)],
-                        mode="markers+lines", marker=dict(color=color[name_axis[j]], size=5)
-                    )
-        disable = False
-    elif ctx.triggered[0]['prop_id'].split('.')[0] == 'Stop_gesture':
-        # 只触发stop button
-        print("stop_gesture")
-        disable = True
-    elif ctx.triggered[0]['prop_id'].split('.')[0] == 'locate_nb':
-        if locate_nb is None:
-            raise PreventUpdate
-        print("locate_nb", locate_nb)
-        # 只触发locate功能
-        if locate_nb > len(path_data) or locate_nb < 0:
+@profiler.timed()
+def update_path_figure(tail, relayout_data, frame, path_level):
+    # a dataset was loaded, or the camera moved and the level of detail matching the zoom is served
+    if not tail:
+        raise PreventUpdate
+    dataset = get_dataset(tail["dataset"])
+    path_lod = dataset.path_lod()
+    if triggered_by('tail-frame.data'):
+        if tail["seq"] != 0:
+            # the appended records of a followed dataset extend the path trace in the browser
             raise PreventUpdate
-        for i in range(3):
-            figure['data'][i] = go.Scatter3d(
-                x=[path_data[locate_nb, 0], path_data[locate_nb, 3 * (i + 1)]],
-                y=[path_data[locate_nb, 1], path_data[locate_nb, 3 * (i + 1) + 1]],
-                z=[path_data[locate_nb, 2], path_data[locate_nb, 3 * (i + 1) + 2]],
-                name=name_axis[i],
-                hoverinfo="x+y+z+text",  # set point index for gesture data
-                hovertext=["point ID:" + str(locate_nb) for _ in range(3)],
-                mode="markers+lines", marker=dict(color=color[name_axis[i]], size=5)
-            )
-        disable = True
+        level = path_lod.level_for_camera(None)
+        index = None
     else:
-        print("else")
-        disable = True
-    return figure, disable
+        if not relayout_data or 'scene.camera' not in relayout_data:
+            raise PreventUpdate
+        level = path_lod.level_for_camera(relayout_data['scene.camera'])
+        if path_level == dict(dataset=dataset.name, level=level):
+            raise PreventUpdate
+        # the browser moved the gesture traces with extendData, keep them where they are
+        index = frame["index"] if frame else None
+    # in follow mode only the points the browser got, the later ones arrive with the next tail frame
+    figure = create_figure(dataset, level, index, tail["n"] if dataset.follow else None)
+    return figure, dict(dataset=dataset.name, level=level)
 
 
-# store the original locate number
 @app.callback(
-    dash.dependencies.Output('locate_store', 'data'),
-    [dash.dependencies.Input('locate_nb', 'value')],
-    [dash.dependencies.State('locate_store', 'data')]
+    [dash.dependencies.Output("overview", "figure"),
+     dash.dependencies.Output("overview_status", "children"),
+     dash.dependencies.Output("overview-key", "data")],
+    [dash.dependencies.Input('tail-frame', 'data'),
+     dash.dependencies.Input('overview_view', 'value'),
+     dash.dependencies.Input('overview_density', 'value'),
+     dash.dependencies.Input('overview', 'relayoutData')],
+    [dash.dependencies.State('overview-key', 'data')]
 )
-def update_store(locate_nb, store_values):
-    if locate_nb is None:
+@profiler.timed()
+def update_overview(tail, view, density, relayout_data, overview_key):
+    # a dataset was loaded or grew, the view changed or the overview was zoomed and the tiles of the zoom level are
+    # served
+    if not tail:
+        raise PreventUpdate
+    dataset = get_dataset(tail["dataset"])
+    grown = triggered_by('tail-frame.data') and tail["seq"] != 0
+    if grown and overview_key == dataset.key:
         raise PreventUpdate
-    store_values['value'] = locate_nb
-    return store_values
+    zoomed = triggered_by('overview.relayoutData')
+    if zoomed and not (relayout_data and ('xaxis.range[0]' in relayout_data or 'xaxis.autorange' in relayout_data)):
+        raise PreventUpdate
+    # the zoom of the overview is kept when a grown dataset is redrawn, another dataset or view is shown whole
+    u_range = v_range = None
+    if (zoomed or grown) and relayout_data and 'xaxis.range[0]' in relayout_data:
+        u_range = [relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']]
+        v_range = [relayout_data.get('yaxis.range[0]', TILE_SIZE), relayout_data.get('yaxis.range[1]', 0)]
+    return create_overview(dataset, view, "density" in (density or []), u_range, v_range)
+
+
+################ clientside playback, see assets/playback.js ################################
+app.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace='imu', function_name='tick'),
+    dash.dependencies.Output('playback-frame', 'data'),
+    [dash.dependencies.Input('playback-interval', 'n_intervals'),
+     dash.dependencies.Input('Play_gesture', 'n_clicks'),
+     dash.dependencies.Input('Stop_gesture', 'n_clicks'),
+     dash.dependencies.Input('Forward_Submit', 'n_clicks'),
+     dash.dependencies.Input('Rollback_Submit', 'n_clicks'),
+     dash.dependencies.Input('locate_nb', 'value'),
+     dash.dependencies.Input('gesture-buffer', 'data')],
+    [dash.dependencies.State('input_number', 'value'),
+     dash.dependencies.State('input_range', 'value'),
+     dash.dependencies.State('playback-frame', 'data')]
+)
+app.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace='imu', function_name='frame'),
+    dash.dependencies.Output('my_general_path', 'extendData'),
+    [dash.dependencies.Input('playback-frame', 'data'),
+     dash.dependencies.Input('tail-frame', 'data')],
+    [dash.dependencies.State('gesture-buffer', 'data')]
+)
+app.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace='imu', function_name='interval_disabled'),
+    dash.dependencies.Output('playback-interval', 'disabled'),
+    [dash.dependencies.Input('playback-frame', 'data')]
+)
+app.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace='imu', function_name='interval_ms'),
+    dash.dependencies.Output('playback-interval', 'interval'),
+    [dash.dependencies.Input('playback_fps', 'value')]
+)
+app.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace='imu', function_name='status'),
+    dash.dependencies.Output('playback_status', 'children'),
+    [dash.dependencies.Input('playback-frame', 'data')],
+    [dash.dependencies.State('gesture-buffer', 'data')]
+)
 
 
 @app.callback(
-     dash.dependencies.Output('locate_nb', 'value'),
-    [dash.dependencies.Input('Forward_Submit', 'n_clicks_timestamp'),
-     dash.dependencies.Input('Rollback_Submit', 'n_clicks_timestamp')
-    ],
-    [dash.dependencies.State('locate_store', 'data'),
-     dash.dependencies.State('input_range', 'value')]
+    [dash.dependencies.Output('gesture-buffer', 'data'),
+     dash.dependencies.Output('tail-frame', 'data'),
+     dash.dependencies.Output('locate_nb', 'max'),
+     dash.dependencies.Output('input_range', 'max'),
+     dash.dependencies.Output('load-interval', 'disabled'),
+     dash.dependencies.Output('load_status', 'children')],
+    [dash.dependencies.Input('dataset', 'value'),
+     dash.dependencies.Input('tail-interval', 'n_intervals'),
+     dash.dependencies.Input('load-interval', 'n_intervals')],
+    [dash.dependencies.State('tail-frame', 'data')]
+)
+def update_dataset(name, n_intervals, n_load_intervals, tail):
+    # a dataset was selected, ship its gesture buffer once it is loaded. In follow mode parse the rows appended to
+    # the input files and send the new records to the browser
+    if not name:
+        raise PreventUpdate
+    no_update = dash.no_update
+    try:
+        dataset = registry.load_async(name)
+    except ValueError as e:
+        return no_update, no_update, no_update, no_update, True, str(e)
+    if dataset is None:
+        return no_update, no_update, no_update, no_update, False, "loading %s ..." % name
+    if triggered_by('dataset.value') or not tail or tail["dataset"] != name:
+        buffer = dataset.buffer()
+        tail = dict(dataset=name, origin=buffer["origin"], key=buffer["key"], seq=0, start=0, n=buffer["n"])
+        return buffer, tail, buffer["n"], buffer["n"], True, ""
+    dataset.update()
+    path_data = dataset.path_data
+    if len(path_data) <= tail["n"]:
+        raise PreventUpdate
+    frame = path_tail_frame(path_data, tail["n"], tail["origin"], tail["key"], tail["seq"] + 1)
+    frame.update(dataset=name, origin=tail["origin"])
+    return no_update, frame, len(path_data), len(path_data), no_update, no_update
 
+
+@app.callback(
+    [dash.dependencies.Output('dataset', 'options'),
+     dash.dependencies.Output('dataset', 'value'),
+     dash.dependencies.Output('upload_status', 'children')],
+    [dash.dependencies.Input('upload', 'contents')],
+    [dash.dependencies.State('upload', 'filename')]
 )
-def update_locate(n_clicks_fw, n_clicks_rb, store_values, input_range):
-    print("update_locate", n_clicks_fw, n_clicks_rb, store_values, input_range)
-    if store_values is None or input_range is None:
-        # prevent the None callbacks is important with the store component.
-        # you don't want to update the store for nothing.
+def upload_dataset(contents, file_names):
+    # save an uploaded position and euler file pair and select it
+    if not contents:
         raise PreventUpdate
-    if n_clicks_fw > n_clicks_rb:
-        # 执行forward功能
-        store_values["value"] = store_values["value"] + input_range
-    else:
-        # 执行rollback 功能
-        store_values["value"] = store_values["value"] - input_range
-    if store_values["value"] > len(path_data) or store_values["value"] < 0:
+    try:
+        name = registry.upload(file_names, contents)
+    except (ValueError, UnicodeDecodeError) as e:
+        return dash.no_update, dash.no_update, str(e)
+    return registry.options(), name, "uploaded " + name
+
+
+@app.callback(
+    dash.dependencies.Output('locate_nb', 'value'),
+    [dash.dependencies.Input('nearest_xyz', 'value'),
+     dash.dependencies.Input('overview', 'clickData')],
+    [dash.dependencies.State('dataset', 'value'),
+     dash.dependencies.State('overview_view', 'value'),
+     dash.dependencies.State('overview-key', 'data')]
+)
+def jump_to_nearest(text, overview_click, name, view, overview_key):
+    # "east, north, up" in meter or a click on the overview, locate the nearest path sample, the clientside
+    # playback moves there
+    dataset = get_dataset(name)
+    if len(dataset) == 0:
+        raise PreventUpdate
+    if triggered_by('overview.clickData'):
+        if not overview_click:
+            raise PreventUpdate
+        point = overview_click['points'][0]
+        # the overview the clicked image was drawn from
+        try:
+            overview = dataset.overview(overview_key)
+        except ValueError:
+            raise PreventUpdate
+        return overview.pick(view, point['x'], point['y'])
+    try:
+        point = [float(v) for v in text.replace(",", " ").split()]
+    except (AttributeError, ValueError):
         raise PreventUpdate
-    return store_values["value"]
+    if len(point) != 3:
+        raise PreventUpdate
+    return dataset.nearest(point)
 
 
 def create_gesture(dff):
@@ -334,19 +653,30 @@ def create_gesture(dff):
      dash.dependencies.Output("gesture", "style"),
      dash.dependencies.Output("output_text", "style")],
     [dash.dependencies.Input('my_general_path', 'clickData')
-     ]
+     ],
+    [dash.dependencies.State('dataset', 'value')]
 )
-def update_gesture(clickData):
-    # click event only for path trace
-    if "customdata" not in clickData['points'][0].keys():
+@profiler.timed()
+def update_gesture(clickData, name):
+    dataset = get_dataset(name)
+    path_data = dataset.path_data
+    point = clickData['points'][0]
+    if "customdata" in point.keys():
+        index = point['customdata']
+    elif all(axis in point for axis in "xyz"):
+        # a gesture axis point, take the nearest path sample
+        index = dataset.nearest([point['x'], point['y'], point['z']])
+    else:
+        raise PreventUpdate
+    if index is None or index >= len(path_data):
         raise PreventUpdate
-    index = clickData['points'][0]['customdata']
     # 初始化不显示姿态图,返回空figure和消息
     if index == 0:
         return {'data': [],
                 'layout': go.Layout(title=f"please click the path data to see gesture", )
                },  {'display': 'none'},  {'display': 'block'}
-    dff = gesture_data[index, 3:12]
+    # the unit vectors of the gesture axes in east/north/up
+    dff = (path_data[index, 3:12] - np.tile(path_data[index, 0:3], 3)) / dataset.num
     return create_gesture(dff)
 
 
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 23:55
+IDE: PyCharm
+Introduction: opt-in stage profiling of class Vis and the Dash callbacks. A StageProfiler passed to Vis records the
+              wall time, rows, bytes read and written and array memory of every stage (parse, header check, ECEF,
+              rotations, gesture offset, filtering, VTP write). The records go to a logging logger and to callbacks
+              as they complete, and can be written as a Chrome trace (chrome://tracing, Perfetto) afterwards.
+              cprofile() dumps the pstats of a whole run.
+"""
+
+import collections
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+MB = 1024.0 ** 2
+
+
+class StageProfiler(object):
+    '''
+    records one {"stage", "start", "seconds", "rows", "bytes_read", "bytes_written", "array_mb", "thread"} per
+    profiled stage, "peak_mb" is added when trace_memory is set. Stages nest (the ECEF stage parses the position
+    file first), every nested stage is recorded on its own. Thread-safe, the Dash app profiles concurrent requests;
+    the tracemalloc peak is global to the process though, so a stage overlapped by a stage of another thread gets
+    no "peak_mb".
+    '''
+    def __init__(self, logger=None, trace_memory=False, max_records=None):
+        '''
+        Args:
+            logger: optional logging.Logger, every record is logged at INFO level
+            trace_memory: trace the numpy allocations with tracemalloc and record the peak of each stage as
+                "peak_mb" (Python 3.9+, the peak can not be reset before), unless stages of other threads run
+                meanwhile. The stages run slower.
+            max_records: keep the last max_records records only, None for all of them
+        '''
+        self.logger = logger
+        self.trace_memory = trace_memory and hasattr(tracemalloc, "reset_peak")
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # functions called with every record
+        self.callbacks = []
+        self.records = collections.deque(maxlen=max_records)
+        self.__origin = time.perf_counter()
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        # thread id -> the memory frames of its open stages, when trace_memory is set
+        self.__memory_frames = {}
+
+    def add_callback(self, callback):
+        '''
+        call callback(record) after every profiled stage
+        '''
+        self.callbacks.append(callback)
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=0, bytes_read=0, bytes_written=0, array_mb=0.0):
+        '''
+        profile the block as one stage, the yielded record can be updated inside the block, e.g.
+        with profiler.stage("parse") as record:
+            data = parse()
+            record["rows"] = len(data)
+        '''
+        record = {"stage": name, "start": 0.0, "seconds": 0.0, "rows": rows, "bytes_read": bytes_read,
+                  "bytes_written": bytes_written, "array_mb": array_mb, "thread": threading.get_ident()}
+        stack = self.__stack()
+        if self.trace_memory:
+            with self.__lock:
+                current, peak = tracemalloc.get_traced_memory()
+                frame = {"current": current, "peak": current, "overlapped": False}
+                others = [frames for thread, frames in self.__memory_frames.items()
+                          if thread != record["thread"] and frames]
+                if others:
+                    # resetting the peak would break the peaks of the open stages of the other threads
+                    frame["overlapped"] = True
+                    for frames in others:
+                        for other in frames:
+                            other["overlapped"] = True
+                else:
+                    if stack:
+                        # the peak is reset for this stage, the enclosing stage keeps its peak so far
+                        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                    tracemalloc.reset_peak()
+                stack.append(frame)
+                self.__memory_frames[record["thread"]] = stack
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            record["start"] = start - self.__origin
+            if self.trace_memory:
+                with self.__lock:
+                    frame = stack.pop()
+                    peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                    if not frame["overlapped"]:
+                        record["peak_mb"] = (peak - frame["current"]) / MB
+                    if stack:
+                        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                        stack[-1]["overlapped"] |= frame["overlapped"]
+                    else:
+                        del self.__memory_frames[record["thread"]]
+            self.__add(record)
+
+    def timed(self, name=None):
+        '''
+        decorator profiling every call of a function as a stage, e.g. the Dash callbacks
+        '''
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        '''
+        returns:
+            dict stage name -> {"calls", "seconds", "mean", "p50", "p95", "max", "rows", "bytes_read",
+            "bytes_written"} over all records of the stage
+        '''
+        with self.__lock:
+            records = list(self.records)
+        stages = {}
+        for record in records:
+            stages.setdefault(record["stage"], []).append(record)
+        summary = {}
+        for name, stage_records in stages.items():
+            seconds = sorted(r["seconds"] for r in stage_records)
+            summary[name] = {"calls": len(seconds), "seconds": sum(seconds), "mean": sum(seconds) / len(seconds),
+                             "p50": seconds[(len(seconds) - 1) // 2],
+                             "p95": seconds[min(len(seconds) - 1, int(0.95 * len(seconds)))],
+                             "max": seconds[-1], "rows": sum(r["rows"] for r in stage_records),
+                             "bytes_read": sum(r["bytes_read"] for r in stage_records),
+                             "bytes_written": sum(r["bytes_written"] for r in stage_records)}
+        return summary
+
+    def report(self):
+        '''
+        returns:
+            string, one line per stage name with its calls, time, throughput and bytes
+        '''
+        lines = ["%-24s %6s %10s %10s %10s %10s %12s %10s %10s" % ("stage", "calls", "total (s)", "mean (ms)",
+                                                                 "p95 (ms)", "max (ms)", "rows/s", "read (MB)",
+                                                                 "write (MB)")]
+        for name, s in sorted(self.summary().items(), key=lambda item: -item[1]["seconds"]):
+            lines.append("%-24s %6d %10.4f %10.3f %10.3f %10.3f %12.3e %10.2f %10.2f" %
+                         (name, s["calls"], s["seconds"], 1e3 * s["mean"], 1e3 * s["p95"], 1e3 * s["max"],
+                          s["rows"] / s["seconds"] if s["seconds"] else 0.0, s["bytes_read"] / MB,
+                          s["bytes_written"] / MB))
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        '''
+        returns:
+            the records as complete events of the Chrome trace event format, a dict to be dumped to JSON
+        '''
+        with self.__lock:
+            records = list(self.records)
+        events = []
+        for record in records:
+            args = {k: v for k, v in record.items() if k not in ("stage", "start", "seconds", "thread")}
+            events.append({"name": record["stage"], "ph": "X", "ts": 1e6 * record["start"],
+                           "dur": 1e6 * record["seconds"], "pid": os.getpid(), "tid": record["thread"],
+                           "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, trace_file):
+        '''
+        write the Chrome trace of the records, open it in chrome://tracing or https://ui.perfetto.dev
+        '''
+        with open(trace_file, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def __stack(self):
+        # the open stages of the current thread
+        if not hasattr(self.__local, "stack"):
+            self.__local.stack = []
+        return self.__local.stack
+
+    def __add(self, record):
+        with self.__lock:
+            self.records.append(record)
+        if self.logger is not None:
+            self.logger.info("%s: %.6f s, %d rows, %d bytes read, %d bytes written, %.3f MB arrays", record["stage"],
+                             record["seconds"], record["rows"], record["bytes_read"], record["bytes_written"],
+                             record["array_mb"])
+        for callback in self.callbacks:
+            callback(record)
+
+
+@contextlib.contextmanager
+def profile_stage(profiler, name, **counts):
+    '''
+    profiler.stage(name, **counts) if a profiler is given, else the yielded record is not kept
+    '''
+    if profiler is None:
+        yield dict(counts)
+    else:
+        with profiler.stage(name, **counts) as record:
+            yield record
+
+
+@contextlib.contextmanager
+def cprofile(stats_file=None, sort="cumulative", limit=30):
+    '''
+    run the block under cProfile
+    Args:
+        stats_file: optional file the pstats are dumped to, read it with pstats.Stats or snakeviz
+        sort, limit: the top limit functions by sort are printed when no stats_file is given
+    '''
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        if stats_file is not None:
+            profile.dump_stats(stats_file)
+        else:
+            pstats.Stats(profile).sort_stats(sort).print_stats(limit)
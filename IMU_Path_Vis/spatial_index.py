@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 21:00
+IDE: PyCharm
+Introduction: class PathIndex is a uniform grid over the ECEF path points. The points are sorted by grid cell once,
+              then nearest sample, radius and bounding box queries only look at the points of the few cells around
+              the query, so a 3D location maps back to an exact sample index even when the path trace is decimated.
+"""
+
+import numpy as np
+
+# mean number of path points per occupied grid cell
+POINTS_PER_CELL = 16
+# nearest queries look at most this many cells around the query cell before scanning all points
+NEAREST_MAX_RING = 4
+
+
+class PathIndex(object):
+    '''
+    uniform grid index of nx3 points
+    '''
+    def __init__(self, points, cell_size=None):
+        '''
+        Args:
+            points: nx3 (or wider, only the first 3 columns are used) numpy array of [x, y, z]
+            cell_size: edge length of a grid cell, None to choose it from the path length so that an occupied cell
+                holds about POINTS_PER_CELL points
+        '''
+        self.points = np.ascontiguousarray(points[:, 0:3], dtype=np.float64)
+        n = len(self.points)
+        if cell_size is None:
+            length = np.sum(np.linalg.norm(np.diff(self.points, axis=0), axis=1)) if n > 1 else 0.0
+            extent = np.ptp(self.points, axis=0).max() if n else 0.0
+            cell_size = max(length * POINTS_PER_CELL / max(n, 1), extent / 1e5, 1e-6)
+        self.cell_size = float(cell_size)
+        self.origin = self.points.min(axis=0) if n else np.zeros(3)
+        cells = self.__cell_of(self.points)
+        self.shape = cells.max(axis=0) + 1 if n else np.ones(3, dtype=np.int64)
+        ids = self.__cell_id(cells)
+        # the point indices sorted by cell, the points of occupied cell k are order[start[k]:start[k + 1]]
+        self.order = np.argsort(ids, kind="stable")
+        self.cell_ids, self.start = np.unique(ids[self.order], return_index=True)
+        self.start = np.append(self.start, n)
+        self.cell_coords = np.stack(np.unravel_index(self.cell_ids, tuple(self.shape)), axis=1) if n else \
+            np.zeros((0, 3), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, point):
+        '''
+        Args:
+            point: [x, y, z]
+        returns:
+            index, distance: the index of the nearest path point and its distance, (None, inf) if the index is empty
+        '''
+        point = np.asarray(point, dtype=np.float64)
+        if len(self.points) == 0:
+            return None, float("inf")
+        center = np.floor((point - self.origin) / self.cell_size).astype(np.int64)
+        for ring in range(NEAREST_MAX_RING + 1):
+            candidates = self.__points_in_cells(center - ring, center + ring)
+            if len(candidates) == 0:
+                continue
+            distance = np.linalg.norm(self.points[candidates] - point, axis=1)
+            best = np.argmin(distance)
+            # every point outside the cells of this ring is farther than ring cells away from the query
+            if distance[best] <= ring * self.cell_size + self.__inside_margin(point, center):
+                return int(candidates[best]), float(distance[best])
+        distance = np.linalg.norm(self.points - point, axis=1)
+        best = np.argmin(distance)
+        return int(best), float(distance[best])
+
+    def radius(self, point, r):
+        '''
+        Args:
+            point: [x, y, z]
+            r: search radius
+        returns:
+            sorted numpy array of the indices of the path points within r of point
+        '''
+        point = np.asarray(point, dtype=np.float64)
+        candidates = self.bbox(point - r, point + r)
+        distance = np.linalg.norm(self.points[candidates] - point, axis=1)
+        return candidates[distance <= r]
+
+    def bbox(self, lower, upper):
+        '''
+        Args:
+            lower: [x, y, z] lower corner of the box
+            upper: [x, y, z] upper corner of the box
+        returns:
+            sorted numpy array of the indices of the path points inside the box
+        '''
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        candidates = self.__points_in_cells(np.floor((lower - self.origin) / self.cell_size).astype(np.int64),
+                                            np.floor((upper - self.origin) / self.cell_size).astype(np.int64))
+        inside = np.all((self.points[candidates] >= lower) & (self.points[candidates] <= upper), axis=1)
+        return np.sort(candidates[inside])
+
+    def __cell_of(self, points):
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+
+    def __cell_id(self, cells):
+        return np.ravel_multi_index(tuple(cells.T), tuple(self.shape))
+
+    def __inside_margin(self, point, center):
+        # distance from the query to the faces of its own cell
+        local = (point - self.origin) / self.cell_size - center
+        return float(np.min(np.minimum(local, 1.0 - local))) * self.cell_size
+
+    def __points_in_cells(self, low, high):
+        '''
+        returns:
+            the indices of the points in the cells low..high (inclusive) of every axis
+        '''
+        low = np.maximum(low, 0)
+        high = np.minimum(high, self.shape - 1)
+        if np.any(high < low):
+            return np.zeros(0, dtype=np.int64)
+        if np.prod(high - low + 1) <= len(self.cell_ids):
+            # few cells, look them up
+            grid = np.stack(np.meshgrid(*[np.arange(low[k], high[k] + 1) for k in range(3)], indexing="ij"),
+                            axis=-1).reshape(-1, 3)
+            ids = self.__cell_id(grid)
+            found = np.minimum(np.searchsorted(self.cell_ids, ids), len(self.cell_ids) - 1)
+            occupied = found[self.cell_ids[found] == ids]
+        else:
+            # a large box, filter the occupied cells instead
+            occupied = np.nonzero(np.all((self.cell_coords >= low) & (self.cell_coords <= high), axis=1))[0]
+        if len(occupied) == 0:
+            return np.zeros(0, dtype=np.int64)
+        counts = self.start[occupied + 1] - self.start[occupied]
+        # concatenate the ranges order[start[k]:start[k + 1]] of the occupied cells
+        offsets = np.repeat(self.start[occupied] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.order[offsets]
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 01:40
+IDE: PyCharm
+Introduction: overlapped streaming export. The position and the euler file are parsed block by block by one thread
+              each, a compute thread converts every block pair to the gesture on path layout (ECEF, rotation, gesture
+              offset, see gesture_stream.py) and the writer writes the VTP pieces and the table of the block, the
+              stages are connected by bounded queues. While a block is written the next ones are parsed and
+              converted, so the wall time of the run approaches the slowest stage instead of the sum of the stages,
+              and the memory only depends on the block size and the queue length. .csv.gz / .csv.zst inputs are
+              decompressed on the fly by the parse threads, see csv_reader.open_csv.
+"""
+
+import contextlib
+import os
+import queue
+import threading
+import time
+import numpy as np
+from IMU_Path_Vis.csv_reader import ChunkedCsvReader, check_pos_header, check_euler_header, has_time_column, \
+    CHUNK_ROWS
+from IMU_Path_Vis.gesture_stream import gesture_on_path_block
+from IMU_Path_Vis.profiling import profile_stage
+from IMU_Path_Vis.table_writer import GESTURE_ON_PATH_COLUMNS, TableAppender
+from IMU_Path_Vis.vtp_partition import PieceWriter
+
+# blocks waiting between two stages, bounds the memory of the run
+QUEUE_BLOCKS = 4
+# the stages, their busy seconds are returned by StreamPipeline.run
+STAGES = ("parse_pos", "parse_euler", "compute", "write")
+# seconds a blocked stage waits before it checks whether another stage failed
+POLL_SECONDS = 0.1
+# end of a stream
+_END = object()
+
+
+def length_error():
+    return ValueError("could not generate the gesture data as the length of position file is not equal to euler "
+                      "file's")
+
+
+class PieceSink(object):
+    '''
+    writer stage sink of the VTP pieces of the path, the gesture triads or the gesture time steps
+    '''
+    def __init__(self, what_vtk, index_file, **writer_options):
+        self.writer = PieceWriter(what_vtk, index_file, **writer_options)
+
+    def append(self, block):
+        '''
+        Args:
+            block: nx21 gesture on path block
+        '''
+        if self.writer.what_vtk == "path":
+            self.writer.append(block[:, 0:3])
+        else:
+            self.writer.append(np.hstack([block[:, 0:3], block[:, 12:21]]))
+
+    def close(self):
+        return self.writer.close()
+
+
+class TableSink(object):
+    '''
+    writer stage sink of the gesture on path table, see table_writer.TableAppender
+    '''
+    def __init__(self, table_file, **options):
+        self.appender = TableAppender(table_file, GESTURE_ON_PATH_COLUMNS, **options)
+
+    def append(self, block):
+        self.appender.append(block)
+
+    def close(self):
+        return self.appender.close()
+
+
+class StreamPipeline(object):
+    '''
+    parse -> compute -> write pipeline of one position and euler file pair
+    '''
+    def __init__(self, pos_file, eul_file, num=10, chunk_rows=CHUNK_ROWS, queue_blocks=QUEUE_BLOCKS, profiler=None):
+        '''
+        Args:
+            pos_file: position CSV file without timestamps, see class Vis, may be .csv.gz or .csv.zst
+            eul_file: euler CSV file without timestamps, see class Vis, may be .csv.gz or .csv.zst
+            num: 单位向量轴上的坐标点扩大的倍数
+            chunk_rows: records per block
+            queue_blocks: blocks each queue holds at most
+            profiler: optional profiling.StageProfiler, every block of every stage is recorded as "stream_<stage>"
+                in the thread running it, the Chrome trace shows the overlap
+        '''
+        if queue_blocks < 1:
+            raise ValueError("queue_blocks must be at least 1, got %r" % queue_blocks)
+        self.pos_reader = ChunkedCsvReader(pos_file, chunk_rows)
+        if len(self.pos_reader.header) == 0:
+            raise Exception("position file is empty")
+        check_pos_header(self.pos_reader.header)
+        self.euler_reader = ChunkedCsvReader(eul_file, chunk_rows)
+        if len(self.euler_reader.header) == 0:
+            raise Exception("euler file is empty")
+        check_euler_header(self.euler_reader.header)
+        if has_time_column(self.pos_reader.header) or has_time_column(self.euler_reader.header):
+            raise ValueError("the streaming export pairs the records row by row, the timestamped files need the "
+                             "alignment of class Vis")
+        self.num = num
+        self.queue_blocks = queue_blocks
+        self.profiler = profiler
+        self.__stop = threading.Event()
+        self.__errors = []
+        self.__busy = {}
+
+    @contextlib.contextmanager
+    def __busy_stage(self, stage, **counts):
+        # the busy time of a stage, the waits on the queues are not part of it. The wall clock busy time includes
+        # the time the stage thread waited for a core, the CPU time of the thread does not
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        with profile_stage(self.profiler, "stream_" + stage, **counts) as record:
+            yield record
+        self.__busy[stage] += time.perf_counter() - start
+        self.__busy[stage + "_cpu"] += time.thread_time() - cpu_start
+
+    def __parse(self, stage, reader):
+        '''
+        yield the data blocks of the reader, the last 3 columns
+        '''
+        blocks = iter(reader)
+        while True:
+            with self.__busy_stage(stage) as record:
+                block = next(blocks, None)
+                record["rows"] = 0 if block is None else len(block)
+            if block is None:
+                return
+            yield block[:, -3:]
+
+    def __compute(self, pos_block, euler_block):
+        '''
+        returns:
+            the gesture on path block of the records with a valid LLA
+        '''
+        if pos_block is _END or euler_block is _END or len(pos_block) != len(euler_block):
+            raise length_error()
+        with self.__busy_stage("compute", rows=len(pos_block)):
+            block = gesture_on_path_block(pos_block, euler_block, self.num)
+            return block[block[:, 2] != 0]
+
+    def __write(self, sinks, block):
+        with self.__busy_stage("write", rows=len(block)):
+            for sink in sinks:
+                sink.append(block)
+
+    def __put(self, out_queue, item):
+        while not self.__stop.is_set():
+            try:
+                out_queue.put(item, timeout=POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __get(self, in_queue):
+        while not self.__stop.is_set():
+            try:
+                return in_queue.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                pass
+        return _END
+
+    def __thread(self, target, *args):
+        # a failed stage stops the others, the writer raises its error
+        def run():
+            try:
+                target(*args)
+            except BaseException as e:
+                self.__errors.append(e)
+                self.__stop.set()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def __producer(self, blocks, out_queue):
+        for block in blocks:
+            if not self.__put(out_queue, block):
+                return
+        self.__put(out_queue, _END)
+
+    def __converter(self, pos_queue, euler_queue, out_queue):
+        while True:
+            pos_block, euler_block = self.__get(pos_queue), self.__get(euler_queue)
+            if self.__stop.is_set():
+                return
+            if pos_block is _END and euler_block is _END:
+                self.__put(out_queue, _END)
+                return
+            if not self.__put(out_queue, self.__compute(pos_block, euler_block)):
+                return
+
+    def run(self, sinks, overlap=True):
+        '''
+        stream the records through the stages
+        Args:
+            sinks: objects with append(nx21 gesture on path block) and close() returning the bytes written, e.g.
+                PieceSink and TableSink, every sink is closed when the stream ended or failed
+            overlap: False runs the stages one after another in this thread, the former serial behaviour
+        returns:
+            timing: dict of the number of "records" written, "blocks", "bytes_read" (on disk), "bytes_written", the
+                busy seconds of each of STAGES, their CPU seconds "<stage>_cpu" and the "wall" seconds of the run
+        '''
+        self.__stop.clear()
+        self.__errors = []
+        self.__busy = {stage + suffix: 0.0 for stage in STAGES for suffix in ("", "_cpu")}
+        records = blocks = 0
+        start = time.perf_counter()
+        try:
+            pos_blocks = self.__parse("parse_pos", self.pos_reader)
+            euler_blocks = self.__parse("parse_euler", self.euler_reader)
+            if not overlap:
+                for pos_block in pos_blocks:
+                    block = self.__compute(pos_block, next(euler_blocks, _END))
+                    self.__write(sinks, block)
+                    records += len(block)
+                    blocks += 1
+                if next(euler_blocks, _END) is not _END:
+                    raise length_error()
+            else:
+                pos_queue, euler_queue, out_queue = [queue.Queue(self.queue_blocks) for _ in range(3)]
+                threads = [self.__thread(self.__producer, pos_blocks, pos_queue),
+                           self.__thread(self.__producer, euler_blocks, euler_queue),
+                           self.__thread(self.__converter, pos_queue, euler_queue, out_queue)]
+                try:
+                    while True:
+                        block = self.__get(out_queue)
+                        if block is _END:
+                            break
+                        self.__write(sinks, block)
+                        records += len(block)
+                        blocks += 1
+                except BaseException:
+                    self.__stop.set()
+                    raise
+                finally:
+                    for thread in threads:
+                        thread.join()
+                if self.__errors:
+                    raise self.__errors[0]
+        except BaseException:
+            # the sinks are closed on the error as well, the error of the stage is raised and not the one of a close
+            for sink in sinks:
+                try:
+                    sink.close()
+                except Exception:
+                    pass
+            raise
+        bytes_written = sum(sink.close() for sink in sinks)
+        timing = {"records": records, "blocks": blocks, "bytes_written": bytes_written,
+                  "bytes_read": self.pos_reader.file_size + self.euler_reader.file_size}
+        timing.update(self.__busy)
+        timing["wall"] = time.perf_counter() - start
+        return timing
+
+
+def stream_export(pos_file, eul_file, path_index=None, gesture_index=None, table_file=None, num=10,
+                  gesture_vtk="gesture", chunk_rows=CHUNK_ROWS, queue_blocks=QUEUE_BLOCKS, overlap=True,
+                  profiler=None, table_options=None, gesture_steps="record", **writer_options):
+    '''
+    export the VTP pieces and the table of one position and euler file pair through the overlapped pipeline, one
+    piece per block
+    Args:
+        pos_file, eul_file: the input CSV files, plain, .csv.gz or .csv.zst, see StreamPipeline
+        path_index: optional .pvtp index of the path pieces
+        gesture_index: optional .pvd (gesture) or .pvtp (gesture_triads) index of the gesture pieces
+        table_file: optional gesture on path table, see table_writer.TableAppender
+        num: 单位向量轴上的坐标点扩大的倍数
+        gesture_vtk: "gesture" or "gesture_triads", see vtp_partition.write_pieces
+        chunk_rows, queue_blocks, profiler: see StreamPipeline
+        overlap: see StreamPipeline.run
+        table_options: optional compression options of the table, see table_writer.write_table
+        gesture_steps: "record" or "piece", the time steps of the gesture .pvd, see vtp_partition.write_pieces
+        writer_options: see vtp_writer.write_path_vtp and write_gesture_triads_vtp
+    returns:
+        timing: see StreamPipeline.run
+    '''
+    pipeline = StreamPipeline(pos_file, eul_file, num=num, chunk_rows=chunk_rows, queue_blocks=queue_blocks,
+                              profiler=profiler)
+    sinks = []
+    if path_index is not None:
+        sinks.append(PieceSink("path", path_index, **writer_options))
+    if gesture_index is not None:
+        sinks.append(PieceSink(gesture_vtk, gesture_index, steps=gesture_steps, **writer_options))
+    if table_file is not None:
+        sinks.append(TableSink(table_file, **(table_options or {})))
+    if not sinks:
+        raise ValueError("nothing to export, give path_index, gesture_index or table_file")
+    timing = pipeline.run(sinks, overlap=overlap)
+    for file_name in (path_index, gesture_index, table_file):
+        if file_name is not None:
+            print("%s is generated!" % os.path.basename(file_name))
+    return timing
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 00:30
+IDE: PyCharm
+Introduction: tabular side output of class Vis, the ECEF path or the gesture on path table with named columns. The
+              format follows the file extension: .csv (np.savetxt, slow), .npy (structured array), .parquet and
+              .arrow/.feather (pyarrow) and .h5/.hdf5 (h5py, chunked and compressed). pyarrow and h5py are optional,
+              they are only imported for their formats. Class TableAppender writes the same files block by block.
+"""
+
+import os
+import struct
+import numpy as np
+
+PATH_COLUMNS = ["x", "y", "z"]
+# the columns of Vis.get_path_gesture_data
+GESTURE_ON_PATH_COLUMNS = PATH_COLUMNS + ["unit_%saxis_%s" % (axis, c) for axis in "xyz" for c in "xyz"] + \
+                          ["pos_%saxis_%s" % (axis, c) for axis in "xyz" for c in "xyz"]
+# file extension -> format
+TABLE_FORMATS = {".csv": "csv", ".npy": "npy", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow",
+                 ".h5": "hdf5", ".hdf5": "hdf5"}
+# the dataset of the HDF5 file, rows per HDF5 chunk
+HDF5_DATASET = "table"
+HDF5_CHUNK_ROWS = 1 << 16
+# bytes reserved for the header of a .npy written block by block, it is rewritten with the final shape on close
+NPY_HEADER_BYTES = 4096
+
+
+def table_format(file_name):
+    '''
+    returns:
+        the format of TABLE_FORMATS matching the file extension
+    '''
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in TABLE_FORMATS:
+        raise ValueError("unknown table format %r, use one of %s" % (extension, ", ".join(sorted(TABLE_FORMATS))))
+    return TABLE_FORMATS[extension]
+
+
+def structured(data, columns):
+    '''
+    the rows of a nxm float array as a structured array with one named field per column, a view if data is
+    C-contiguous
+    '''
+    data = np.ascontiguousarray(data)
+    if data.ndim != 2 or data.shape[1] != len(columns):
+        raise ValueError("data must be a nx%d array, got shape %s" % (len(columns), data.shape))
+    return data.view(np.dtype([(column, data.dtype) for column in columns])).reshape(-1)
+
+
+def write_table(data, file_name, columns, compression=None, compression_level=None):
+    '''
+    write a nxm float array with named columns
+    Args:
+        data: nxm numpy array
+        file_name: the table file, its extension selects the format, see TABLE_FORMATS
+        columns: the m column names
+        compression: parquet "snappy" (default), "zstd", "gzip", ..., arrow "lz4" (default), "zstd" or
+            "uncompressed", hdf5 "gzip" (default), "lzf" or "none"; ignored by csv and npy
+        compression_level: optional level of the compression
+    returns:
+        the number of bytes written
+    '''
+    fmt = table_format(file_name)
+    if fmt == "csv":
+        np.savetxt(file_name, data, delimiter=',', header=", ".join(columns), comments='')
+    elif fmt == "npy":
+        np.save(file_name, structured(data, columns))
+    elif fmt in ("parquet", "arrow"):
+        pyarrow = import_format(fmt, file_name)
+        if data.ndim != 2 or data.shape[1] != len(columns):
+            raise ValueError("data must be a nx%d array, got shape %s" % (len(columns), data.shape))
+        table = pyarrow.Table.from_arrays([pyarrow.array(np.ascontiguousarray(data[:, i]))
+                                           for i in range(len(columns))], names=list(columns))
+        if fmt == "parquet":
+            import pyarrow.parquet
+            pyarrow.parquet.write_table(table, file_name, compression=compression or "snappy",
+                                        compression_level=compression_level)
+        else:
+            import pyarrow.feather
+            pyarrow.feather.write_feather(table, file_name, compression=compression,
+                                          compression_level=compression_level)
+    else:
+        h5py = import_format(fmt, file_name)
+        rows = structured(data, columns)
+        compression = compression or "gzip"
+        options = {}
+        if compression != "none":
+            # shuffle groups the bytes of the floats, they compress much better
+            options = dict(compression=compression, compression_opts=compression_level, shuffle=True)
+        with h5py.File(file_name, "w") as f:
+            f.create_dataset(HDF5_DATASET, data=rows, chunks=(max(1, min(len(rows), HDF5_CHUNK_ROWS)),), **options)
+    return os.path.getsize(file_name)
+
+
+def import_format(fmt, file_name):
+    '''
+    import the optional library of a format
+    returns:
+        the pyarrow or h5py module, None for csv and npy
+    '''
+    if fmt in ("parquet", "arrow"):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("writing %s needs pyarrow, pip install pyarrow" % file_name)
+        return pyarrow
+    if fmt == "hdf5":
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("writing %s needs h5py, pip install h5py" % file_name)
+        return h5py
+    return None
+
+
+class TableAppender(object):
+    '''
+    write a table with named columns block by block, the file is the same as write_table writes for the
+    concatenated blocks: a .csv is appended to, a .npy gets its final shape on close, .parquet gets one row group
+    and .arrow one record batch per block, the .h5 dataset is resized
+    '''
+    def __init__(self, file_name, columns, compression=None, compression_level=None):
+        '''
+        Args:
+            file_name, columns, compression, compression_level: see write_table
+        '''
+        self.file_name = file_name
+        self.columns = list(columns)
+        self.format = table_format(file_name)
+        self.rows = 0
+        self.__lib = import_format(self.format, file_name)
+        self.__file = None
+        self.__writer = None
+        if self.format == "csv":
+            self.__file = open(file_name, "w")
+            self.__file.write(", ".join(self.columns) + "\n")
+        elif self.format == "npy":
+            self.__file = open(file_name, "wb")
+            self.__file.write(self.__npy_header())
+        elif self.format == "parquet":
+            import pyarrow.parquet
+            self.__writer = pyarrow.parquet.ParquetWriter(file_name, self.__schema(),
+                                                          compression=compression or "snappy",
+                                                          compression_level=compression_level)
+        elif self.format == "arrow":
+            import pyarrow.ipc
+            # the defaults of pyarrow.feather.write_feather
+            compression = compression or ("lz4" if self.__lib.Codec.is_available("lz4") else None)
+            if compression == "uncompressed":
+                compression = None
+            if compression is not None:
+                compression = self.__lib.Codec(compression, compression_level)
+            self.__writer = pyarrow.ipc.new_file(file_name, self.__schema(),
+                                                 options=pyarrow.ipc.IpcWriteOptions(compression=compression))
+        else:
+            compression = compression or "gzip"
+            self.__hdf5_options = {}
+            if compression != "none":
+                self.__hdf5_options = dict(compression=compression, compression_opts=compression_level, shuffle=True)
+            self.__file = self.__lib.File(file_name, "w")
+
+    def __dtype(self):
+        return np.dtype([(column, np.float64) for column in self.columns])
+
+    def __schema(self):
+        return self.__lib.schema([(column, self.__lib.float64()) for column in self.columns])
+
+    def __npy_header(self):
+        '''
+        the .npy header of the rows written so far padded to NPY_HEADER_BYTES, so rewriting it keeps the data offset
+        '''
+        header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % \
+                 (np.lib.format.dtype_to_descr(self.__dtype()), self.rows)
+        magic = np.lib.format.magic(1, 0)
+        padding = NPY_HEADER_BYTES - len(magic) - 2 - len(header) - 1
+        if padding < 0:
+            raise ValueError("too many columns for a .npy written block by block: %d" % len(self.columns))
+        return magic + struct.pack("<H", len(header) + padding + 1) + (header + " " * padding + "\n").encode("latin1")
+
+    def append(self, data):
+        '''
+        write the next rows
+        Args:
+            data: nxm numpy array, m is the number of columns
+        '''
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != len(self.columns):
+            raise ValueError("data must be a nx%d array, got shape %s" % (len(self.columns), data.shape))
+        if self.format == "csv":
+            np.savetxt(self.__file, data, delimiter=',')
+        elif self.format == "npy":
+            self.__file.write(data.tobytes())
+        elif self.format in ("parquet", "arrow"):
+            self.__writer.write_table(self.__lib.Table.from_arrays([self.__lib.array(np.ascontiguousarray(data[:, i]))
+                                                                    for i in range(len(self.columns))],
+                                                                   schema=self.__schema()))
+        else:
+            if self.__writer is None:
+                # a chunk smaller than a block would be compressed again by every append
+                self.__writer = self.__file.create_dataset(HDF5_DATASET, shape=(0,), maxshape=(None,),
+                                                           dtype=self.__dtype(),
+                                                           chunks=(max(1, min(len(data), HDF5_CHUNK_ROWS)),),
+                                                           **self.__hdf5_options)
+            self.__writer.resize((self.rows + len(data),))
+            self.__writer[self.rows:] = structured(data, self.columns)
+        self.rows += len(data)
+
+    def close(self):
+        '''
+        finish the file
+        returns:
+            the number of bytes written
+        '''
+        if self.format == "npy" and self.__file is not None and not self.__file.closed:
+            self.__file.seek(0)
+            self.__file.write(self.__npy_header())
+        if self.format == "hdf5" and self.__writer is None and self.__file:
+            self.__file.create_dataset(HDF5_DATASET, shape=(0,), maxshape=(None,), dtype=self.__dtype(), chunks=(1,))
+        if self.format in ("parquet", "arrow") and self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+        if self.__file is not None:
+            self.__file.close()
+        return os.path.getsize(self.file_name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -7,18 +7,118 @@ IDE: PyCharm
 Introduction: call class Vis by using input files position and euler to generate path data and gesture data
               and generate VTP files of them for paraview.
 """
+import argparse
+import contextlib
+import logging
+import os
+import time
 from IMU_Path_Vis import IMU_Vis
-
-if __name__ == "__main__":
-    pos_file = "input_file\\pos-algo0_0_hig.csv"
-    eul_file = "input_file\\att_euler-algo0_0.csv"
-    Vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file)
-    Vis.gen_gesture_on_path(num=10)
-    data = Vis.get_path_gesture_data()
-    Vis.gen_vtk_for_path_gesture("path", "output_file\\point_data.vtp")
-    Vis.gen_vtk_for_path_gesture("gesture", "output_file\\gesture_data.vtp")
-
+from IMU_Path_Vis.cache import ArrayCache
+from IMU_Path_Vis.csv_reader import CHUNK_ROWS
+from IMU_Path_Vis.profiling import StageProfiler, cprofile
+from IMU_Path_Vis.stream_pipeline import STAGES, stream_export
+from IMU_Path_Vis.vtp_partition import PIECE_ROWS, INDEX_EXTENSIONS, STEPS
 
 
+def export_vtp(pos_file, eul_file, path_vtp, gesture_vtp, num=10, gesture_vtk="gesture", cache=None, frame="ecef",
+               profiler=None, workers=1, table_file=None, piece_rows=None, window=None, piece_workers=None,
+               piece_steps="record"):
+    '''
+    generate the path and gesture VTP files of one position and euler file pair
+    Args:
+        pos_file: position CSV file, see class Vis
+        eul_file: euler CSV file, see class Vis
+        path_vtp: the path VTP file to write
+        gesture_vtp: the gesture VTP file to write
+        num: 单位向量轴上的坐标点扩大的倍数
+        gesture_vtk: "gesture" for a time series file or "gesture_triads" for a single PolyData
+        cache: optional ArrayCache
+        frame: "ecef" or "enu" for float32 east/north/up coordinates around the first valid fix
+        profiler: optional profiling.StageProfiler recording every stage of the run
+        workers: number of threads of the row-wise conversions, None for all cores, see parallel.py
+        table_file: optional file the gesture on path table is written to, e.g. .npy or .parquet, see Vis.write_table
+        piece_rows, window: write VTP pieces of piece_rows records or window seconds in parallel and a .pvtp / .pvd
+            index next to path_vtp and gesture_vtp instead of single files, see Vis.gen_vtk_pieces
+        piece_workers: worker processes writing the pieces, None for the number of CPUs
+        piece_steps: "record" for one time step per record in the gesture .pvd, "piece" for one per piece
+    returns:
+        timing: dict of the number of records and the seconds spent in each step
+    '''
+    timing = {}
+    start = time.perf_counter()
+    Vis = IMU_Vis.Vis(pos_file=pos_file, eul_file=eul_file, cache=cache, profiler=profiler,
+                      workers=workers)
+    Vis.gen_gesture_on_path(num=num)
+    timing["records"] = len(Vis.pos_data)
+    timing["convert"] = time.perf_counter() - start
+    start = time.perf_counter()
+    if piece_rows is None and window is None:
+        Vis.gen_vtk_for_path_gesture("path", path_vtp, frame=frame)
+    else:
+        Vis.gen_vtk_pieces("path", os.path.splitext(path_vtp)[0] + ".pvtp", piece_rows=piece_rows or PIECE_ROWS,
+                           window=window, workers=piece_workers, frame=frame)
+    timing["path"] = time.perf_counter() - start
+    start = time.perf_counter()
+    if piece_rows is None and window is None:
+        Vis.gen_vtk_for_path_gesture(gesture_vtk, gesture_vtp, frame=frame)
+    else:
+        Vis.gen_vtk_pieces(gesture_vtk, os.path.splitext(gesture_vtp)[0] + INDEX_EXTENSIONS[gesture_vtk],
+                           piece_rows=piece_rows or PIECE_ROWS, window=window, workers=piece_workers, frame=frame,
+                           steps=piece_steps)
+    timing["gesture"] = time.perf_counter() - start
+    timing["total"] = timing["convert"] + timing["path"] + timing["gesture"]
+    if table_file is not None:
+        start = time.perf_counter()
+        Vis.write_table(table_file)
+        timing["table"] = time.perf_counter() - start
+        timing["total"] += timing["table"]
+    return timing
 
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="generate the path and gesture VTP files")
+    parser.add_argument("--profile", action="store_true", help="log the time, rows and bytes of every stage")
+    parser.add_argument("--trace", help="write the stages as a Chrome trace file, e.g. trace.json")
+    parser.add_argument("--cprofile", help="dump the cProfile stats of the run, e.g. vis_main.prof")
+    parser.add_argument("--table", help="write the gesture on path table, e.g. output_file/gesture_on_path.npy "
+                                        "(.csv, .npy, .parquet, .arrow, .h5)")
+    parser.add_argument("--piece-rows", type=int, default=None,
+                        help="write VTP pieces of this many records in parallel and a .pvtp / .pvd index")
+    parser.add_argument("--window", type=float, default=None, help="VTP pieces of this many seconds instead")
+    parser.add_argument("--piece-workers", type=int, default=None, help="processes writing the VTP pieces")
+    parser.add_argument("--piece-steps", choices=STEPS, default="record",
+                        help="time steps of the gesture .pvd, one per record or one per piece")
+    parser.add_argument("--workers", type=int, default=None, help="threads of the conversions, all cores by default")
+    parser.add_argument("--stream", action="store_true",
+                        help="overlap parsing, conversion and writing block by block, writes one VTP piece per block "
+                             "of --piece-rows records and a .pvtp / .pvd index")
+    parser.add_argument("--pos", default=os.path.join("input_file", "pos-algo0_0_hig.csv"),
+                        help="position file, .csv, .csv.gz or .csv.zst")
+    parser.add_argument("--eul", default=os.path.join("input_file", "att_euler-algo0_0.csv"),
+                        help="euler file, .csv, .csv.gz or .csv.zst")
+    args = parser.parse_args()
+    profiler = None
+    if args.profile or args.trace:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        profiler = StageProfiler(logger=logging.getLogger("IMU_Path_Vis") if args.profile else None)
+    if args.stream and args.window is not None:
+        parser.error("--stream writes pieces of --piece-rows records, it can not cut time windows")
+    with cprofile(args.cprofile) if args.cprofile else contextlib.nullcontext():
+        if args.stream:
+            timing = stream_export(args.pos, args.eul, os.path.join("output_file", "point_data.pvtp"),
+                                   os.path.join("output_file", "gesture_data.pvd"), table_file=args.table, num=10,
+                                   chunk_rows=args.piece_rows or CHUNK_ROWS, profiler=profiler,
+                                   gesture_steps=args.piece_steps)
+            print("%d records in %.3f s, busy: %s" % (timing["records"], timing["wall"],
+                                                      ", ".join("%s %.3f s" % (stage, timing[stage])
+                                                                for stage in STAGES)))
+        else:
+            export_vtp(args.pos, args.eul, os.path.join("output_file", "point_data.vtp"),
+                       os.path.join("output_file", "gesture_data.vtp"), num=10, cache=ArrayCache("cache"),
+                       profiler=profiler, workers=args.workers, table_file=args.table,
+                       piece_rows=args.piece_rows, window=args.window, piece_workers=args.piece_workers,
+                       piece_steps=args.piece_steps)
+    if profiler is not None:
+        print(profiler.report())
+        if args.trace:
+            profiler.write_chrome_trace(args.trace)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 19:10
+IDE: PyCharm
+Introduction: tail mode of class Vis for live IMU logs. Class VisTail follows the position and euler CSV files while
+              the logger keeps appending to them; every update parses only the new rows, converts only them and
+              appends the result to growable buffers, so the cost of an update is proportional to the new rows.
+              The path and gesture axis ends are also kept as float32 east/north/up coordinates for plotting.
+"""
+
+import numpy as np
+from IMU_Path_Vis.geo_transform import D2R, ecef2enu_batch
+from IMU_Path_Vis.csv_reader import CsvTail, check_pos_header, check_euler_header
+from IMU_Path_Vis.gesture_stream import gesture_on_path_block
+from IMU_Path_Vis.growable import GrowableArray
+
+
+class VisTail(object):
+    '''
+    follow a position and euler file pair and keep the gesture on path data up to date
+    '''
+    def __init__(self, pos_file, eul_file, num, enu_origin=None, enu_dtype=np.float32):
+        '''
+        Args:
+            pos_file: position CSV file, see class Vis
+            eul_file: euler CSV file, see class Vis
+            num: 单位向量轴上的坐标点扩大的倍数
+            enu_origin: origin [lat, lon, alt], [deg, deg, m] of the east/north/up coordinates, None for the first
+                valid position fix
+            enu_dtype: dtype of the east/north/up coordinates
+        '''
+        self.pos_file = pos_file
+        self.eul_file = eul_file
+        self.num = num
+        self.__pos_tail = CsvTail(pos_file)
+        self.__euler_tail = CsvTail(eul_file)
+        # every parsed record, the two files are not always appended to at the same time
+        self.__pos_data = GrowableArray(3)
+        self.__euler_data = GrowableArray(3)
+        # number of records present in both files and converted
+        self.records = 0
+        self.__path_gesture = GrowableArray(21)
+        self.enu_origin = None if enu_origin is None else [float(v) for v in enu_origin]
+        self.__path_gesture_enu = GrowableArray(12, dtype=enu_dtype)
+
+    @property
+    def pos_data(self):
+        return self.__pos_data.data
+
+    @property
+    def euler_data(self):
+        return self.__euler_data.data
+
+    @property
+    def path_gesture_data(self):
+        '''
+        the gesture on path data converted so far, nx21 numpy array with the layout of Vis.get_path_gesture_data,
+        records with the LLA is 0 are deleted. The view is only valid until the next update.
+        '''
+        return self.__path_gesture.data
+
+    @property
+    def path_gesture_enu(self):
+        '''
+        the path and gesture axis ends of path_gesture_data in east/north/up coordinates, nx12 numpy array with the
+        layout of Vis.get_path_gesture_enu. The view is only valid until the next update.
+        '''
+        return self.__path_gesture_enu.data
+
+    def update(self):
+        '''
+        parse the rows appended to both files since the last update and convert the records present in both
+        returns:
+            the new gesture on path rows, mx21 numpy array view, see path_gesture_data
+        '''
+        self.__read(self.__pos_tail, self.__pos_data, check_pos_header)
+        self.__read(self.__euler_tail, self.__euler_data, check_euler_header)
+        start = self.records
+        end = min(len(self.__pos_data), len(self.__euler_data))
+        if end <= start:
+            return self.__path_gesture.data[len(self.__path_gesture):]
+        block = gesture_on_path_block(self.__pos_data.data[start:end], self.__euler_data.data[start:end], self.num)
+        self.records = end
+        valid = block[:, 2] != 0
+        if self.enu_origin is None and np.any(valid):
+            self.enu_origin = [float(v) for v in self.__pos_data.data[start:end][valid][0]]
+        new_rows = self.__path_gesture.append(block[valid])
+        if len(new_rows):
+            lat, lon, alt = self.enu_origin
+            # columns 0:3 path, 12:21 the x, y and z axis ends
+            points = new_rows[:, [0, 1, 2] + list(range(12, 21))].reshape(-1, 3)
+            self.__path_gesture_enu.append(ecef2enu_batch(points, [lat * D2R, lon * D2R, alt],
+                                                          dtype=self.__path_gesture_enu.data.dtype).reshape(-1, 12))
+        return new_rows
+
+    def __read(self, tail, data, check_header):
+        had_header = len(tail.header) > 0
+        rows = tail.read_new()
+        if not had_header and len(tail.header) > 0:
+            check_header(tail.header)
+        if len(rows):
+            data.append(rows[:, -3:])
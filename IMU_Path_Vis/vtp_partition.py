@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 00:50
+IDE: PyCharm
+Introduction: partitioned VTK export for very long logs. The records are split into pieces of a fixed number of
+              records or of a time window, every piece is written as its own VTP file by a pool of worker processes
+              and a collection index ties them together: a .pvtp (the pieces of one PolyData, ParaView reads them
+              lazily) for the path and the gesture triads, a .pvd for the gesture, so ParaView only reads the piece
+              of the selected time step. The .pvd keeps one time step per record as the single gesture file, the
+              step shows the piece of the record, whose "index" and "time" point arrays tell the records apart;
+              steps="piece" writes one time step per piece instead. Class PieceWriter writes the pieces of a stream
+              of blocks as they arrive, see stream_pipeline.py.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import quoteattr
+import numpy as np
+
+# records per piece
+PIECE_ROWS = 1 << 16
+# the index file of each kind of export
+INDEX_EXTENSIONS = {"path": ".pvtp", "gesture_triads": ".pvtp", "gesture": ".pvd"}
+# the time steps of the gesture .pvd, one per record or one per piece at its first record
+STEPS = ("record", "piece")
+
+
+def partition(n, piece_rows=PIECE_ROWS, times=None, window=None):
+    '''
+    split n records into pieces
+    Args:
+        n: number of records
+        piece_rows: records per piece, used without a window
+        times: n numpy array of the record times in s, needed by window
+        window: optional length of the pieces in s, the pieces then start at times[0] + k * window
+    returns:
+        list of (start, stop) of the pieces, an empty time window gives no piece
+    '''
+    if window is not None:
+        if times is None:
+            raise ValueError("pieces of a time window need the timestamps, add the 'time (s)' column to both files")
+        if window <= 0:
+            raise ValueError("window must be positive, got %r" % window)
+        times = np.asarray(times)
+        if n == 0:
+            return []
+        windows = np.floor((times - times[0]) / window)
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(windows)) + 1, [n]])
+    else:
+        if piece_rows < 1:
+            raise ValueError("piece_rows must be at least 1, got %r" % piece_rows)
+        bounds = list(range(0, n, int(piece_rows))) + [n]
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def write_piece(what_vtk, data, piece_file, index_offset=0, times=None, writer_options=None):
+    '''
+    process pool job, write one piece
+    returns:
+        the number of bytes written
+    '''
+    # vtk takes about a second to import, only the workers need it
+    from IMU_Path_Vis.vtp_writer import write_path_vtp, write_gesture_triads_vtp
+    if what_vtk == "path":
+        write_path_vtp(data, piece_file, **(writer_options or {}))
+    else:
+        write_gesture_triads_vtp(data, piece_file, times=times, index_offset=index_offset, **(writer_options or {}))
+    return os.path.getsize(piece_file)
+
+
+def piece_file_name(index_file, i):
+    '''
+    returns:
+        the file of piece i of the index file, <stem>_pieces/<stem>_<i>.vtp
+    '''
+    stem = os.path.splitext(index_file)[0]
+    return os.path.join(stem + "_pieces", "%s_%05d.vtp" % (os.path.basename(stem), i))
+
+
+def piece_arrays(piece_file):
+    '''
+    the attributes of the VTKFile element and the arrays of the point data, cell data and points of a piece
+    returns:
+        VTKFile attribute string, dict section -> (section attribute string, list of (type, name, components))
+    '''
+    with open(piece_file, "rb") as f:
+        header = f.read(1 << 16).decode("latin-1")
+    header = header.split("<AppendedData")[0]
+    vtk_file = re.search(r"<VTKFile([^>]*)>", header).group(1)
+    sections = {}
+    for section in ("PointData", "CellData", "Points"):
+        match = re.search(r"<%s([^>]*)>(.*?)</%s>" % (section, section), header, re.S)
+        arrays = []
+        if match is not None:
+            for attributes in re.findall(r"<DataArray([^>]*)>", match.group(2)):
+                values = dict(re.findall(r'(\w+)="([^"]*)"', attributes))
+                arrays.append((values["type"], values.get("Name", ""), values.get("NumberOfComponents", "1")))
+        sections[section] = (match.group(1) if match is not None else "", arrays)
+    return vtk_file, sections
+
+
+def write_pvtp(index_file, piece_files):
+    '''
+    write the .pvtp index of the VTP pieces, the arrays are declared as in the first piece
+    '''
+    vtk_file, sections = piece_arrays(piece_files[0])
+    vtk_file = re.sub(r'\s+(type|compressor)="[^"]*"', "", vtk_file)
+    lines = ['<?xml version="1.0"?>', '<VTKFile type="PPolyData"%s>' % vtk_file, '  <PPolyData GhostLevel="0">']
+    for section in ("PointData", "CellData", "Points"):
+        attributes, arrays = sections[section]
+        lines.append("    <P%s%s>" % (section, attributes.rstrip()))
+        for data_type, name, components in arrays:
+            lines.append('      <PDataArray type=%s Name=%s NumberOfComponents=%s/>' %
+                         (quoteattr(data_type), quoteattr(name), quoteattr(components)))
+        lines.append("    </P%s>" % section)
+    base = os.path.dirname(os.path.abspath(index_file))
+    for piece_file in piece_files:
+        lines.append("    <Piece Source=%s/>" % quoteattr(os.path.relpath(piece_file, base).replace(os.sep, "/")))
+    lines += ["  </PPolyData>", "</VTKFile>"]
+    with open(index_file, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def piece_timesteps(start, stop, times=None, steps="record"):
+    '''
+    the time steps of the piece of the records start..stop in the .pvd
+    Args:
+        start, stop: the records of the piece
+        times: optional stop - start numpy array of the record times of the piece in s, None for the record index
+        steps: "record" for one time step per record, "piece" for one at the first record of the piece
+    returns:
+        numpy array of the time steps
+    '''
+    if times is None:
+        timesteps = np.arange(start, stop, dtype=np.float64)
+    else:
+        timesteps = np.asarray(times, dtype=np.float64)
+    return timesteps[:1] if steps == "piece" else timesteps
+
+
+def write_pvd(index_file, piece_files, timesteps):
+    '''
+    write the .pvd collection of the VTP pieces
+    Args:
+        index_file: the .pvd file
+        piece_files: the piece files
+        timesteps: the time steps of every piece, see piece_timesteps, each one shows the whole piece
+    '''
+    base = os.path.dirname(os.path.abspath(index_file))
+    with open(index_file, "w") as f:
+        f.write('<?xml version="1.0"?>\n<VTKFile type="Collection" version="0.1">\n  <Collection>\n')
+        for piece_file, piece_steps in zip(piece_files, timesteps):
+            tail = ' part="0" file=%s/>\n' % quoteattr(os.path.relpath(piece_file, base).replace(os.sep, "/"))
+            f.writelines('    <DataSet timestep="%r"%s' % (timestep, tail) for timestep in piece_steps.tolist())
+        f.write("  </Collection>\n</VTKFile>\n")
+
+
+def write_index(what_vtk, index_file, piece_files, timesteps):
+    '''
+    write the .pvd (gesture, timesteps see write_pvd) or .pvtp index of the pieces
+    '''
+    if what_vtk == "gesture":
+        write_pvd(index_file, piece_files, timesteps)
+    else:
+        write_pvtp(index_file, piece_files)
+
+
+def write_pieces(what_vtk, data, index_file, piece_rows=PIECE_ROWS, times=None, window=None, workers=None,
+                 steps="record", **writer_options):
+    '''
+    write the path or the gestures as VTP pieces in parallel and their collection index
+    Args:
+        what_vtk: "path" (.pvtp, consecutive pieces share one record so the line is not broken), "gesture_triads"
+            (.pvtp) or "gesture" (.pvd of the triads, see steps)
+        data: nx3 path or nx12 gesture numpy array
+        index_file: the .pvtp or .pvd index, the pieces are written to the directory <index_file>_pieces
+        piece_rows, window: the pieces, see partition
+        times: optional n numpy array of the record times in s, stored as the point data array "time" of the
+            gestures and used for the time steps and windows; without it the time step is the record index
+        workers: worker processes, None for the number of CPUs, 1 writes in this process
+        steps: the time steps of the gesture .pvd, "record" for one per record as the single gesture file, "piece"
+            for one per piece at its first record
+        writer_options: see vtp_writer.write_path_vtp and write_gesture_triads_vtp
+    returns:
+        dict of the number of "pieces", "bytes" written and "seconds"
+    '''
+    if what_vtk not in INDEX_EXTENSIONS:
+        raise TypeError('please type the correct type vtk file, path, gesture or gesture_triads')
+    if steps not in STEPS:
+        raise ValueError("steps must be one of %s, got %r" % (list(STEPS), steps))
+    start_time = time.perf_counter()
+    pieces = partition(len(data), piece_rows, times, window)
+    if not pieces:
+        raise Exception("no data, no %s pieces generated" % what_vtk)
+    os.makedirs(os.path.splitext(index_file)[0] + "_pieces", exist_ok=True)
+    jobs = []
+    for i, (start, stop) in enumerate(pieces):
+        piece_file = piece_file_name(index_file, i)
+        if what_vtk == "path":
+            jobs.append(("path", data[start:min(stop + 1, len(data))], piece_file, start, None, writer_options))
+        else:
+            jobs.append(("gesture_triads", data[start:stop], piece_file, start,
+                         None if times is None else times[start:stop], writer_options))
+    if workers == 1 or len(jobs) == 1:
+        sizes = [write_piece(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sizes = [future.result() for future in [executor.submit(write_piece, *job) for job in jobs]]
+    piece_files = [job[2] for job in jobs]
+    write_index(what_vtk, index_file, piece_files,
+                [piece_timesteps(start, stop, None if times is None else times[start:stop], steps)
+                 for start, stop in pieces])
+    return {"pieces": len(pieces), "bytes": sum(sizes) + os.path.getsize(index_file),
+            "seconds": time.perf_counter() - start_time}
+
+
+class PieceWriter(object):
+    '''
+    write the path or the gestures of a stream of blocks, one VTP piece per block as it arrives, and the collection
+    index on close. The files are the ones write_pieces writes with one piece per block.
+    '''
+    def __init__(self, what_vtk, index_file, steps="record", **writer_options):
+        '''
+        Args:
+            what_vtk, index_file, steps, writer_options: see write_pieces
+        '''
+        if what_vtk not in INDEX_EXTENSIONS:
+            raise TypeError('please type the correct type vtk file, path, gesture or gesture_triads')
+        if steps not in STEPS:
+            raise ValueError("steps must be one of %s, got %r" % (list(STEPS), steps))
+        self.what_vtk = what_vtk
+        self.index_file = index_file
+        self.steps = steps
+        self.writer_options = writer_options
+        self.piece_files = []
+        self.timesteps = []
+        self.rows = 0
+        self.bytes_written = 0
+        # the last record of the path, the next piece starts with it so the line is not broken
+        self.__last = None
+        # vtk takes about a second to import, not while the first block is written
+        import IMU_Path_Vis.vtp_writer
+        os.makedirs(os.path.splitext(index_file)[0] + "_pieces", exist_ok=True)
+
+    def append(self, data, times=None):
+        '''
+        write the next records as one piece, an empty block writes nothing
+        Args:
+            data: nx3 path (or wider, only the first 3 columns are used) or nx12 gesture numpy array
+            times: optional n numpy array of the record times in s, see write_pieces
+        '''
+        if len(data) == 0:
+            return
+        piece_file = piece_file_name(self.index_file, len(self.piece_files))
+        if self.what_vtk == "path":
+            path = data[:, 0:3] if self.__last is None else np.concatenate([self.__last, data[:, 0:3]])
+            self.bytes_written += write_piece("path", path, piece_file, writer_options=self.writer_options)
+            self.__last = data[-1:, 0:3].copy()
+        else:
+            self.bytes_written += write_piece("gesture_triads", data, piece_file, self.rows, times,
+                                              self.writer_options)
+        self.piece_files.append(piece_file)
+        self.timesteps.append(piece_timesteps(self.rows, self.rows + len(data), times, self.steps))
+        self.rows += len(data)
+
+    def close(self):
+        '''
+        write the index
+        returns:
+            the number of bytes written, pieces and index
+        '''
+        if not self.piece_files:
+            raise Exception("no data, no %s pieces generated" % self.what_vtk)
+        write_index(self.what_vtk, self.index_file, self.piece_files, self.timesteps)
+        return self.bytes_written + os.path.getsize(self.index_file)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-17 14:30
+IDE: PyCharm
+Introduction: VTP writers for paraview which hand the numpy buffers of class Vis to VTK in bulk instead of pushing
+              them point by point.
+"""
+
+import numpy as np
+import vtk
+from vtk.util import numpy_support
+
+COMPRESSORS = {
+    None: None,            # keep the writer default (zlib)
+    "none": "SetCompressorTypeToNone",
+    "zlib": "SetCompressorTypeToZLib",
+    "lz4": "SetCompressorTypeToLZ4",
+    "lzma": "SetCompressorTypeToLZMA",
+}
+DATA_MODES = {
+    None: None,            # keep the writer default (appended)
+    "ascii": "SetDataModeToAscii",
+    "binary": "SetDataModeToBinary",
+    "appended": "SetDataModeToAppended",
+}
+
+
+def configure_writer(writer, compressor=None, data_mode=None, encode_appended=None):
+    '''
+    set the compression and encoding of a vtkXMLWriter
+    Args:
+        writer: vtkXMLWriter, e.g. vtkXMLPolyDataWriter
+        compressor: None (writer default, zlib), "none", "zlib", "lz4" or "lzma"
+        data_mode: None (writer default, appended), "ascii", "binary" or "appended"
+        encode_appended: None (writer default, base64), False writes the appended data as raw binary
+    '''
+    if compressor not in COMPRESSORS:
+        raise ValueError("compressor must be one of %s" % [k for k in COMPRESSORS if k is not None])
+    if data_mode not in DATA_MODES:
+        raise ValueError("data_mode must be one of %s" % [k for k in DATA_MODES if k is not None])
+    if COMPRESSORS[compressor] is not None:
+        getattr(writer, COMPRESSORS[compressor])()
+    if DATA_MODES[data_mode] is not None:
+        getattr(writer, DATA_MODES[data_mode])()
+    if encode_appended is not None:
+        writer.SetEncodeAppendedData(1 if encode_appended else 0)
+    return writer
+
+
+def points_from_array(xyz, dtype=None):
+    '''
+    wrap a nx3 numpy array as vtkPoints, without a copy when it is already C-contiguous of the requested dtype
+    Args:
+        xyz: nx3 numpy array
+        dtype: np.float32 or np.float64, None keeps the dtype of xyz
+    returns:
+        points: vtkPoints, it keeps a reference to the numpy buffer
+    '''
+    xyz = np.ascontiguousarray(xyz, dtype=dtype)
+    points = vtk.vtkPoints()
+    points.SetData(numpy_support.numpy_to_vtk(xyz, deep=False))
+    return points
+
+
+def id_array(ids):
+    '''
+    wrap an integer numpy array as vtkIdTypeArray without a copy
+    '''
+    id_dtype = numpy_support.get_numpy_array_type(vtk.VTK_ID_TYPE)
+    return numpy_support.numpy_to_vtkIdTypeArray(np.ascontiguousarray(ids, dtype=id_dtype), deep=False)
+
+
+def cell_array(offsets, connectivity):
+    '''
+    build a vtkCellArray in bulk from the offsets (length number of cells + 1) and connectivity arrays
+    '''
+    cells = vtk.vtkCellArray()
+    if hasattr(cells, "SetData") and vtk.vtkVersion.GetVTKMajorVersion() >= 9:
+        cells.SetData(id_array(offsets), id_array(connectivity))
+    else:
+        # VTK 8 only knows the legacy layout [n0, id, id, ..., n1, id, ...]
+        offsets = np.asarray(offsets)
+        sizes = np.diff(offsets)
+        legacy = np.empty(len(connectivity) + len(sizes), dtype=numpy_support.get_numpy_array_type(vtk.VTK_ID_TYPE))
+        starts = offsets[:-1] + np.arange(len(sizes))
+        legacy[starts] = sizes
+        mask = np.ones(len(legacy), dtype=bool)
+        mask[starts] = False
+        legacy[mask] = connectivity
+        cells.SetCells(len(sizes), id_array(legacy))
+    return cells
+
+
+def write_path_vtp(path_data, vtk_path, points_dtype=np.float32, compressor=None, data_mode=None,
+                   encode_appended=None):
+    '''
+     write the path as one poly line into a VTP file for paraview
+    Args:
+        path_data: nx3 (or wider, only the first 3 columns are used) numpy array of [x, y, z]
+        vtk_path: string, the stored path vtp file path and file name
+        points_dtype: np.float32 as the former vtkPoints default, np.float64 keeps full precision and maps a
+            contiguous float64 path_data without a copy
+        compressor, data_mode, encode_appended: see configure_writer
+    '''
+    number_of_steps = path_data.shape[0]
+    points = points_from_array(path_data[:, 0:3], dtype=points_dtype)
+    # one poly line through all points
+    lines = cell_array(np.array([0, number_of_steps]), np.arange(number_of_steps))
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(points)
+    polydata.SetLines(lines)
+    namedColors = vtk.vtkNamedColors()
+    colors = vtk.vtkUnsignedCharArray()
+    colors.SetNumberOfComponents(3)
+    colors.InsertNextTypedTuple(namedColors.GetColor3ub("white"))
+    polydata.GetCellData().SetScalars(colors)
+    writer = vtk.vtkXMLPolyDataWriter()
+    configure_writer(writer, compressor, data_mode, encode_appended)
+    writer.SetFileName(vtk_path)
+    writer.SetInputData(polydata)
+    writer.Write()
+
+
+def gesture_colors(number_of_triads=1):
+    '''
+    the cell colors of the gesture lines, red, yellow and green for the x, y and z axis of each triad
+    '''
+    colors = vtk.vtkNamedColors()
+    rgb = np.array([colors.GetColor3ub("red"), colors.GetColor3ub("yellow"), colors.GetColor3ub("green")],
+                   dtype=np.uint8)
+    Colors = numpy_support.numpy_to_vtk(np.tile(rgb, (number_of_triads, 1)), deep=True,
+                                        array_type=vtk.VTK_UNSIGNED_CHAR)
+    Colors.SetName("Colors")
+    return Colors
+
+
+def triad_lines(number_of_triads=1):
+    '''
+    the three gesture lines of each triad, point 4i is the origin and points 4i+1..4i+3 the x, y and z axis ends
+    '''
+    origin = 4 * np.arange(number_of_triads)
+    connectivity = np.empty((number_of_triads, 3, 2), dtype=np.int64)
+    connectivity[:, :, 0] = origin[:, None]
+    connectivity[:, :, 1] = origin[:, None] + np.arange(1, 4)
+    return cell_array(np.arange(0, 6 * number_of_triads + 1, 2), connectivity.ravel())
+
+
+def write_gesture_vtp(path_gesture_data, vtk_path, points_dtype=np.float32, compressor=None, data_mode=None,
+                      encode_appended=None):
+    '''
+     write the gesture of each record as one time step of a VTP file for paraview. The topology and colors are
+     built once, each time step only copies the 4 points of the record into the point buffer.
+    Args:
+        path_gesture_data: nx12 numpy array, [x, y, z, pos_xaxis_x, pos_xaxis_y, pos_xaxis_z, pos_yaxis_x,
+            pos_yaxis_y, pos_yaxis_z, pos_zaxis_x, pos_zaxis_y, pos_zaxis_z]
+        vtk_path: string, the stored gesture vtp file path and file name
+        points_dtype: np.float32 as the former vtkPoints default or np.float64
+        compressor, data_mode, encode_appended: see configure_writer
+    '''
+    number_of_steps = path_gesture_data.shape[0]
+    # every record seen as 4 points, origin and the x, y, z axis ends
+    steps = np.ascontiguousarray(path_gesture_data[:, 0:12]).reshape(number_of_steps, 4, 3)
+    buffer = np.zeros((4, 3), dtype=points_dtype)
+    points = points_from_array(buffer)
+    point_array = points.GetData()
+    data_to_write = vtk.vtkPolyData()
+    data_to_write.SetPoints(points)
+    data_to_write.SetLines(triad_lines())
+    data_to_write.GetCellData().SetScalars(gesture_colors())
+    writer = vtk.vtkXMLPolyDataWriter()
+    configure_writer(writer, compressor, data_mode, encode_appended)
+    writer.SetNumberOfTimeSteps(number_of_steps)
+    writer.SetInputData(data_to_write)
+    writer.SetFileName(vtk_path)
+    writer.Start()
+    for i in range(number_of_steps):
+        buffer[...] = steps[i]
+        # the writer caches the array range by modification time
+        point_array.Modified()
+        points.Modified()
+        writer.WriteNextTime(i)
+    writer.Stop()
+
+
+def write_gesture_triads_vtp(path_gesture_data, vtk_path, times=None, points_dtype=np.float32, compressor=None,
+                             data_mode=None, encode_appended=None, index_offset=0):
+    '''
+     write the gestures of all records into one PolyData, for tools which do not need a time series. Triad i has
+     the points 4i..4i+3 and the lines 3i..3i+2, the point data array "index" holds i.
+    Args:
+        path_gesture_data: nx12 numpy array, see write_gesture_vtp
+        vtk_path: string, the stored gesture vtp file path and file name
+        times: optional n numpy array, stored as the point data array "time"
+        points_dtype: np.float32 as the former vtkPoints default, np.float64 maps a contiguous float64 nx12
+            path_gesture_data without a copy
+        compressor, data_mode, encode_appended: see configure_writer
+        index_offset: added to the "index" array, the index of the first record of a piece of a longer log
+    '''
+    number_of_triads = path_gesture_data.shape[0]
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(points_from_array(
+        np.ascontiguousarray(path_gesture_data[:, 0:12]).reshape(4 * number_of_triads, 3), dtype=points_dtype))
+    polydata.SetLines(triad_lines(number_of_triads))
+    polydata.GetCellData().SetScalars(gesture_colors(number_of_triads))
+    index = numpy_support.numpy_to_vtk(
+        np.repeat(np.arange(index_offset, index_offset + number_of_triads, dtype=np.int64), 4), deep=True)
+    index.SetName("index")
+    polydata.GetPointData().AddArray(index)
+    if times is not None:
+        time_array = numpy_support.numpy_to_vtk(np.repeat(np.asarray(times, dtype=np.float64), 4), deep=True)
+        time_array.SetName("time")
+        polydata.GetPointData().AddArray(time_array)
+    writer = vtk.vtkXMLPolyDataWriter()
+    configure_writer(writer, compressor, data_mode, encode_appended)
+    writer.SetFileName(vtk_path)
+    writer.SetInputData(polydata)
+    writer.Write()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: time alignment of a timestamped position and euler pair with invalid position fixes.
+"""
+
+import numpy as np
+from IMU_Path_Vis.IMU_Vis import Vis
+from IMU_Path_Vis.align import interp_linear
+from IMU_Path_Vis.benchmark.synthetic import trajectory
+from IMU_Path_Vis.csv_reader import POS_COLUMN, EULER_COLUMN, TIME_COLUMN
+from IMU_Path_Vis.geo_transform import D2R, lla2ecef_batch
+
+
+def write_csv(file_name, columns, data):
+    np.savetxt(file_name, data, fmt="%.10f", delimiter=',', header=",".join([TIME_COLUMN] + columns), comments='')
+
+
+def ecef(lla):
+    lla = np.array(lla, dtype=np.float64)
+    lla[:, 0:2] *= D2R
+    return lla2ecef_batch(lla)
+
+
+def test_zero_fix_is_not_interpolated(tmp_path):
+    # 10 Hz positions with one zero fix, 100 Hz euler angles
+    time, lla, euler = trajectory(1000)
+    pos_time, pos_lla = time[::10], lla[::10].copy()
+    pos_lla[50] = 0
+    pos_file, eul_file = str(tmp_path / "pos.csv"), str(tmp_path / "att_euler.csv")
+    write_csv(pos_file, POS_COLUMN, np.column_stack([pos_time, pos_lla]))
+    write_csv(eul_file, EULER_COLUMN, np.column_stack([time, euler]))
+    vis = Vis(pos_file, eul_file)
+    valid = np.arange(len(pos_time)) != 50
+    expected = interp_linear(vis.pos_time[valid], ecef(vis.pos_data[valid]), vis.times)
+    mask = vis.valid_mask
+    assert mask.all()
+    np.testing.assert_allclose(vis.path_data[mask], expected[mask], rtol=0, atol=1e-6)
+
+
+def test_times_outside_the_valid_fixes_are_dropped(tmp_path):
+    time, lla, euler = trajectory(1000)
+    pos_time, pos_lla = time[::10], lla[::10].copy()
+    pos_lla[:5] = 0
+    pos_lla[-5:] = 0
+    pos_file, eul_file = str(tmp_path / "pos.csv"), str(tmp_path / "att_euler.csv")
+    write_csv(pos_file, POS_COLUMN, np.column_stack([pos_time, pos_lla]))
+    write_csv(eul_file, EULER_COLUMN, np.column_stack([time, euler]))
+    vis = Vis(pos_file, eul_file)
+    inside = (vis.times >= vis.pos_time[5]) & (vis.times <= vis.pos_time[-6])
+    np.testing.assert_array_equal(vis.valid_mask, inside)
+    np.testing.assert_allclose(vis.path_data[inside], interp_linear(vis.pos_time[5:-5], ecef(vis.pos_data[5:-5]),
+                                                                    vis.times[inside]), rtol=0, atol=1e-6)
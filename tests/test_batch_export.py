@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the up to date check of batch_export, by the file times and the stored options of the exports.
+"""
+
+import json
+import os
+import pytest
+
+pytest.importorskip("vtk")
+from IMU_Path_Vis.batch_export import run, output_files, export_options
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+
+
+def summary(capsys):
+    '''
+    returns:
+        the number of exported and skipped pairs of the last run
+    '''
+    last = capsys.readouterr().out.strip().splitlines()[-1].split()
+    return int(last[0]), int(last[2])
+
+
+@pytest.fixture
+def pair_dir(tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    write_pair(str(input_dir), 2000, name="run")
+    return str(input_dir), str(tmp_path / "output")
+
+
+def test_options_file(pair_dir, capsys):
+    input_dir, output_dir = pair_dir
+    assert run(input_dir, output_dir, workers=1) == 0
+    assert summary(capsys) == (1, 0)
+    options_file = output_files(output_dir, ".", "run")[2]
+    with open(options_file, "r") as f:
+        assert json.load(f) == export_options(10, "gesture", "ecef")
+    run(input_dir, output_dir, workers=1)
+    assert summary(capsys) == (0, 1)
+
+
+@pytest.mark.parametrize("options", [{"num": 5}, {"gesture_vtk": "gesture_triads"}, {"frame": "enu"}])
+def test_changed_options(pair_dir, capsys, options):
+    input_dir, output_dir = pair_dir
+    run(input_dir, output_dir, workers=1)
+    run(input_dir, output_dir, workers=1, **options)
+    assert summary(capsys) == (1, 0)
+    run(input_dir, output_dir, workers=1, **options)
+    assert summary(capsys) == (0, 1)
+
+
+def test_newer_input_and_lost_options(pair_dir, capsys):
+    input_dir, output_dir = pair_dir
+    run(input_dir, output_dir, workers=1)
+    path_vtp, gesture_vtp, options_file = output_files(output_dir, ".", "run")
+    mtime = os.path.getmtime(path_vtp)
+    os.utime(os.path.join(input_dir, "pos-run.csv"), (mtime + 10, mtime + 10))
+    run(input_dir, output_dir, workers=1)
+    assert summary(capsys) == (1, 0)
+    # outputs of an older version or an interrupted export have no options file
+    os.remove(options_file)
+    run(input_dir, output_dir, workers=1)
+    assert summary(capsys) == (1, 0)
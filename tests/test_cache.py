@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: round trip, key invalidation and LRU eviction of cache.ArrayCache.
+"""
+
+import os
+import time
+import numpy as np
+from IMU_Path_Vis.cache import ArrayCache
+
+
+def source_file(tmp_path, text="1,2,3\n"):
+    file_name = str(tmp_path / "source.csv")
+    with open(file_name, "w") as f:
+        f.write(text)
+    return file_name
+
+
+def test_round_trip(tmp_path):
+    cache = ArrayCache(str(tmp_path / "cache"))
+    arrays = {"path": np.arange(12.0).reshape(4, 3), "mask": np.array([True, False, True, True])}
+    key = cache.key([source_file(tmp_path)], stage="path")
+    assert cache.load(key) is None
+    cache.store(key, arrays)
+    loaded = cache.load(key)
+    assert sorted(loaded) == ["mask", "path"]
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(loaded[name], array)
+        assert loaded[name].dtype == array.dtype
+        assert not loaded[name].flags.writeable
+
+
+def test_key_changes_with_the_source_mtime_and_params(tmp_path):
+    cache = ArrayCache(str(tmp_path / "cache"))
+    file_name = source_file(tmp_path)
+    key = cache.key([file_name], num=10)
+    assert cache.key([file_name], num=10) == key
+    assert cache.key([file_name], num=20) != key
+    cache.store(key, {"a": np.zeros(3)}, source_files=[file_name])
+    st = os.stat(file_name)
+    os.utime(file_name, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert cache.key([file_name], num=10) != key
+    assert cache.invalidate(file_name) == 1
+    assert cache.load(key) is None
+
+
+def test_evicts_the_least_recently_used_entry(tmp_path):
+    array = np.zeros(1000)
+    cache = ArrayCache(str(tmp_path / "cache"), max_bytes=10 ** 9)
+    for key in ("a", "b", "c"):
+        cache.store(key, {"x": array})
+    # a is used after b, so b is the least recently used entry
+    now = time.time()
+    for age, key in ((30, "a"), (20, "b"), (10, "c")):
+        meta_file = os.path.join(cache.cache_dir, key, "meta.json")
+        os.utime(meta_file, (now - age, now - age))
+    assert cache.load("a") is not None
+    # room for the 3 entries, the 4th one evicts b
+    cache.max_bytes = cache.size() + 100
+    cache.store("d", {"x": array})
+    assert cache.load("b") is None
+    for key in ("a", "c", "d"):
+        assert cache.load(key) is not None
+    assert cache.size() <= cache.max_bytes
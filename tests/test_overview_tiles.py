@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the run compression of overview_tiles.rasterize against the rasterization of every segment.
+"""
+
+import numpy as np
+from IMU_Path_Vis.overview_tiles import rasterize, segment_pixels
+
+SIZE = 256
+
+
+def uncompressed(pixels, size=SIZE):
+    '''
+    the drawn pixels of rasterize without the run compression, every segment rasterized
+    '''
+    level = np.zeros(size * size, dtype=bool)
+    level[segment_pixels(pixels[:-1].astype(np.float64), pixels[1:].astype(np.float64), size)] = True
+    inside = np.all((pixels >= 0) & (pixels < size), axis=1)
+    cells = np.floor(pixels[inside]).astype(np.int64)
+    level[cells[:, 1] * size + cells[:, 0]] = True
+    level = level.reshape(size, size)
+    level[:, 1:] |= level[:, :-1]
+    level[1:, :] |= level[:-1, :]
+    return level
+
+
+def test_segment_leaving_a_run_outside_the_tile():
+    pixels = np.array([[-0.5, 5.5], [-1000.0, 5.2], [100.0, 200.0]])
+    np.testing.assert_array_equal(rasterize(pixels, SIZE)[:, :, 3] > 0, uncompressed(pixels))
+
+
+def test_runs_of_sparse_samples():
+    # runs of samples in one pixel, inside and outside the tile, joined by long segments
+    rng = np.random.default_rng(0)
+    centres = np.floor(rng.uniform(-400, 650, (200, 2))) + 0.5
+    repeat = rng.integers(1, 6, len(centres))
+    pixels = np.repeat(centres, repeat, axis=0) + rng.uniform(-0.45, 0.45, (repeat.sum(), 2))
+    np.testing.assert_array_equal(rasterize(pixels, SIZE)[:, :, 3] > 0, uncompressed(pixels))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the queries of spatial_index.PathIndex against brute force on a synthetic path.
+"""
+
+import numpy as np
+import pytest
+from IMU_Path_Vis.benchmark.synthetic import trajectory
+from IMU_Path_Vis.geo_transform import D2R, lla2ecef_batch
+from IMU_Path_Vis.spatial_index import PathIndex
+
+QUERIES = 40
+
+
+@pytest.fixture(scope="module")
+def path():
+    _, lla, _ = trajectory(200000)
+    lla[:, 0:2] *= D2R
+    return lla2ecef_batch(lla)
+
+
+@pytest.fixture(scope="module")
+def index(path):
+    return PathIndex(path)
+
+
+def queries(path, scale):
+    # points around path samples, the far ones outside the grid
+    rng = np.random.default_rng(1)
+    return path[rng.integers(0, len(path), QUERIES)] + rng.normal(0.0, scale, (QUERIES, 3))
+
+
+@pytest.mark.parametrize("scale", [1.0, 50.0, 5000.0])
+def test_nearest(path, index, scale):
+    for point in queries(path, scale):
+        distance = np.linalg.norm(path - point, axis=1)
+        i, d = index.nearest(point)
+        assert d == pytest.approx(distance.min(), abs=1e-9)
+        assert distance[i] == pytest.approx(distance.min(), abs=1e-9)
+
+
+@pytest.mark.parametrize("r", [1.0, 20.0, 300.0])
+def test_radius(path, index, r):
+    for point in queries(path, 10.0):
+        expected = np.flatnonzero(np.linalg.norm(path - point, axis=1) <= r)
+        np.testing.assert_array_equal(index.radius(point, r), expected)
+
+
+@pytest.mark.parametrize("half", [5.0, 100.0])
+def test_bbox(path, index, half):
+    for point in queries(path, 10.0):
+        lower, upper = point - half, point + [half, 2 * half, 0.5 * half]
+        expected = np.flatnonzero(np.all((path >= lower) & (path <= upper), axis=1))
+        np.testing.assert_array_equal(index.bbox(lower, upper), expected)
+
+
+def test_empty():
+    index = PathIndex(np.zeros((0, 3)))
+    assert index.nearest([0.0, 0.0, 0.0]) == (None, float("inf"))
+    assert len(index.bbox([0, 0, 0], [1, 1, 1])) == 0
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the overlapped and the serial stream_pipeline.StreamPipeline against class Vis, and its failures.
+"""
+
+import os
+import threading
+import numpy as np
+import pytest
+from IMU_Path_Vis.IMU_Vis import Vis
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+from IMU_Path_Vis.stream_pipeline import StreamPipeline, stream_export
+
+ROWS = 5000
+CHUNK_ROWS = 700
+
+
+class ListSink(object):
+    '''
+    keeps the blocks, fails on the append number fail_at if given
+    '''
+    def __init__(self, fail_at=None):
+        self.blocks = []
+        self.fail_at = fail_at
+        self.closed = False
+
+    def append(self, block):
+        if len(self.blocks) == self.fail_at:
+            raise RuntimeError("sink failed")
+        self.blocks.append(np.array(block))
+
+    def close(self):
+        self.closed = True
+        return 0
+
+
+@pytest.fixture(scope="module")
+def pair(tmp_path_factory):
+    pos_file, eul_file = write_pair(str(tmp_path_factory.mktemp("input")), ROWS)
+    # a few records with the LLA is 0, they are dropped by Vis and by the pipeline
+    with open(pos_file) as f:
+        lines = f.readlines()
+    for i in (1, 800, ROWS):
+        lines[i] = "0,0,0\n"
+    with open(pos_file, "w") as f:
+        f.writelines(lines)
+    return pos_file, eul_file
+
+
+def expected(pair):
+    vis = Vis(*pair)
+    vis.gen_gesture_on_path(10)
+    return vis.get_path_gesture_data()
+
+
+@pytest.mark.parametrize("overlap", [True, False])
+def test_matches_vis(pair, overlap):
+    sink = ListSink()
+    timing = StreamPipeline(*pair, chunk_rows=CHUNK_ROWS).run([sink], overlap=overlap)
+    data = np.concatenate(sink.blocks)
+    assert sink.closed
+    assert timing["records"] == len(data) == ROWS - 3
+    assert timing["blocks"] == -(-ROWS // CHUNK_ROWS)
+    # Vis goes through the attitude quaternions, the pipeline converts the euler angles to rotations directly
+    np.testing.assert_allclose(data, expected(pair), rtol=0, atol=1e-8)
+
+
+def test_overlap_matches_serial(pair):
+    sinks = [ListSink(), ListSink()]
+    for sink, overlap in zip(sinks, (True, False)):
+        StreamPipeline(*pair, chunk_rows=CHUNK_ROWS).run([sink], overlap=overlap)
+    np.testing.assert_array_equal(np.concatenate(sinks[0].blocks), np.concatenate(sinks[1].blocks))
+
+
+def test_stream_export_table(pair, tmp_path):
+    table_file = str(tmp_path / "table.npy")
+    stream_export(pair[0], pair[1], table_file=table_file, chunk_rows=CHUNK_ROWS)
+    rows = np.load(table_file)
+    np.testing.assert_allclose(np.column_stack([rows[c] for c in rows.dtype.names]), expected(pair), rtol=0,
+                               atol=1e-8)
+
+
+@pytest.mark.parametrize("overlap", [True, False])
+def test_length_mismatch(pair, tmp_path, overlap):
+    eul_file = str(tmp_path / "att_euler-short.csv")
+    with open(pair[1]) as f:
+        lines = f.readlines()
+    with open(eul_file, "w") as f:
+        f.writelines(lines[:-10])
+    with pytest.raises(ValueError):
+        StreamPipeline(pair[0], eul_file, chunk_rows=CHUNK_ROWS).run([ListSink()], overlap=overlap)
+
+
+@pytest.mark.parametrize("overlap", [True, False])
+def test_failing_sink_stops_the_stages(pair, overlap):
+    threads = set(threading.enumerate())
+    failing, other = ListSink(fail_at=2), ListSink()
+    with pytest.raises(RuntimeError, match="sink failed"):
+        StreamPipeline(*pair, chunk_rows=CHUNK_ROWS, queue_blocks=1).run([other, failing], overlap=overlap)
+    assert set(threading.enumerate()) <= threads
+    assert failing.closed and other.closed
+
+
+def test_timestamped_files_are_rejected(tmp_path):
+    pos_file, eul_file = write_pair(str(tmp_path), 100, timed=True)
+    with pytest.raises(ValueError):
+        StreamPipeline(pos_file, eul_file)
+    assert os.path.exists(pos_file)
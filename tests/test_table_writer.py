@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the tables of table_writer.write_table and TableAppender read back in every format.
+"""
+
+import numpy as np
+import pytest
+from IMU_Path_Vis.IMU_Vis import Vis
+from IMU_Path_Vis.benchmark.synthetic import write_pair
+from IMU_Path_Vis.table_writer import GESTURE_ON_PATH_COLUMNS, TableAppender, write_table
+
+EXTENSIONS = [".csv", ".npy", ".parquet", ".arrow", ".h5"]
+
+
+def read_table(file_name, columns):
+    '''
+    returns:
+        the nxm float64 array of the table file
+    '''
+    if file_name.endswith(".csv"):
+        with open(file_name) as f:
+            assert f.readline().strip() == ", ".join(columns)
+        return np.loadtxt(file_name, delimiter=',', skiprows=1, ndmin=2).reshape(-1, len(columns))
+    if file_name.endswith(".npy"):
+        rows = np.load(file_name)
+        assert list(rows.dtype.names) == columns
+    elif file_name.endswith(".h5"):
+        h5py = pytest.importorskip("h5py")
+        with h5py.File(file_name, "r") as f:
+            rows = f["table"][:]
+        assert list(rows.dtype.names) == columns
+    else:
+        pyarrow = pytest.importorskip("pyarrow")
+        if file_name.endswith(".parquet"):
+            import pyarrow.parquet
+            table = pyarrow.parquet.read_table(file_name)
+        else:
+            import pyarrow.feather
+            table = pyarrow.feather.read_table(file_name)
+        assert table.column_names == columns
+        return np.column_stack([table.column(c).to_numpy() for c in columns]).reshape(-1, len(columns))
+    return np.column_stack([rows[c] for c in columns]).reshape(-1, len(columns))
+
+
+@pytest.fixture(scope="module")
+def gesture_on_path(tmp_path_factory):
+    pos_file, eul_file = write_pair(str(tmp_path_factory.mktemp("input")), 1000)
+    vis = Vis(pos_file, eul_file)
+    vis.gen_gesture_on_path(10)
+    return vis.get_path_gesture_data()
+
+
+def skip_missing(extension):
+    if extension in (".parquet", ".arrow"):
+        pytest.importorskip("pyarrow")
+    if extension == ".h5":
+        pytest.importorskip("h5py")
+
+
+@pytest.mark.parametrize("extension", EXTENSIONS)
+def test_write_table(tmp_path, gesture_on_path, extension):
+    skip_missing(extension)
+    file_name = str(tmp_path / ("table" + extension))
+    write_table(gesture_on_path, file_name, GESTURE_ON_PATH_COLUMNS)
+    np.testing.assert_allclose(read_table(file_name, GESTURE_ON_PATH_COLUMNS), gesture_on_path, rtol=1e-15, atol=0)
+
+
+@pytest.mark.parametrize("extension", EXTENSIONS)
+def test_table_appender(tmp_path, gesture_on_path, extension):
+    # blocks of different sizes, the HDF5 dataset is resized past its first chunk
+    skip_missing(extension)
+    file_name = str(tmp_path / ("table" + extension))
+    with TableAppender(file_name, GESTURE_ON_PATH_COLUMNS) as appender:
+        for start, end in ((0, 300), (300, 301), (301, 301), (301, len(gesture_on_path))):
+            appender.append(gesture_on_path[start:end])
+    assert appender.rows == len(gesture_on_path)
+    np.testing.assert_allclose(read_table(file_name, GESTURE_ON_PATH_COLUMNS), gesture_on_path, rtol=1e-15, atol=0)
+
+
+@pytest.mark.filterwarnings("ignore:loadtxt")
+@pytest.mark.parametrize("extension", EXTENSIONS)
+def test_empty_table_appender(tmp_path, extension):
+    skip_missing(extension)
+    file_name = str(tmp_path / ("table" + extension))
+    with TableAppender(file_name, GESTURE_ON_PATH_COLUMNS):
+        pass
+    assert read_table(file_name, GESTURE_ON_PATH_COLUMNS).shape == (0, len(GESTURE_ON_PATH_COLUMNS))
+
+
+def test_wrong_shape(tmp_path):
+    with pytest.raises(ValueError):
+        write_table(np.zeros((3, 4)), str(tmp_path / "table.npy"), GESTURE_ON_PATH_COLUMNS)
+    with TableAppender(str(tmp_path / "table.csv"), GESTURE_ON_PATH_COLUMNS) as appender:
+        with pytest.raises(ValueError):
+            appender.append(np.zeros((3, 4)))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the time steps of the gesture .pvd of the partitioned VTP export.
+"""
+
+import os
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+import pytest
+
+pytest.importorskip("vtk")
+from IMU_Path_Vis.vtp_partition import write_pieces, piece_file_name, PieceWriter
+
+ROWS = 25
+PIECE_ROWS = 10
+
+
+def datasets(index_file):
+    '''
+    returns:
+        list of (timestep, piece file name) of the .pvd
+    '''
+    root = ElementTree.parse(index_file).getroot()
+    return [(float(d.get("timestep")), os.path.basename(d.get("file"))) for d in root.iter("DataSet")]
+
+
+def expected(index_file, timesteps, steps):
+    pieces = [(start, min(start + PIECE_ROWS, ROWS)) for start in range(0, ROWS, PIECE_ROWS)]
+    rows = [[start] if steps == "piece" else range(start, stop) for start, stop in pieces]
+    return [(timesteps[i], os.path.basename(piece_file_name(index_file, k))) for k, piece in enumerate(rows)
+            for i in piece]
+
+
+@pytest.fixture(scope="module")
+def gesture():
+    return np.random.default_rng(0).normal(0.0, 1.0, (ROWS, 12))
+
+
+@pytest.mark.parametrize("timed", [False, True])
+@pytest.mark.parametrize("steps", ["record", "piece"])
+def test_write_pieces_steps(tmp_path, gesture, steps, timed):
+    index_file = str(tmp_path / "gesture.pvd")
+    times = 100.0 + np.arange(ROWS) * 0.01 if timed else None
+    result = write_pieces("gesture", gesture, index_file, piece_rows=PIECE_ROWS, times=times, workers=1, steps=steps)
+    assert result["pieces"] == 3
+    assert datasets(index_file) == expected(index_file, np.arange(ROWS) if times is None else times, steps)
+
+
+@pytest.mark.parametrize("steps", ["record", "piece"])
+def test_piece_writer_steps(tmp_path, gesture, steps):
+    index_file = str(tmp_path / "gesture.pvd")
+    writer = PieceWriter("gesture", index_file, steps=steps)
+    for start in range(0, ROWS, PIECE_ROWS):
+        writer.append(gesture[start:start + PIECE_ROWS])
+    writer.close()
+    assert datasets(index_file) == expected(index_file, np.arange(ROWS), steps)
+
+
+def test_wrong_steps(tmp_path, gesture):
+    with pytest.raises(ValueError):
+        write_pieces("gesture", gesture, str(tmp_path / "gesture.pvd"), steps="frame")
+    with pytest.raises(ValueError):
+        PieceWriter("gesture", str(tmp_path / "gesture.pvd"), steps="frame")
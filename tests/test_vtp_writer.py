@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Project: IMU_Path_Visualisation
+Creator: Dengfenfen
+Create time: 2026-10-18 03:00
+IDE: PyCharm
+Introduction: the VTP files of vtp_writer read back with vtkXMLPolyDataReader.
+"""
+
+import numpy as np
+import pytest
+
+vtk = pytest.importorskip("vtk")
+from vtk.util import numpy_support
+from IMU_Path_Vis.vtp_writer import write_path_vtp, write_gesture_vtp, write_gesture_triads_vtp
+
+ROWS = 50
+
+
+def read(file_name, time_step=None):
+    reader = vtk.vtkXMLPolyDataReader()
+    reader.SetFileName(file_name)
+    if time_step is None:
+        reader.Update()
+    else:
+        reader.UpdateInformation()
+        reader.UpdateTimeStep(time_step)
+    return reader
+
+
+def points(polydata):
+    return numpy_support.vtk_to_numpy(polydata.GetPoints().GetData())
+
+
+def lines(polydata):
+    # the point ids of every line cell
+    cells = polydata.GetLines()
+    offsets = numpy_support.vtk_to_numpy(cells.GetOffsetsArray())
+    connectivity = numpy_support.vtk_to_numpy(cells.GetConnectivityArray())
+    return [connectivity[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+
+
+def array(data, name):
+    return numpy_support.vtk_to_numpy(data.GetArray(name))
+
+
+@pytest.fixture(scope="module")
+def gesture():
+    rng = np.random.default_rng(0)
+    path = np.array([-2.72e6, 4.71e6, 3.31e6]) + np.cumsum(rng.normal(0.0, 1.0, (ROWS, 3)), axis=0)
+    return np.hstack([path, np.tile(path, 3) + 10 * rng.normal(0.0, 1.0, (ROWS, 9))])
+
+
+@pytest.mark.parametrize("points_dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("compressor", [None, "zlib"])
+def test_path(tmp_path, gesture, points_dtype, compressor):
+    file_name = str(tmp_path / "path.vtp")
+    write_path_vtp(gesture, file_name, points_dtype=points_dtype, compressor=compressor)
+    polydata = read(file_name).GetOutput()
+    np.testing.assert_array_equal(points(polydata), gesture[:, 0:3].astype(points_dtype))
+    assert lines(polydata) == [list(range(ROWS))]
+
+
+def test_gesture_time_steps(tmp_path, gesture):
+    file_name = str(tmp_path / "gesture.vtp")
+    write_gesture_vtp(gesture, file_name, points_dtype=np.float64)
+    assert read(file_name, 0).GetNumberOfTimeSteps() == ROWS
+    for i in (0, 1, ROWS - 1):
+        # a new reader per step, updating the time step of one reader appends the lines again
+        polydata = read(file_name, i).GetOutput()
+        np.testing.assert_array_equal(points(polydata), gesture[i].reshape(4, 3))
+        assert lines(polydata) == [[0, 1], [0, 2], [0, 3]]
+    # the reader only reads the colors, which do not change between the steps, right at the first step
+    np.testing.assert_array_equal(array(read(file_name, 0).GetOutput().GetCellData(), "Colors"),
+                                  [[255, 0, 0], [255, 255, 0], [0, 128, 0]])
+
+
+def test_gesture_triads(tmp_path, gesture):
+    file_name = str(tmp_path / "gesture_triads.vtp")
+    times = np.arange(ROWS) * 0.01
+    write_gesture_triads_vtp(gesture, file_name, times=times, points_dtype=np.float64, index_offset=100)
+    polydata = read(file_name).GetOutput()
+    np.testing.assert_array_equal(points(polydata), gesture.reshape(4 * ROWS, 3))
+    assert lines(polydata)[3:6] == [[4, 5], [4, 6], [4, 7]]
+    assert polydata.GetNumberOfLines() == 3 * ROWS
+    np.testing.assert_array_equal(array(polydata.GetPointData(), "index"), np.repeat(np.arange(100, 100 + ROWS), 4))
+    np.testing.assert_array_equal(array(polydata.GetPointData(), "time"), np.repeat(times, 4))
+    assert array(polydata.GetCellData(), "Colors").shape == (3 * ROWS, 3)